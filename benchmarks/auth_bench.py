@@ -0,0 +1,64 @@
+# Custo de autenticação por requisição: jwt.decode (HS256) a cada chamada vs. cache de tokens verificados
+# (utils.auth.token_cache), além do caminho completo de validate_auth com X-API-Key e Bearer.
+# Uso (na raiz do repositório): python -m benchmarks.auth_bench [--number 20000]
+import argparse
+import logging
+import timeit
+
+import benchmarks.fixtures  # noqa: F401  (ajusta o sys.path)
+
+import jwt
+from flask import Flask
+
+from config import Config
+from src.main import validate_auth
+from src.utils.auth.api_key_manager import get_api_key_store
+from src.utils.auth.jwt_manager import TokenManager
+from src.utils.auth.token_cache import clear_token_cache
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    # os logs de cada validação iriam para o stderr e dominariam a medição
+    logging.disable(logging.INFO)
+
+    Config.API_KEY = Config.API_KEY or "bench-key"
+    # limite por chave fora do caminho: senão o caso X-API-Key mediria o 429
+    get_api_key_store().add("bench", Config.API_KEY, rate=1e9, burst=1e9)
+    token = TokenManager.generate_token("admin", {"role": "admin"})
+
+    def uncached():
+        clear_token_cache()
+        return TokenManager.validate_token(token)
+
+    cases = {
+        "jwt.decode": lambda: jwt.decode(token, Config.JWT_SECRET, algorithms=["HS256"]),
+        "validate_token (miss)": uncached,
+        "validate_token (hit)": lambda: TokenManager.validate_token(token),
+    }
+
+    app = Flask(__name__)
+    for name, headers in (
+        ("validate_auth X-API-Key", {"X-API-Key": Config.API_KEY}),
+        ("validate_auth Bearer", {"Authorization": f"Bearer {token}"}),
+    ):
+        ctx = app.test_request_context("/characters", headers=headers)
+        ctx.push()
+        from flask import request
+
+        req = request._get_current_object()
+        ctx.pop()
+        cases[name] = lambda req=req: validate_auth(req)
+
+    TokenManager.validate_token(token)
+    print(f"{'caso':<28}{'µs/chamada':>12}")
+    for name, fn in cases.items():
+        us = timeit.timeit(fn, number=args.number) / args.number * 1e6
+        print(f"{name:<28}{us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
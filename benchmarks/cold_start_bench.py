@@ -0,0 +1,88 @@
+# Cold start por rota: cada amostra roda num processo novo (como uma instância recém-criada da Cloud Function)
+# e mede o import de src.main e o tempo até a primeira resposta, contra o stand-in local da SWAPI.
+# Uso (na raiz do repositório): python -m benchmarks.cold_start_bench [--runs 5] [--output cold_start.json]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.fake_swapi import FakeSwapi
+from benchmarks.fixtures import ROOT
+
+API_KEY = "bench-key"
+
+ROUTES = [
+    ("GET", "/health", None),
+    ("POST", "/auth/login", {"username": "admin", "password": "admin123"}),
+    ("GET", "/characters", None),
+    ("GET", "/characters/1", None),
+    ("GET", "/characters/1/homeworld", None),
+    ("GET", "/planets", None),
+    ("GET", "/starships", None),
+    ("GET", "/films", None),
+    ("GET", "/search?q=sky", None),
+]
+
+# executado no processo filho; imprime uma linha JSON com os tempos
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+import flask
+from src.main import starwars_api
+imported = time.perf_counter()
+method, path, body, api_key = sys.argv[1], sys.argv[2], json.loads(sys.argv[3]), sys.argv[4]
+app = flask.Flask("cold_start_bench")
+with app.test_request_context(path, method=method, json=body, headers={"X-API-Key": api_key}):
+    response = app.make_response(starwars_api(flask.request))
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_response_ms": (done - imported) * 1000,
+    "status": response.status_code,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def run_once(method, path, body, base_url):
+    env = dict(os.environ, SWAPI_BASE_URL=base_url, API_KEY=API_KEY, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "src")]))
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, method, path, json.dumps(body), API_KEY],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    results = {}
+    with FakeSwapi() as fake:
+        print(f"{'rota':<32}{'import (ms)':>14}{'1ª resposta (ms)':>20}{'total (ms)':>14}{'módulos':>10}")
+        for method, path, body in ROUTES:
+            samples = [run_once(method, path, body, fake.base_url) for _ in range(args.runs)]
+            row = {
+                "status": samples[-1]["status"],
+                "import_ms": statistics.median(s["import_ms"] for s in samples),
+                "first_response_ms": statistics.median(s["first_response_ms"] for s in samples),
+                "modules": samples[-1]["modules"],
+            }
+            row["total_ms"] = row["import_ms"] + row["first_response_ms"]
+            results[f"{method} {path}"] = row
+            print(
+                f"{method + ' ' + path:<32}{row['import_ms']:>14.1f}{row['first_response_ms']:>20.1f}"
+                f"{row['total_ms']:>14.1f}{row['modules']:>10}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": args.runs, "routes": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# Latência por rota (p50/p95/p99), throughput e alocações, pelo Flask test client contra o stand-in local da SWAPI.
+# As rotas saem da lista de endpoints de handle_health. No cenário "cold", todos os caches são limpos antes de cada
+# amostra. No "warm", uma requisição anterior já preencheu os caches. Rota com alguma resposta fora de 2xx é
+# marcada como ERRO e faz o processo sair com código 1.
+# As alocações (pico do tracemalloc) são medidas numa execução à parte, para não distorcer a latência.
+# Uso (na raiz do repositório):
+#   python -m benchmarks.endpoint_bench [--samples 50] [--cold-samples 10] [--filter characters] [--output atual.json]
+#   python -m benchmarks.endpoint_bench --compare base.json atual.json [--threshold 0.15] [--min-delta-ms 0.1]
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fake_swapi import FakeSwapi
+import benchmarks.fixtures  # noqa: F401  (ajusta o sys.path)
+
+API_KEY = "bench-key"
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "alloc_kb")
+
+# valores concretos para os placeholders da lista de endpoints
+PLACEHOLDERS = {"{id}": "1", "<termo>": "sky"}
+
+BODIES = {
+    "/auth/login": {"username": "admin", "password": "admin123"},
+    "/batch": {"requests": [
+        "/characters/1",
+        "/planets/1",
+        {"path": "/films", "params": {"sort_by": "episode_id"}},
+        {"path": "/search", "params": {"q": "sky"}},
+    ]},
+}
+
+POST_ROUTES = ("/auth/login", "/auth/refresh", "/auth/logout")
+
+
+def percentile(values, pct):
+    # nearest-rank: sempre um valor medido
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def routes_from_health(endpoints):
+    routes = []
+    for group in endpoints.values():
+        for entry in group:
+            method, _, path = entry.rpartition(" ")
+            for placeholder, value in PLACEHOLDERS.items():
+                path = path.replace(placeholder, value)
+            method = method or ("POST" if path in POST_ROUTES else "GET")
+            routes.append((method, path, BODIES.get(path.split("?")[0])))
+    return routes
+
+
+def clear_caches():
+    from src.utils.cache import clear_cache
+    from src.utils.fragments import clear_entities
+    from src.utils.response_cache import clear_response_cache
+    from src.utils.auth.token_cache import clear_token_cache
+
+    clear_cache()
+    clear_entities()
+    clear_response_cache()
+    clear_token_cache()
+
+
+def auth_headers(path):
+    from src.utils.auth.jwt_manager import TokenManager
+
+    if path == "/auth/login":
+        return {}
+    if path.startswith(("/auth/", "/admin/")):
+        # token novo a cada amostra: /auth/logout revoga o token usado
+        return {"Authorization": f"Bearer {TokenManager.generate_token('admin', {'role': 'admin'})}"}
+    return {"X-API-Key": API_KEY}
+
+
+def request_once(client, method, path, body, scenario):
+    if scenario == "cold":
+        clear_caches()
+    headers = auth_headers(path)
+    started = time.perf_counter()
+    response = client.open(path, method=method, json=body, headers=headers)
+    response.get_data()  # consome as rotas em streaming
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, batch_status(path, response)
+
+
+def batch_status(path, response):
+    # o /batch responde 200 mesmo com sub-requisições falhando: vale o primeiro status fora de 2xx entre os itens
+    if path != "/batch" or response.status_code != 200:
+        return response.status_code
+    statuses = [item["status"] for item in response.get_json()["results"]]
+    return next((status for status in statuses if not 200 <= status < 300), response.status_code)
+
+
+def measure(client, method, path, body, scenario, samples):
+    if scenario == "warm":
+        request_once(client, method, path, body, scenario)
+
+    latencies, statuses = [], []
+    for _ in range(samples):
+        elapsed, status = request_once(client, method, path, body, scenario)
+        latencies.append(elapsed)
+        statuses.append(status)
+
+    if scenario == "cold":
+        clear_caches()
+    headers = auth_headers(path)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    response = client.open(path, method=method, json=body, headers=headers)
+    response.get_data()
+    statuses.append(batch_status(path, response))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "status": ",".join(str(code) for code in sorted(set(statuses))),
+        # amostra fora de 2xx mede a resposta de erro (429, 401...), não a rota: o resultado não vale
+        "errors": sum(1 for code in statuses if not 200 <= code < 300),
+        "samples": samples,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": sum(latencies) / len(latencies),
+        "rps": len(latencies) / (sum(latencies) / 1000),
+        "alloc_kb": (peak - before) / 1024,
+    }
+
+
+def build_client(base_url):
+    # o Config é lido no import de src.main; o ambiente precisa estar pronto antes
+    os.environ["SWAPI_BASE_URL"] = base_url
+    os.environ["API_KEY"] = API_KEY
+    # sem limite na chave: o benchmark mede as rotas, não o rate limiter
+    os.environ["API_KEY_RATE"] = os.environ["API_KEY_BURST"] = "1000000000"
+    logging.disable(logging.WARNING)
+
+    import flask
+    from src.main import starwars_api, handle_health
+
+    app = flask.Flask("endpoint_bench")
+    view = lambda path="": starwars_api(flask.request)  # noqa: E731
+    methods = ["GET", "POST", "OPTIONS"]
+    app.add_url_rule("/", "root", view, methods=methods)
+    app.add_url_rule("/<path:path>", "api", view, methods=methods)
+    return app.test_client(), handle_health()[0]["endpoints"]
+
+
+def run(args):
+    results = {}
+    failed = []
+    with FakeSwapi() as fake:
+        client, endpoints = build_client(fake.base_url)
+        routes = [route for route in routes_from_health(endpoints) if not args.filter or args.filter in route[1]]
+
+        for scenario, samples in (("cold", args.cold_samples), ("warm", args.samples)):
+            print(f"\n[{scenario}]")
+            print(f"{'rota':<34}{'status':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'req/s':>9}{'alloc (KB)':>12}")
+            rows = results[scenario] = {}
+            for method, path, body in routes:
+                row = rows[f"{method} {path}"] = measure(client, method, path, body, scenario, samples)
+                print(
+                    f"{method + ' ' + path:<34}{row['status']:>9}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+                    f"{row['p99_ms']:>10.2f}{row['rps']:>9.0f}{row['alloc_kb']:>12.1f}"
+                    f"{'  ERRO' if row['errors'] else ''}"
+                )
+                if row["errors"]:
+                    failed.append(f"{scenario} {method} {path}")
+        print(f"\nchamadas à SWAPI local: {fake.requests}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "scenarios": results,
+            }, f, indent=2)
+
+    if failed:
+        print(f"\n{len(failed)} rota(s) com resposta fora de 2xx: {', '.join(failed)}")
+    return len(failed)
+
+
+def compare(base_path, current_path, threshold, min_delta_ms):
+    # regressão: piorou mais que `threshold` (fração) e, para tempos, mais que `min_delta_ms` em valor absoluto
+    with open(base_path) as f:
+        base = json.load(f)["scenarios"]
+    with open(current_path) as f:
+        current = json.load(f)["scenarios"]
+
+    regressions = 0
+    print(f"{'cenário/rota':<42}{'métrica':>10}{'base':>10}{'atual':>10}{'variação':>10}")
+    for scenario, rows in current.items():
+        for route, row in rows.items():
+            old = base.get(scenario, {}).get(route)
+            if row.get("errors") or old is not None and old.get("errors"):
+                # latência de uma resposta de erro não é comparável
+                regressions += 1
+                print(f"{scenario + ' ' + route:<42}{'status':>10}{old['status'] if old else '-':>10}{row['status']:>10}  ERRO")
+                continue
+            if old is None:
+                print(f"{scenario + ' ' + route:<42}{'(nova)':>10}")
+                continue
+            for metric in METRICS:
+                before, after = old[metric], row[metric]
+                change = (after - before) / before if before else 0.0
+                floor = 0.0 if metric == "alloc_kb" else min_delta_ms
+                regressed = change > threshold and after - before > floor
+                regressions += regressed
+                if regressed or abs(change) > threshold:
+                    flag = "  REGRESSÃO" if regressed else ""
+                    print(f"{scenario + ' ' + route:<42}{metric:>10}{before:>10.2f}{after:>10.2f}{change:>+10.0%}{flag}")
+
+    print(f"\n{regressions} regressão(ões) acima de {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=50, help="amostras por rota no cenário warm")
+    parser.add_argument("--cold-samples", type=int, default=10, help="amostras por rota no cenário cold")
+    parser.add_argument("--filter", help="mede só as rotas cujo path contém o texto")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "ATUAL"), help="compara dois JSON gerados com --output")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--min-delta-ms", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.compare:
+        # código de saída != 0 com regressão, para uso em CI
+        sys.exit(1 if compare(*args.compare, args.threshold, args.min_delta_ms) else 0)
+    sys.exit(1 if run(args) else 0)
+
+
+if __name__ == "__main__":
+    main()
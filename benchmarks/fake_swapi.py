@@ -0,0 +1,119 @@
+# Stand-in local da SWAPI (mesmas rotas e paginação), para os benchmarks não dependerem da rede.
+# Uso isolado: python -m benchmarks.fake_swapi [--port 8765] [--latency-ms 0]
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import build_collections
+
+PAGE_SIZE = 10
+
+
+class _Server(ThreadingHTTPServer):
+    # o backlog padrão do socketserver é 5: com mais conexões simultâneas que isso, o SYN excedente só é
+    # reenviado depois de ~1 s e o cliente mais concorrente parece o mais lento
+    request_queue_size = 128
+
+
+class FakeSwapi:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.server = _Server((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.base_url = f"http://{host}:{self.server.server_address[1]}/api"
+        self.collections = build_collections(self.base_url)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FakeSwapi":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeSwapi":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def resolve(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, Dict[str, Any]]:
+        parts = [part for part in path.split("/") if part]
+        if len(parts) < 2 or parts[0] != "api" or parts[1] not in self.collections:
+            return 404, {"detail": "Not found"}
+
+        items = self.collections[parts[1]]
+        if len(parts) == 3:
+            if parts[2].isdigit() and 1 <= int(parts[2]) <= len(items):
+                return 200, items[int(parts[2]) - 1]
+            return 404, {"detail": "Not found"}
+
+        search = (query.get("search") or [""])[0].casefold()
+        if search:
+            items = [item for item in items if search in (item.get("name") or item.get("title", "")).casefold()]
+
+        page = int((query.get("page") or ["1"])[0])
+        start = (page - 1) * PAGE_SIZE
+        if page < 1 or (start >= len(items) and page != 1):
+            return 404, {"detail": "Not found"}
+
+        def page_url(number: int) -> str:
+            suffix = f"&search={search}" if search else ""
+            return f"{self.base_url}/{parts[1]}/?page={number}{suffix}"
+
+        return 200, {
+            "count": len(items),
+            "next": page_url(page + 1) if start + PAGE_SIZE < len(items) else None,
+            "previous": page_url(page - 1) if page > 1 else None,
+            "results": items[start:start + PAGE_SIZE],
+        }
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                parsed = urlparse(self.path)
+                status, payload = fake.resolve(parsed.path, parse_qs(parsed.query))
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeSwapi(port=args.port, latency_ms=args.latency_ms)
+    print(f"SWAPI_BASE_URL={fake.base_url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
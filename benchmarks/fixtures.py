@@ -0,0 +1,115 @@
+import os
+import sys
+from typing import Any, Dict, List
+
+# os módulos de src/ usam "from config import Config" e imports relativos a partir de "src"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+BASE_URL = "https://swapi.dev/api"
+
+COLLECTION_SIZES = {"people": 82, "planets": 60, "starships": 36, "films": 6}
+
+
+def _url(endpoint: str, resource_id: int) -> str:
+    return f"{BASE_URL}/{endpoint}/{resource_id}/"
+
+
+def _related(endpoint: str, seed: int, count: int) -> List[str]:
+    size = COLLECTION_SIZES[endpoint]
+    return [_url(endpoint, (seed * 7 + i * 3) % size + 1) for i in range(count)]
+
+
+def build_collections(base_url: str = BASE_URL) -> Dict[str, List[Dict[str, Any]]]:
+    # dados sintéticos com o mesmo formato da SWAPI, determinísticos entre execuções
+    people = [
+        {
+            "name": f"Character {i} Skywalker" if i % 5 == 0 else f"Character {i}",
+            "height": str(150 + i % 60),
+            "mass": str(50 + i % 70),
+            "hair_color": "brown",
+            "skin_color": "fair",
+            "eye_color": "blue",
+            "birth_year": f"{i}BBY",
+            "gender": "male" if i % 2 else "female",
+            "homeworld": _url("planets", i % COLLECTION_SIZES["planets"] + 1),
+            "films": _related("films", i, 1 + i % 4),
+            "species": [],
+            "vehicles": [],
+            "starships": _related("starships", i, i % 3),
+            "url": _url("people", i),
+        }
+        for i in range(1, COLLECTION_SIZES["people"] + 1)
+    ]
+    planets = [
+        {
+            "name": f"Planet {i}",
+            "rotation_period": str(20 + i % 10),
+            "orbital_period": str(300 + i),
+            "diameter": str(10000 + i * 13),
+            "climate": "arid" if i % 3 == 0 else "temperate",
+            "gravity": "1 standard",
+            "terrain": "desert" if i % 3 == 0 else "grasslands, mountains",
+            "surface_water": "1",
+            "population": str(200000 + i * 1000),
+            "residents": _related("people", i, i % 6),
+            "films": _related("films", i, 1 + i % 3),
+            "url": _url("planets", i),
+        }
+        for i in range(1, COLLECTION_SIZES["planets"] + 1)
+    ]
+    starships = [
+        {
+            "name": f"Starship {i}",
+            "model": f"Model {i}",
+            "manufacturer": "Kuat Drive Yards",
+            "cost_in_credits": str(100000 + i * 5000),
+            "length": str(30 + i),
+            "max_atmosphering_speed": "1000",
+            "crew": str(1 + i % 5),
+            "passengers": str(i % 10),
+            "cargo_capacity": str(1000 * i),
+            "consumables": "1 week",
+            "hyperdrive_rating": "1.0",
+            "MGLT": "75",
+            "starship_class": "Starfighter",
+            "pilots": _related("people", i, i % 4),
+            "films": _related("films", i, 1 + i % 3),
+            "url": _url("starships", i),
+        }
+        for i in range(1, COLLECTION_SIZES["starships"] + 1)
+    ]
+    films = [
+        {
+            "title": f"Episode {i}",
+            "episode_id": i,
+            "opening_crawl": "It is a period of civil war. " * 20,
+            "director": "George Lucas",
+            "producer": "Gary Kurtz, Rick McCallum",
+            "release_date": f"19{77 + i}-05-25",
+            "characters": _related("people", i, 18),
+            "planets": _related("planets", i, 5),
+            "starships": _related("starships", i, 8),
+            "vehicles": [],
+            "species": [],
+            "url": _url("films", i),
+        }
+        for i in range(1, COLLECTION_SIZES["films"] + 1)
+    ]
+    collections = {"people": people, "planets": planets, "starships": starships, "films": films}
+    if base_url != BASE_URL:
+        collections = _rebase(collections, base_url.rstrip("/"))
+    return collections
+
+
+def _rebase(value: Any, base_url: str) -> Any:
+    # troca o host das URLs (ex.: para apontar para o stand-in local de fake_swapi)
+    if isinstance(value, str):
+        return base_url + value[len(BASE_URL):] if value.startswith(BASE_URL) else value
+    if isinstance(value, list):
+        return [_rebase(item, base_url) for item in value]
+    if isinstance(value, dict):
+        return {key: _rebase(item, base_url) for key, item in value.items()}
+    return value
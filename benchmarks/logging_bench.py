@@ -0,0 +1,73 @@
+# Custo de log por requisição na thread da requisição: StreamHandler síncrono com todo evento em INFO
+# (como era com logging.basicConfig) vs. utils.logging_setup (fila + JSON em background + amostragem).
+# Uso (na raiz do repositório): python -m benchmarks.logging_bench [--number 20000]
+import argparse
+import logging
+import os
+import time
+import timeit
+
+import benchmarks.fixtures  # noqa: F401  (ajusta o sys.path)
+
+from src.utils import logging_setup
+from src.utils.logging_setup import configure_logging, log_sampled, shutdown_logging
+
+# eventos típicos de um GET /characters/1/films com cache quente e token JWT
+CACHE_HITS = 4
+
+
+def legacy_request(logger):
+    logger.info(f"Token validado com sucesso para usuário: {'admin'}")
+    for i in range(CACHE_HITS):
+        logger.info(f"Cache HIT: {'films/' + str(i)}")
+    logger.info(f"[Tentativa {1}/{3}] GET {'https://swapi.dev/api/people/1/'}")
+
+
+def structured_request(logger):
+    log_sampled(logger, "token_validated", "Token validado com sucesso para usuário: %s", "admin")
+    for i in range(CACHE_HITS):
+        log_sampled(logger, "cache_hit", "Cache HIT: %s", f"films/{i}", endpoint=f"films/{i}")
+    logger.log(
+        logging.DEBUG, "[Tentativa %d/%d] GET %s", 1, 3, "https://swapi.dev/api/people/1/",
+        extra={"event": "upstream_request", "url": "https://swapi.dev/api/people/1/", "attempt": 1},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    root = logging.getLogger()
+
+    # antes: handler síncrono, texto, INFO para tudo
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    logger = logging.getLogger("bench")
+    legacy_us = timeit.timeit(lambda: legacy_request(logger), number=args.number) / args.number * 1e6
+    root.removeHandler(handler)
+
+    # depois: fila + JSON em background, amostragem padrão de LOG_SAMPLE_RATES
+    configure_logging(devnull, background=True)
+    structured_us = timeit.timeit(lambda: structured_request(logger), number=args.number) / args.number * 1e6
+
+    # tudo a 100%: mostra quanto do ganho vem da amostragem e quanto da fila
+    logging_setup._sample_rates = {}
+    unsampled_us = timeit.timeit(lambda: structured_request(logger), number=args.number) / args.number * 1e6
+
+    start = time.perf_counter()
+    shutdown_logging()
+    drain_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{'caso':<40}{'µs/requisição':>16}")
+    print(f"{'síncrono, INFO em tudo':<40}{legacy_us:>16.2f}")
+    print(f"{'fila + JSON, amostrado':<40}{structured_us:>16.2f}")
+    print(f"{'fila + JSON, sem amostragem':<40}{unsampled_us:>16.2f}")
+    print(f"(esvaziar a fila no fim: {drain_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
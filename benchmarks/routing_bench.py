@@ -0,0 +1,64 @@
+# Custo de dispatch por rota: tabela compilada (utils.routing) vs. a antiga cadeia de if em starwars_api.
+# Uso (na raiz do repositório): python -m benchmarks.routing_bench [--number 100000]
+import argparse
+import timeit
+
+import benchmarks.fixtures  # noqa: F401  (ajusta o sys.path)
+
+from src.main import router
+
+SAMPLE_PATHS = [
+    ("GET", "/health"),
+    ("POST", "/auth/login"),
+    ("GET", "/characters"),
+    ("GET", "/characters/export"),
+    ("GET", "/characters/1"),
+    ("GET", "/characters/1/homeworld"),
+    ("GET", "/planets/1/residents"),
+    ("GET", "/starships/12/pilots"),
+    ("GET", "/films"),
+    ("GET", "/films/1/starships"),
+    ("GET", "/search"),
+    ("POST", "/batch"),
+]
+
+
+def legacy_dispatch(method, path):
+    # reprodução da cadeia de if anterior (sem executar os handlers)
+    if path == "/auth/login" and method == "POST":
+        return "login"
+    if path == "/auth/refresh" and method == "POST":
+        return "refresh"
+    if path in ("", "/", "/health"):
+        return "health"
+    for resource in ("characters", "planets", "starships", "films"):
+        if path == f"/{resource}" and method == "GET":
+            return resource
+        if path.startswith(f"/{resource}/") and method == "GET":
+            parts = path.split("/")
+            resource_id = parts[2] if len(parts) > 2 else None
+            sub_resource = parts[3] if len(parts) > 3 else None
+            try:
+                int(resource_id)
+            except (ValueError, TypeError):
+                return "bad_id"
+            return (resource, sub_resource)
+    if path == "/search" and method == "GET":
+        return "search"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'rota':<34}{'if-chain (ns)':>15}{'router (ns)':>13}")
+    for method, path in SAMPLE_PATHS:
+        legacy_ns = timeit.timeit(lambda: legacy_dispatch(method, path), number=args.number) / args.number * 1e9
+        router_ns = timeit.timeit(lambda: router.match(method, path), number=args.number) / args.number * 1e9
+        print(f"{method + ' ' + path:<34}{legacy_ns:>15.0f}{router_ns:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Microbenchmark por endpoint: jsonify(model_dump()) vs utils.response.to_json_bytes(models)
+# vs fragmentos por entidade já codificados (utils.fragments), com o cache de fragmentos aquecido.
+# Emendar fragmentos no envelope perde para o to_json direto nas listagens e na busca: os services só
+# usam fragmentos no detalhe (o fragmento é o corpo inteiro) e no export.
+# Uso (na raiz do repositório): python -m benchmarks.serialization_bench [--number 200]
+import argparse
+import timeit
+
+from benchmarks.fixtures import build_collections
+
+from flask import Flask, jsonify
+
+from src.schemas.character import Character
+from src.schemas.film import Film
+from src.schemas.planet import Planet
+from src.schemas.starship import Starship
+from src.utils.fragments import FragmentList, encode_fragment
+from src.utils.response import to_json_bytes
+
+MODELS = {"people": Character, "planets": Planet, "starships": Starship, "films": Film}
+
+
+def _pagination(total: int, limit: int) -> dict:
+    return {"page": 1, "limit": limit, "total": total, "total_pages": 1, "has_next": False, "has_previous": False}
+
+
+def build_cases(collections):
+    models = {endpoint: [MODELS[endpoint](**item) for item in items] for endpoint, items in collections.items()}
+
+    def list_case(endpoint, limit):
+        page = models[endpoint][:limit]
+
+        def legacy():
+            return {"data": [m.model_dump() for m in page], "pagination": _pagination(len(page), limit)}
+
+        def fast():
+            return {"data": page, "pagination": _pagination(len(page), limit)}
+
+        def spliced():
+            return {"data": FragmentList(encode_fragment(m) for m in page), "pagination": _pagination(len(page), limit)}
+
+        return legacy, fast, spliced
+
+    def detail_case(endpoint):
+        model = models[endpoint][0]
+        return (lambda: model.model_dump()), (lambda: model), (lambda: encode_fragment(model))
+
+    def search_case():
+        groups = {"characters": "people", "planets": "planets", "starships": "starships", "films": "films"}
+
+        def legacy():
+            return {
+                "query": "sky",
+                "results": {name: [m.model_dump() for m in models[ep][:5]] for name, ep in groups.items()},
+            }
+
+        def fast():
+            return {"query": "sky", "results": {name: models[ep][:5] for name, ep in groups.items()}}
+
+        def spliced():
+            return {
+                "query": "sky",
+                "results": {name: FragmentList(encode_fragment(m) for m in models[ep][:5]) for name, ep in groups.items()},
+            }
+
+        return legacy, fast, spliced
+
+    return {
+        "/characters?limit=100": list_case("people", 100),
+        "/planets?limit=100": list_case("planets", 100),
+        "/starships?limit=100": list_case("starships", 100),
+        "/films": list_case("films", 10),
+        "/characters/{id}": detail_case("people"),
+        "/films/{id}": detail_case("films"),
+        "/search?q=sky": search_case(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    cases = build_cases(build_collections())
+
+    print(f"{'endpoint':<26}{'jsonify (µs)':>14}{'fast (µs)':>12}{'fragments (µs)':>16}")
+    with app.app_context():
+        for endpoint, (legacy, fast, spliced) in cases.items():
+            legacy_us = timeit.timeit(lambda: jsonify(legacy()).get_data(), number=args.number) / args.number * 1e6
+            fast_us = timeit.timeit(lambda: to_json_bytes(fast()), number=args.number) / args.number * 1e6
+            spliced_us = timeit.timeit(lambda: to_json_bytes(spliced()), number=args.number) / args.number * 1e6
+            print(f"{endpoint:<26}{legacy_us:>14.1f}{fast_us:>12.1f}{spliced_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
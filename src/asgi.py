@@ -0,0 +1,206 @@
+import io
+import sys
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Dict, List, Tuple
+from urllib.parse import parse_qs
+
+from flask import Flask, Request, request
+
+from config import Config
+from .main import (
+    starwars_api,
+    router,
+    validate_auth,
+    validate_admin,
+    response_cache_key,
+    UPSTREAM_ENVIRON_KEY,
+    AUTH_ENVIRON_KEY,
+    ADMISSION_ENVIRON_KEY,
+    REQUEST_CACHE_ENVIRON_KEY,
+)
+from .services.registry import get_async_swapi_manager
+from .services.swapi.accounting import UpstreamStats, upstream_stats_scope
+from .utils.admission import admission, ServiceOverloadedError
+from .utils.cache import RequestCache, request_cache_scope
+from .utils.response_cache import get_cached_response
+from .utils.routing.exceptions import RoutingError
+from .utils.routing.router import Route
+
+# entrypoint ASGI ao lado do starwars_api (na raiz: PYTHONPATH=src uvicorn src.asgi:app).
+# A I/O com a SWAPI roda no event loop (AsyncSwapiManager): depois da autenticação e da admissão, os dados que a
+# rota vai ler são buscados em paralelo e sem thread presa. Depois o pipeline síncrono de sempre (cache de resposta,
+# handlers, serialização) roda numa thread, lendo tudo do cache. Requisições concorrentes pelos mesmos dados
+# fazem uma única chamada à SWAPI.
+
+logger = logging.getLogger(__name__)
+
+# prefixo da rota -> endpoint da SWAPI
+RESOURCE_ENDPOINTS = {"characters": "people", "planets": "planets", "starships": "starships", "films": "films"}
+
+_flask_app = Flask(__name__)
+_flask_app.add_url_rule("/", "root", lambda path="": starwars_api(request), methods=["GET", "POST", "OPTIONS"])
+_flask_app.add_url_rule("/<path:path>", "api", lambda path="": starwars_api(request), methods=["GET", "POST", "OPTIONS"])
+
+# só CPU (tudo já está no cache): poucas threads bastam
+_executor = ThreadPoolExecutor(max_workers=Config.ASGI_WORKER_THREADS, thread_name_prefix="asgi")
+
+def upstream_plan(route: Route, params: Dict[str, Any], query: Dict[str, List[str]]) -> List[Awaitable[Any]]:
+    # o que o handler da rota vai pedir ao SwapiManager
+    client = get_async_swapi_manager()
+    if route.template in ("/search", "/batch"):
+        return [client.fetch_all(endpoint) for endpoint in RESOURCE_ENDPOINTS.values()]
+
+    endpoint = RESOURCE_ENDPOINTS.get(route.template.strip("/").split("/")[0])
+    if endpoint is None:
+        return []
+
+    plan: List[Awaitable[Any]] = []
+    # expand e sub-recursos passam pelo grafo de relacionamentos, que lê as quatro coleções
+    needs_graph = "sub_resource" in params or "expand" in query
+    if needs_graph:
+        plan.extend(client.fetch_all(name) for name in RESOURCE_ENDPOINTS.values())
+
+    ids = [value for name, value in params.items() if name.endswith("_id")]
+    if ids:
+        plan.append(client.fetch_by_id(endpoint, ids[0]))
+    elif not needs_graph:
+        plan.append(client.fetch_all(endpoint))
+    return plan
+
+async def prefetch(environ: Dict[str, Any], stack: AsyncExitStack) -> None:
+    # rota desconhecida ou pública não busca nada (404/401 de rota saem do pipeline)
+    path = environ["PATH_INFO"].rstrip("/")
+    try:
+        route, params = router.match(environ["REQUEST_METHOD"], path)
+    except RoutingError:
+        return
+    if route.public:
+        return
+
+    # sem credencial válida (ou sem tokens no bucket) a resposta é 401/403/429 e nada vai à SWAPI
+    req = Request(environ)
+    auth_error = environ[AUTH_ENVIRON_KEY] = validate_admin(req) if route.admin else validate_auth(req)
+    if auth_error:
+        return
+
+    # resposta já no cache: o pipeline responde dali, sem fila e sem SWAPI
+    if route.kind == "cached":
+        cache_key = response_cache_key(route, path, route.schema.parse(req.args) if route.schema else None)
+        if cache_key is not None and get_cached_response(cache_key) is not None:
+            return
+
+    # a espera pela vaga acontece aqui, no event loop: na thread, requisições na fila prenderiam as threads de que
+    # as já admitidas precisam para rodar. Recusada, a requisição não busca nada e o pipeline responde 503
+    try:
+        await stack.enter_async_context(admission.admit_async(route.cost))
+    except ServiceOverloadedError as e:
+        environ[ADMISSION_ENVIRON_KEY] = e
+        return
+    environ[ADMISSION_ENVIRON_KEY] = True
+
+    plan = upstream_plan(route, params, parse_qs(environ["QUERY_STRING"]))
+    if not plan:
+        return
+
+    # as chamadas do prefetch contam no orçamento e no X-Upstream da própria requisição; as falhas ficam no
+    # cache de requisição e o pipeline síncrono só formata o erro (404, SWAPI fora do ar), sem chamar de novo
+    with upstream_stats_scope(environ[UPSTREAM_ENVIRON_KEY]), request_cache_scope(environ[REQUEST_CACHE_ENVIRON_KEY]):
+        results = await asyncio.gather(*plan, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.debug(f"Prefetch de {path} falhou: {result}")
+
+def _build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope["headers"]:
+        name, value = raw_name.decode("latin-1").upper().replace("-", "_"), raw_value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[name] = value
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+def _start_wsgi(environ: Dict[str, Any]) -> Tuple[int, List[Tuple[bytes, bytes]], Any]:
+    started: Dict[str, Any] = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"], started["headers"] = status, headers
+        return lambda data: None
+
+    body = _flask_app.wsgi_app(environ, start_response)
+    status = int(started["status"].split(" ", 1)[0])
+    headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in started["headers"]]
+    return status, headers, body
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await get_async_swapi_manager().aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    environ = _build_environ(scope, await _read_body(receive))
+    environ[UPSTREAM_ENVIRON_KEY] = UpstreamStats(budget=Config.UPSTREAM_CALL_BUDGET)
+    environ[REQUEST_CACHE_ENVIRON_KEY] = RequestCache()
+
+    loop = asyncio.get_running_loop()
+    # a vaga da admissão vale do prefetch até o handler do pipeline ter rodado
+    async with AsyncExitStack() as stack:
+        await prefetch(environ, stack)
+        status, headers, body_iterable = await loop.run_in_executor(_executor, _start_wsgi, environ)
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+
+    # rotas em streaming (/export) continuam em streaming: um pedaço por vez, gerado na thread
+    chunks = iter(body_iterable)
+    try:
+        while True:
+            chunk = await loop.run_in_executor(_executor, next, chunks, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    finally:
+        close = getattr(body_iterable, "close", None)
+        if close is not None:
+            close()
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
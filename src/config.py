@@ -8,12 +8,83 @@ class Config:
     SWAPI_BASE_URL = os.getenv("SWAPI_BASE_URL")
     SWAPI_TIMEOUT: int = 10
     SWAPI_MAX_RETRIES: int = 3
+    # máximo de chamadas simultâneas à SWAPI dentro de uma mesma requisição
+    SWAPI_MAX_CONCURRENCY: int = int(os.getenv("SWAPI_MAX_CONCURRENCY", "8"))
+    # máximo de chamadas HTTP à SWAPI por requisição (0 = sem limite); acima disso a requisição falha com 400
+    UPSTREAM_CALL_BUDGET: int = int(os.getenv("UPSTREAM_CALL_BUDGET", "0"))
+    # threads do entrypoint ASGI (asgi.py) para o pipeline síncrono; a espera pela SWAPI não ocupa nenhuma
+    ASGI_WORKER_THREADS: int = int(os.getenv("ASGI_WORKER_THREADS", "8"))
+
+    # deadline (segundos) para a busca global em todos os recursos
+    SEARCH_TIMEOUT: float = float(os.getenv("SEARCH_TIMEOUT", "8"))
+
+    # POST /batch
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_WORKERS: int = int(os.getenv("BATCH_MAX_WORKERS", "8"))
 
     JWT_SECRET = os.getenv("JWT_SECRET", "sua-chave-super-secret")
 
     CACHE_TTL = 300
+    # models (e seus fragmentos JSON) mantidos por versão da entidade
+    ENTITY_CACHE_SIZE: int = int(os.getenv("ENTITY_CACHE_SIZE", "1000"))
 
     JWT_EXPIRATION = 86400
+    # tokens JWT já verificados mantidos em memória (até o exp de cada um)
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", "1024"))
     API_KEY = os.getenv("API_KEY")
+    # chaves adicionais: "nome:chave,outro:chave2" e/ou arquivo JSON [{"name", "key" | "key_hash", "rate", "burst"}]
+    API_KEYS = os.getenv("API_KEYS")
+    API_KEYS_FILE = os.getenv("API_KEYS_FILE")
+    # limite por API key (token bucket): requisições/s e rajada máxima
+    API_KEY_RATE: float = float(os.getenv("API_KEY_RATE", "10"))
+    API_KEY_BURST: float = float(os.getenv("API_KEY_BURST", "20"))
+    # a API_KEY única (legada) continua sem limite, a menos que API_KEY_RATE seja definido
+    API_KEY_LEGACY_LIMITED: bool = "API_KEY_RATE" in os.environ
+
+    DEFAULT_PAGE: int = 1
+    DEFAULT_LIMIT: int = 10
+
+    # cache de respostas completas (corpo já serializado)
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "500"))
+    # max-age (segundos) do Cache-Control da busca global
+    SEARCH_HTTP_MAX_AGE: int = int(os.getenv("SEARCH_HTTP_MAX_AGE", "60"))
+
+    # respostas menores que isso (bytes) não são comprimidas
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+    # controle de admissão no entrypoint (utils.admission)
+    ADMISSION_MAX_CONCURRENT: int = int(os.getenv("ADMISSION_MAX_CONCURRENT", "32"))
+    ADMISSION_STANDARD_LIMIT: int = int(os.getenv("ADMISSION_STANDARD_LIMIT", "24"))
+    ADMISSION_EXPENSIVE_LIMIT: int = int(os.getenv("ADMISSION_EXPENSIVE_LIMIT", "6"))
+    # slots que só rotas baratas (health, auth) podem usar
+    ADMISSION_RESERVED_CHEAP: int = int(os.getenv("ADMISSION_RESERVED_CHEAP", "4"))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", "2"))
+
+    # logs: "json" (uma linha por registro, formato do Cloud Logging) ou "text"
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+    # fração registrada dos eventos de alta frequência (utils.logging_setup.log_sampled)
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "cache_hit=0.01,token_validated=0.01")
+    # escrita dos logs numa thread em background; no Cloud Functions (FUNCTION_TARGET/K_SERVICE definidos)
+    # a CPU pode ser suspensa logo após a resposta e a fila não esvaziar, então o padrão lá é síncrono
+    LOG_ASYNC: bool = os.getenv(
+        "LOG_ASYNC", "false" if os.getenv("FUNCTION_TARGET") or os.getenv("K_SERVICE") else "true"
+    ).lower() in ("1", "true", "yes")
+
+    # header Server-Timing e tempos por etapa no log de acesso; desligado, os spans viram no-op
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
 
-    DEFAULT_LIMIT: int = 10
\ No newline at end of file
+    # profiler sob demanda (utils.profiling): "off", "always" ou "sampled" (fração PROFILE_SAMPLE_RATE)
+    PROFILE_MODE = os.getenv("PROFILE_MODE", "off")
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0.01"))
+    # com segredo definido, o header X-Profile-Signature assinado liga o perfil de uma requisição
+    PROFILE_SECRET = os.getenv("PROFILE_SECRET")
+    # "sampling" (pilhas coletadas, todas as threads) ou "cprofile" (pstats, thread da requisição)
+    PROFILE_ENGINE = os.getenv("PROFILE_ENGINE", "sampling")
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "/tmp/starwars-profiles")
+    PROFILE_TOP_N: int = int(os.getenv("PROFILE_TOP_N", "15"))
+    # GET /admin/memory (utils.diagnostics): quadros guardados por alocação no tracemalloc
+    TRACEMALLOC_FRAMES: int = int(os.getenv("TRACEMALLOC_FRAMES", "1"))
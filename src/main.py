@@ -1,139 +1,269 @@
-import sys
-import os
+import time
+import math
+from functools import partial
+from urllib.parse import urlsplit, parse_qsl
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from contextlib import nullcontext
+from contextvars import copy_context
 
 import functions_framework
-from flask import request, jsonify
+from flask import request, current_app, Response, make_response
 
 from config import Config
-from .utils.auth.jwt_manager import TokenManager
-from .utils.validators.film_validator import FilmValidator
-from .utils.validators.character_validator import CharacterValidator
-from .utils.validators.planet_validator import PlanetValidator
-from .utils.validators.starship_validator import StarshipValidator
-from .services.character_service import CharacterService
-from .services.planet_service import PlanetService
-from .services.starship_service import StarshipService
-from .services.film_service import FilmService
+from .utils.validators.resource_schemas import LIST_SCHEMAS, DETAIL_SCHEMAS, LIST_ONLY, MEMORY_REPORT_SCHEMA, SEARCH_SCHEMA
+from .utils.auth.api_key_manager import get_api_key_store
+from .services.registry import (
+    get_character_service,
+    get_planet_service,
+    get_starship_service,
+    get_film_service,
+)
 from .services.swapi.exceptions import SWAPIError
-
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+from .services.swapi.accounting import UpstreamStats, get_upstream_stats, upstream_stats_scope
+from .utils.cache import RequestCache, request_cache_scope
+from .utils.response import json_response, to_json_bytes, JSON_MIMETYPE
+from .utils.response_cache import build_response_key, get_cached_response, set_cached_response
+from .utils.http_cache import NO_STORE, build_cache_headers, etag_matches
+from .utils.compression import negotiate_encoding
+from .utils.admission import admission, ServiceOverloadedError
+from .utils.logging_setup import configure_logging, log_sampled
+from .utils.timing import RequestTimings, timing_scope, span
+from .utils.profiling import profiler_for, finish_profile, track_thread
+from .utils.routing.router import Route, Router
+from .utils.routing.exceptions import RoutingError, RouteNotFoundError, MethodNotAllowedError
+from .utils.fragments import FragmentList
+
+configure_logging()
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("starwars_api.access")
+
+#os singletons (services, SWAPI, índices) são criados sob demanda em services.registry
 
-#singletons da app
-character_service = CharacterService()
-planet_service = PlanetService()
-starship_service = StarshipService()
-film_service = FilmService()
+search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search")
+batch_executor = ThreadPoolExecutor(max_workers=Config.BATCH_MAX_WORKERS, thread_name_prefix="batch")
+
+# o entrypoint ASGI (src.asgi) autentica e admite a requisição antes do prefetch e deixa o resultado no environ:
+# o token bucket da chave é consumido uma vez só, e as chamadas do prefetch entram no X-Upstream da requisição
+UPSTREAM_ENVIRON_KEY = "starwars_api.upstream"
+AUTH_ENVIRON_KEY = "starwars_api.auth"
+ADMISSION_ENVIRON_KEY = "starwars_api.admission"
+REQUEST_CACHE_ENVIRON_KEY = "starwars_api.request_cache"
+QUERY_ENVIRON_KEY = "starwars_api.query"
 
 #entrypoint
 @functions_framework.http
 def starwars_api(request):
+    started = time.perf_counter()
+    timings = RequestTimings() if Config.SERVER_TIMING else None
+    upstream = request.environ.get(UPSTREAM_ENVIRON_KEY)
+    if upstream is None:
+        upstream = UpstreamStats(budget=Config.UPSTREAM_CALL_BUDGET)
+    # sob o ASGI, o cache de requisição traz as falhas do prefetch
+    request_cache = request.environ.get(REQUEST_CACHE_ENVIRON_KEY)
+    profiler = profiler_for(request)
+    if profiler is not None:
+        profiler.start()
+    try:
+        with timing_scope(timings), upstream_stats_scope(upstream), \
+                request_cache_scope(request_cache) if request_cache is not None else nullcontext():
+            response = make_response(_dispatch(request))
+    finally:
+        if profiler is not None:
+            profiler.stop()
+    response.headers["X-Upstream"] = upstream.header()
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    if timings is not None:
+        timings.add("total", duration_ms)
+        response.headers["Server-Timing"] = timings.header()
+        response.headers["Timing-Allow-Origin"] = "*"
+
+    log_sampled(
+        access_logger, "access", "%s %s %d %.1fms", request.method, request.path, response.status_code, duration_ms,
+        method=request.method,
+        path=request.path,
+        status=response.status_code,
+        duration_ms=round(duration_ms, 3),
+        cache=response.headers.get("X-Cache"),
+        timings=timings.as_dict() if timings is not None else None,
+        upstream=upstream.as_dict(),
+    )
+
+    if profiler is not None:
+        attach_profile(response, finish_profile(profiler, request.method, request.path, duration_ms))
+    return response
+
+def attach_profile(response, profile):
+    # resposta de debug: arquivo gerado no header e top-N dentro do JSON (quando dá para emendar)
+    response.headers["X-Profile"] = profile["output"]
+    response.headers.update(NO_STORE)
+    response.headers.pop("ETag", None)
+    if response.is_streamed or response.headers.get("Content-Encoding") or response.mimetype != JSON_MIMETYPE:
+        return
+
+    body = response.get_data()
+    if body.startswith(b"{") and body.endswith(b"}"):
+        separator = b"," if body.strip(b"{} \n") else b""
+        response.set_data(body[:-1] + separator + b'"_profile":' + to_json_bytes(profile) + b"}")
+
+def _dispatch(request):
     headers = {
         "Access-Control-Allow-Origin": "*",
         "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, X-API-Key, Authorization",
+        "Access-Control-Allow-Headers": "Content-Type, X-API-Key, Authorization, If-None-Match, X-Profile-Signature",
+        "Access-Control-Expose-Headers": "ETag, X-Cache, Retry-After, Server-Timing, X-Upstream, X-Profile",
+        # padrão para POST, erros e rotas sem política; rotas GET cacheáveis sobrescrevem
+        **NO_STORE,
     }
 
     if request.method == "OPTIONS":
         return "", 204, headers
 
     path = request.path.rstrip("/")
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
     try:
-        if path == "/auth/login" and request.method == "POST":
-            response, status = handle_login()
-            return jsonify(response), status, headers
-
-        if path == "/auth/refresh" and request.method == "POST":
-            response, status = handle_refresh()
-            return jsonify(response), status, headers
-
-        if path in ("", "/", "/health"):
-            response, status = handle_health()
-            return jsonify(response), status, headers
-
-        auth_error = validate_auth(request)
-        if auth_error:
-            return jsonify(auth_error), 401, headers
-
-        if path == "/characters" and request.method == "GET":
-            response, status = handle_get_characters()
-            return jsonify(response), status, headers
-
-        if path.startswith("/characters/") and request.method == "GET":
-            # Extrai o ID ou sub-recurso da URL
-            parts = path.split("/")
-            resource_id = parts[2] if len(parts) > 2 else None
-            sub_resource = parts[3] if len(parts) > 3 else None
-
-            response, status = handle_character_detail(resource_id, sub_resource)
-            return jsonify(response), status, headers
-
-        if path == "/planets" and request.method == "GET":
-            response, status = handle_get_planets()
-            return jsonify(response), status, headers
-
-        if path.startswith("/planets/") and request.method == "GET":
-            parts = path.split("/")
-            resource_id = parts[2] if len(parts) > 2 else None
-            sub_resource = parts[3] if len(parts) > 3 else None
-
-            response, status = handle_planet_detail(resource_id, sub_resource)
-            return jsonify(response), status, headers
-
-        if path == "/starships" and request.method == "GET":
-            response, status = handle_get_starships()
-            return jsonify(response), status, headers
-
-        if path.startswith("/starships/") and request.method == "GET":
-            parts = path.split("/")
-            resource_id = parts[2] if len(parts) > 2 else None
-            sub_resource = parts[3] if len(parts) > 3 else None
-
-            response, status = handle_starship_detail(resource_id, sub_resource)
-            return jsonify(response), status, headers
-
-        if path == "/films" and request.method == "GET":
-            response, status = handle_get_films()
-            return jsonify(response), status, headers
-
-        if path.startswith("/films/") and request.method == "GET":
-            parts = path.split("/")
-            resource_id = parts[2] if len(parts) > 2 else None
-            sub_resource = parts[3] if len(parts) > 3 else None
-
-            response, status = handle_film_detail(resource_id, sub_resource)
-            return jsonify(response), status, headers
-
-        if path == "/search" and request.method == "GET":
-            response, status = handle_global_search()
-            return jsonify(response), status, headers
-
-        return jsonify({"error": True, "message": f"Endpoint '{path}' não encontrado", "code": 404}), 404, headers
-
+        try:
+            route, params = router.match(request.method, path)
+        except RoutingError:
+            # como antes do router: fora das rotas públicas, sem credencial válida a resposta é 401,
+            # e 404/405/400 de rota só aparecem para quem está autenticado
+            if (path or "/") not in PUBLIC_PATHS:
+                auth_error = check_auth(request)
+                if auth_error:
+                    return auth_error_response(auth_error, headers, encoding)
+            raise
+
+        if not route.public:
+            auth_error = check_auth(request, route.admin)
+            if auth_error:
+                return auth_error_response(auth_error, headers, encoding)
+
+        if route.kind == "stream":
+            with admit(request, route), span("handler"):
+                response, status = route.handler(**params)
+            if status != 200:
+                return json_response(response, status, headers, encoding)
+            return response, status, headers
+
+        if route.kind == "cached":
+            # cache da resposta completa, chaveado por rota + query normalizada
+            with span("cache"):
+                cache_key = response_cache_key(route, path, query_params(route.schema) if route.schema else None)
+                cached = get_cached_response(cache_key) if cache_key is not None else None
+            x_cache = "HIT"
+            if cached is None:
+                # só quem vai executar o handler passa pela admissão; HIT não espera na fila
+                with admit(request, route):
+                    with span("handler"):
+                        response, status = route.handler(**params)
+                    if status != 200 or cache_key is None or is_partial(response):
+                        return json_response(response, status, headers, encoding)
+                    with span("serialize"):
+                        cached = set_cached_response(cache_key, to_json_bytes(response), status)
+                x_cache = "MISS"
+
+            response_headers = {**headers, **build_cache_headers(path, cached, encoding), "X-Cache": x_cache}
+            if etag_matches(request.headers.get("If-None-Match"), cached):
+                return Response(status=304, headers=response_headers)
+
+            # a variante comprimida fica guardada junto da entrada do cache
+            if cached.accepts_encoding(encoding):
+                response_headers["Content-Encoding"] = encoding
+            with span("compress"):
+                body = cached.encoded_body(encoding)
+            return Response(body, status=cached.status, headers=response_headers, mimetype=JSON_MIMETYPE)
+
+        with admit(request, route), span("handler"):
+            response, status = route.handler(**params)
+        return json_response(response, status, headers, encoding)
+
+    except ServiceOverloadedError as e:
+        logger.warning(f"Requisição recusada por sobrecarga: {request.method} {path}")
+        headers = {**headers, "Retry-After": str(e.retry_after)}
+        return json_response({"error": True, "message": e.message, "code": e.status_code}, e.status_code, headers, encoding)
+    except RoutingError as e:
+        if isinstance(e, MethodNotAllowedError):
+            headers = {**headers, "Allow": ", ".join(e.allowed)}
+        return json_response({"error": True, "message": e.message, "code": e.status_code}, e.status_code, headers, encoding)
     except SWAPIError as e:
         logger.error(f"Erro SWAPI: {e.message}")
-        return jsonify({"error": True, "message": e.message, "code": e.status_code}), e.status_code, headers
+        return json_response({"error": True, "message": e.message, "code": e.status_code}, e.status_code, headers, encoding)
     except Exception as e:
         logger.error(f"Erro inesperado: {str(e)}", exc_info=True)
-        return (
-            jsonify({"error": True, "message": "Erro interno do servidor", "code": 500}),
-            500,
-            headers,
-        )
+        return json_response({"error": True, "message": "Erro interno do servidor", "code": 500}, 500, headers, encoding)
+
+def dispatch_get(path):
+    # rotas GET de dados; usado pelo /batch para cada sub-requisição
+    route, params = router.match("GET", path)
+    if route.kind != "cached":
+        raise RouteNotFoundError(path)
+    return route.handler(**params)
+
+def query_params(schema):
+    # a chave do cache de resposta e o handler leem a mesma query: parse uma vez por requisição. Fica no environ,
+    # não no g: as sub-requisições do /batch compartilham o contexto da aplicação com a requisição principal
+    parsed = request.environ.get(QUERY_ENVIRON_KEY)
+    if parsed is None or parsed[0] is not schema:
+        parsed = request.environ[QUERY_ENVIRON_KEY] = (schema, schema.parse(request.args))
+    params, errors = parsed[1]
+    return dict(params), errors
+
+def response_cache_key(route, path, parsed) -> str | None:
+    # a partir dos parâmetros validados e normalizados: desconhecidos e grafias equivalentes ("page=01") não
+    # criam entradas novas. Query inválida (a resposta vai ser 400) não tem chave; rota sem schema ignora a query
+    if route.schema is None:
+        return build_response_key(path, "")
+    params, errors = parsed
+    if errors:
+        return None
+    return build_response_key(path, route.schema.canonical(params))
+
+def is_partial(response) -> bool:
+    # resultado incompleto (ramo da busca com erro ou timeout) não é guardado: sai com no-store
+    return isinstance(response, dict) and bool(response.get("meta", {}).get("partial"))
+
+def check_auth(req, admin=False) -> dict | None:
+    if AUTH_ENVIRON_KEY in req.environ:
+        return req.environ.pop(AUTH_ENVIRON_KEY)
+    with span("auth"):
+        return validate_admin(req) if admin else validate_auth(req)
+
+def admit(req, route):
+    # True: já admitida pelo ASGI; ServiceOverloadedError: recusada lá (a resposta é o 503 de sempre)
+    admitted = req.environ.get(ADMISSION_ENVIRON_KEY)
+    if admitted is None:
+        return admission.admit(route.cost)
+    if isinstance(admitted, ServiceOverloadedError):
+        raise admitted
+    return nullcontext()
+
+def auth_error_response(auth_error, headers, encoding):
+    if "retry_after" in auth_error:
+        headers = {**headers, "Retry-After": str(auth_error["retry_after"])}
+    return json_response(auth_error, auth_error["code"], headers, encoding)
 
 def validate_auth(req) -> dict | None:
     api_key = req.headers.get("X-API-Key")
     if api_key:
-        if api_key == Config.API_KEY:
-            return None
-        return {"error": True, "message": "API Key inválida", "code": 401}
+        key = get_api_key_store().lookup(api_key)
+        if key is None:
+            return {"error": True, "message": "API Key inválida", "code": 401}
+
+        # o limite por chave corta o cliente antes de gastar CPU ou chamadas à SWAPI
+        retry_after = key.bucket.consume() if key.bucket is not None else 0
+        if retry_after:
+            logger.warning(f"Limite de requisições excedido para a API key '{key.name}'")
+            return {"error": True, "message": "Limite de requisições excedido", "code": 429, "retry_after": math.ceil(retry_after)}
+        return None
 
     auth_header = req.headers.get("Authorization")
     if auth_header:
         parts = auth_header.split()
         if len(parts) == 2 and parts[0].lower() == "bearer":
             try:
+                from .utils.auth.jwt_manager import TokenManager
+
                 TokenManager.validate_token(parts[1])
                 return None
             except Exception:
@@ -141,6 +271,28 @@ def validate_auth(req) -> dict | None:
 
     return {"error": True, "message": "Autenticação necessária. Use X-API-Key ou Authorization: Bearer <token>", "code": 401}
 
+def validate_admin(req) -> dict | None:
+    # rotas administrativas só aceitam JWT com role "admin"
+    auth_header = req.headers.get("Authorization")
+    parts = auth_header.split() if auth_header else []
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        return {"error": True, "message": "Autenticação necessária. Use Authorization: Bearer <token>", "code": 401}
+
+    try:
+        from .utils.auth.jwt_manager import TokenManager
+
+        payload = TokenManager.validate_token(parts[1])
+    except Exception:
+        return {"error": True, "message": "Token inválido ou expirado", "code": 401}
+
+    if payload.get("role") != "admin":
+        logger.warning(f"Acesso administrativo negado para '{payload.get('sub')}'")
+        return {"error": True, "message": "Acesso restrito a administradores", "code": 403}
+    return None
+
+def validation_error(errors):
+    return {"error": True, "message": "Erros de validação", "errors": errors, "code": 400}, 400
+
 def handle_login():
     body = request.get_json(silent=True) or {}
     username = body.get("username")
@@ -154,6 +306,8 @@ def handle_login():
     if username not in DEMO_USERS or DEMO_USERS[username] != password:
         return {"error": True, "message": "Usuário ou senha inválidos", "code": 401}, 401
 
+    from .utils.auth.jwt_manager import TokenManager
+
     token = TokenManager.generate_token(username, {"role": "admin" if username == "admin" else "user"})
 
     return {
@@ -171,6 +325,8 @@ def handle_refresh():
 
     old_token = auth_header.split()[1]
     try:
+        from .utils.auth.jwt_manager import TokenManager
+
         new_token = TokenManager.refresh_token(old_token)
         return {
             "token": new_token,
@@ -181,222 +337,290 @@ def handle_refresh():
     except Exception:
         return {"error": True, "message": "Token inválido ou expirado", "code": 401}, 401
 
+def handle_logout():
+    # revoga o token em uso; ele deixa de ser aceito mesmo antes do exp, mas só nesta instância:
+    # a lista de revogados fica em memória (token_cache) e não é compartilhada entre instâncias
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return {"error": True, "message": "Token não fornecido", "code": 401}, 401
+
+    try:
+        from .utils.auth.jwt_manager import TokenManager
+
+        TokenManager.revoke_token(auth_header.split()[1])
+        return {
+            "message": "Token revogado",
+            "scope": "instance",
+            "note": "A revogação vale apenas para a instância que atendeu o logout; outras instâncias aceitam o token até o exp.",
+        }, 200
+    except Exception:
+        return {"error": True, "message": "Token inválido ou expirado", "code": 401}, 401
+
 def handle_health():
     return {
         "status": "ok",
         "message": "Star Wars API está funcionando!",
         "version": "1.0.0",
         "endpoints": {
-            "auth": ["/auth/login", "/auth/refresh"],
-            "characters": ["/characters", "/characters/{id}", "/characters/{id}/films", "/characters/{id}/starships", "/characters/{id}/homeworld"],
-            "planets": ["/planets", "/planets/{id}", "/planets/{id}/residents", "/planets/{id}/films"],
-            "starships": ["/starships", "/starships/{id}", "/starships/{id}/pilots", "/starships/{id}/films"],
-            "films": ["/films", "/films/{id}", "/films/{id}/characters", "/films/{id}/planets", "/films/{id}/starships"],
+            "auth": ["/auth/login", "/auth/refresh", "/auth/logout"],
+            "characters": ["/characters", "/characters/export", "/characters/{id}", "/characters/{id}/films", "/characters/{id}/starships", "/characters/{id}/homeworld"],
+            "planets": ["/planets", "/planets/export", "/planets/{id}", "/planets/{id}/residents", "/planets/{id}/films", "/planets/{id}/resident-films"],
+            "starships": ["/starships", "/starships/export", "/starships/{id}", "/starships/{id}/pilots", "/starships/{id}/films"],
+            "films": ["/films", "/films/export", "/films/{id}", "/films/{id}/characters", "/films/{id}/planets", "/films/{id}/starships"],
             "search": ["/search?q=<termo>"],
+            "batch": ["POST /batch"],
+            "admin": ["/admin/memory"],
         },
     }, 200
 
 def handle_get_characters():
-    params = request.args.to_dict()
-
-    # Validação
-    errors = CharacterValidator.validate(params)
+    params, errors = query_params(LIST_SCHEMAS["characters"])
     if errors:
-        return {"error": True, "message": "Erros de validação", "errors": errors, "code": 400}, 400
-
-    result = character_service.get_characters(
-        search=params.get("search"),
-        name=params.get("name"),
-        gender=params.get("gender"),
-        birth_year=params.get("birth_year"),
-        sort_by=params.get("sort_by"),
-        order=params.get("order", "asc"),
-        page=int(params.get("page", Config.DEFAULT_PAGE)),
-        limit=int(params.get("limit", Config.DEFAULT_LIMIT)),
-    )
-
-    return result, 200
+        return validation_error(errors)
 
+    return get_character_service().get_characters(**params), 200
 
-def handle_character_detail(resource_id, sub_resource):
-    try:
-        char_id = int(resource_id)
-    except (ValueError, TypeError):
-        return {"error": True, "message": "ID deve ser um número inteiro", "code": 400}, 400
 
+def handle_character_detail(char_id, sub_resource=None):
     if sub_resource is None:
-        return character_service.get_character_by_id(char_id), 200
+        params, errors = query_params(DETAIL_SCHEMAS["characters"])
+        if errors:
+            return validation_error(errors)
+        return get_character_service().get_character_by_id(char_id, **params), 200
 
     if sub_resource == "films":
-        return character_service.get_character_films(char_id), 200
+        return get_character_service().get_character_films(char_id), 200
 
     if sub_resource == "starships":
-        return character_service.get_character_starships(char_id), 200
+        return get_character_service().get_character_starships(char_id), 200
 
     if sub_resource == "homeworld":
-        return character_service.get_character_homeworld(char_id), 200
+        return get_character_service().get_character_homeworld(char_id), 200
 
     return {"error": True, "message": f"Sub-recurso '{sub_resource}' não encontrado", "code": 404}, 404
 
 def handle_get_planets():
     #GET /planets — lista com filtros, ordenação, paginação.
-    params = request.args.to_dict()
-
-    errors = PlanetValidator.validate(params)
+    params, errors = query_params(LIST_SCHEMAS["planets"])
     if errors:
-        return {"error": True, "message": "Erros de validação", "errors": errors, "code": 400}, 400
-
-    result = planet_service.get_planets(
-        search=params.get("search"),
-        name=params.get("name"),
-        climate=params.get("climate"),
-        terrain=params.get("terrain"),
-        sort_by=params.get("sort_by"),
-        order=params.get("order", "asc"),
-        page=int(params.get("page", Config.DEFAULT_PAGE)),
-        limit=int(params.get("limit", Config.DEFAULT_LIMIT)),
-    )
-
-    return result, 200
+        return validation_error(errors)
 
+    return get_planet_service().get_planets(**params), 200
 
-def handle_planet_detail(resource_id, sub_resource):
-    try:
-        planet_id = int(resource_id)
-    except (ValueError, TypeError):
-        return {"error": True, "message": "ID deve ser um número inteiro", "code": 400}, 400
 
+def handle_planet_detail(planet_id, sub_resource=None):
     if sub_resource is None:
-        return planet_service.get_planet_by_id(planet_id), 200
+        params, errors = query_params(DETAIL_SCHEMAS["planets"])
+        if errors:
+            return validation_error(errors)
+        return get_planet_service().get_planet_by_id(planet_id, **params), 200
 
     if sub_resource == "residents":
-        return planet_service.get_planet_residents(planet_id), 200
+        return get_planet_service().get_planet_residents(planet_id), 200
 
     if sub_resource == "films":
-        return planet_service.get_planet_films(planet_id), 200
+        return get_planet_service().get_planet_films(planet_id), 200
+
+    if sub_resource == "resident-films":
+        return get_planet_service().get_planet_resident_films(planet_id), 200
 
     return {"error": True, "message": f"Sub-recurso '{sub_resource}' não encontrado", "code": 404}, 404
 
 
 def handle_get_starships():
     # lista com filtros, ordenação, paginação.
-    params = request.args.to_dict()
-
-    errors = StarshipValidator.validate(params)
+    params, errors = query_params(LIST_SCHEMAS["starships"])
     if errors:
-        return {"error": True, "message": "Erros de validação", "errors": errors, "code": 400}, 400
-
-    result = starship_service.get_starships(
-        search=params.get("search"),
-        name=params.get("name"),
-        model=params.get("model"),
-        manufacturer=params.get("manufacturer"),
-        starship_class=params.get("starship_class"),
-        sort_by=params.get("sort_by"),
-        order=params.get("order", "asc"),
-        page=int(params.get("page", Config.DEFAULT_PAGE)),
-        limit=int(params.get("limit", Config.DEFAULT_LIMIT)),
-    )
+        return validation_error(errors)
 
-    return result, 200
+    return get_starship_service().get_starships(**params), 200
 
 
-def handle_starship_detail(resource_id, sub_resource):
+def handle_starship_detail(starship_id, sub_resource=None):
     #GET /starships/{id} e sub-recursos.
-    try:
-        starship_id = int(resource_id)
-    except (ValueError, TypeError):
-        return {"error": True, "message": "ID deve ser um número inteiro", "code": 400}, 400
-
     if sub_resource is None:
-        return starship_service.get_starship_by_id(starship_id), 200
+        params, errors = query_params(DETAIL_SCHEMAS["starships"])
+        if errors:
+            return validation_error(errors)
+        return get_starship_service().get_starship_by_id(starship_id, **params), 200
 
     if sub_resource == "pilots":
-        return starship_service.get_starship_pilots(starship_id), 200
+        return get_starship_service().get_starship_pilots(starship_id), 200
 
     if sub_resource == "films":
-        return starship_service.get_starship_films(starship_id), 200
+        return get_starship_service().get_starship_films(starship_id), 200
 
     return {"error": True, "message": f"Sub-recurso '{sub_resource}' não encontrado", "code": 404}, 404
 
 def handle_get_films():
     #GET /films — lista com filtros, ordenação, paginação.
-    params = request.args.to_dict()
-
-    errors = FilmValidator.validate(params)
+    params, errors = query_params(LIST_SCHEMAS["films"])
     if errors:
-        return {"error": True, "message": "Erros de validação", "errors": errors, "code": 400}, 400
+        return validation_error(errors)
 
-    episode_id = params.get("episode_id")
-    if episode_id is not None:
-        try:
-            episode_id = int(episode_id)
-        except ValueError:
-            return {"error": True, "message": "episode_id deve ser um número inteiro", "code": 400}, 400
-
-    result = film_service.get_films(
-        search=params.get("search"),
-        title=params.get("title"),
-        director=params.get("director"),
-        episode_id=episode_id,
-        sort_by=params.get("sort_by"),
-        order=params.get("order", "asc"),
-        page=int(params.get("page", Config.DEFAULT_PAGE)),
-        limit=int(params.get("limit", Config.DEFAULT_LIMIT)),
-    )
+    return get_film_service().get_films(**params), 200
 
-    return result, 200
 
-
-def handle_film_detail(resource_id, sub_resource):
+def handle_film_detail(film_id, sub_resource=None):
     #GET /films/{id} e sub-recursos.
-    try:
-        film_id = int(resource_id)
-    except (ValueError, TypeError):
-        return {"error": True, "message": "ID deve ser um número inteiro", "code": 400}, 400
-
     if sub_resource is None:
-        return film_service.get_film_by_id(film_id), 200
+        params, errors = query_params(DETAIL_SCHEMAS["films"])
+        if errors:
+            return validation_error(errors)
+        return get_film_service().get_film_by_id(film_id, **params), 200
 
     if sub_resource == "characters":
-        return film_service.get_film_characters(film_id), 200
+        return get_film_service().get_film_characters(film_id), 200
 
     if sub_resource == "planets":
-        return film_service.get_film_planets(film_id), 200
+        return get_film_service().get_film_planets(film_id), 200
 
     if sub_resource == "starships":
-        return film_service.get_film_starships(film_id), 200
+        return get_film_service().get_film_starships(film_id), 200
 
     return {"error": True, "message": f"Sub-recurso '{sub_resource}' não encontrado", "code": 404}, 404
 
-def handle_global_search():
-    query = request.args.get("q")
-    search_type = request.args.get("type", "all").lower()
+def handle_export(resource):
+    # GET /<recurso>/export — NDJSON em streaming com os mesmos filtros e ordenação da listagem
+    get_service, method = {
+        "characters": (get_character_service, "export_characters"),
+        "planets": (get_planet_service, "export_planets"),
+        "starships": (get_starship_service, "export_starships"),
+        "films": (get_film_service, "export_films"),
+    }[resource]
 
-    if not query or len(query) < 2:
-        return {"error": True, "message": "Parâmetro 'q' é obrigatório e deve ter pelo menos 2 caracteres", "code": 400}, 400
+    params, errors = query_params(LIST_SCHEMAS[resource])
+    if errors:
+        return validation_error(errors)
 
-    valid_types = ("all", "characters", "planets", "starships", "films")
-    if search_type not in valid_types:
-        return {"error": True, "message": f"'type' deve ser um de: {', '.join(valid_types)}", "code": 400}, 400
+    export = getattr(get_service(), method)
+    rows = export(**{name: value for name, value in params.items() if name not in LIST_ONLY})
 
-    results = {}
+    def generate():
+        for row in rows:
+            yield to_json_bytes(row) + b"\n"
+
+    return Response(generate(), mimetype="application/x-ndjson"), 200
+
+
+def handle_batch():
+    # POST /batch — executa várias sub-requisições GET em paralelo com uma única autenticação
+    body = request.get_json(silent=True) or {}
+    items = body.get("requests")
+
+    if not isinstance(items, list) or not items:
+        return {"error": True, "message": "Envie 'requests' como uma lista de sub-requisições", "code": 400}, 400
+
+    if len(items) > Config.BATCH_MAX_REQUESTS:
+        return {"error": True, "message": f"O batch não deve exceder {Config.BATCH_MAX_REQUESTS} sub-requisições", "code": 400}, 400
+
+    app = current_app._get_current_object()
+    shared_cache = RequestCache()
+
+    futures = [
+        batch_executor.submit(copy_context().run, track_thread(_run_batch_item), app, shared_cache, index, item)
+        for index, item in enumerate(items)
+    ]
+    results = [future.result() for future in futures]
+
+    return {
+        "results": FragmentList(results),
+        "total": len(results),
+        "succeeded": sum(1 for r in results if r["status"] < 400),
+    }, 200
+
+
+def _run_batch_item(app, shared_cache, index, item):
+    if isinstance(item, str):
+        item = {"path": item}
+
+    item_id = item.get("id", index) if isinstance(item, dict) else index
+    path = item.get("path") if isinstance(item, dict) else None
+    method = (item.get("method") or "GET").upper() if isinstance(item, dict) else "GET"
 
-    if search_type in ("all", "characters"):
-        char_result = character_service.get_characters(search=query, limit=5)
-        results["characters"] = char_result["data"]
+    if not isinstance(path, str) or not path.startswith("/"):
+        return {"id": item_id, "path": path, "status": 400,
+                "body": {"error": True, "message": "Cada sub-requisição precisa de um 'path' iniciando com '/'", "code": 400}}
 
-    if search_type in ("all", "planets"):
-        planet_result = planet_service.get_planets(search=query, limit=5)
-        results["planets"] = planet_result["data"]
+    if method != "GET":
+        return {"id": item_id, "path": path, "status": 405,
+                "body": {"error": True, "message": "O batch aceita apenas sub-requisições GET", "code": 405}}
 
-    if search_type in ("all", "starships"):
-        ship_result = starship_service.get_starships(search=query, limit=5)
-        results["starships"] = ship_result["data"]
+    params = item.get("params") or {}
+    if not isinstance(params, dict):
+        return {"id": item_id, "path": path, "status": 400,
+                "body": {"error": True, "message": "'params' deve ser um objeto com os parâmetros da query", "code": 400}}
 
-    if search_type in ("all", "films"):
-        film_result = film_service.get_films(search=query, limit=5)
-        results["films"] = film_result["data"]
+    # "/films?sort_by=episode_id": a query do path se junta aos params (que têm precedência)
+    url = urlsplit(path)
+    params = {**dict(parse_qsl(url.query, keep_blank_values=True)), **params}
+
+    def execute():
+        with app.test_request_context(url.path, method="GET", query_string=params):
+            return dispatch_get(request.path.rstrip("/"))
+
+    # cada sub-requisição tem o próprio orçamento de chamadas; o X-Upstream do batch mostra a soma
+    parent_stats = get_upstream_stats()
+    item_stats = parent_stats.child(Config.UPSTREAM_CALL_BUDGET) if parent_stats is not None else None
+
+    try:
+        with request_cache_scope(shared_cache), upstream_stats_scope(item_stats):
+            # sub-requisições idênticas dentro do batch são executadas uma única vez
+            cache_key = f"route:{url.path}?{sorted(params.items(), key=str)}"
+            response, status = shared_cache.get_or_compute(cache_key, execute)
+    except (RoutingError, SWAPIError) as e:
+        logger.error(f"Erro no batch ({path}): {e.message}")
+        response, status = {"error": True, "message": e.message, "code": e.status_code}, e.status_code
+    except Exception as e:
+        logger.error(f"Erro inesperado no batch ({path}): {str(e)}", exc_info=True)
+        response, status = {"error": True, "message": "Erro interno do servidor", "code": 500}, 500
+
+    return {"id": item_id, "path": path, "status": status, "body": response}
+
+
+def handle_global_search():
+    params, errors = query_params(SEARCH_SCHEMA)
+    query, search_type = params["q"], params["type"]
+
+    if not query or len(query) < 2:
+        return {"error": True, "message": "Parâmetro 'q' é obrigatório e deve ter pelo menos 2 caracteres", "code": 400}, 400
+    if errors:
+        return {"error": True, "message": next(iter(errors.values()))[0], "code": 400}, 400
+
+    branches = {
+        "characters": lambda: get_character_service().get_characters(search=query, limit=5),
+        "planets": lambda: get_planet_service().get_planets(search=query, limit=5),
+        "starships": lambda: get_starship_service().get_starships(search=query, limit=5),
+        "films": lambda: get_film_service().get_films(search=query, limit=5),
+    }
+    selected = [name for name in branches if search_type in ("all", name)]
+
+    # os ramos rodam em paralelo sob um único deadline; o tempo de cada um vai para o Server-Timing
+    # (search-<recurso>), não para o corpo, que é cacheado e vira ETag
+    futures = {
+        search_executor.submit(copy_context().run, track_thread(_timed_search_branch), name, branches[name]): name
+        for name in selected
+    }
+
+    results = {}
+    statuses = {}
+    try:
+        for future in as_completed(futures, timeout=Config.SEARCH_TIMEOUT):
+            name = futures[future]
+            data, error = future.result()
+            results[name] = data
+            statuses[name] = {"status": "error", "message": error} if error else {"status": "ok"}
+    except FuturesTimeoutError:
+        logger.warning(f"Deadline de {Config.SEARCH_TIMEOUT}s excedido na busca global: {query}")
+
+    for future, name in futures.items():
+        if name not in results:
+            future.cancel()
+            results[name] = []
+            statuses[name] = {"status": "timeout"}
+
+    # mantém a ordem fixa dos recursos na resposta
+    results = {name: results[name] for name in selected}
 
     # Conta total de resultados
     total = sum(len(v) for v in results.values())
@@ -406,4 +630,65 @@ def handle_global_search():
         "type": search_type,
         "total_results": total,
         "results": results,
+        "meta": {
+            # partial: algum ramo falhou ou estourou o deadline; a resposta não entra no cache (ver _dispatch)
+            "partial": any(statuses[name]["status"] != "ok" for name in selected),
+            "branches": {name: statuses[name] for name in selected},
+        },
     }, 200
+
+
+def handle_memory_report():
+    params, errors = MEMORY_REPORT_SCHEMA.parse(request.args)
+    if errors:
+        return validation_error(errors)
+
+    # import tardio: o módulo lê o estado de todos os caches e não é necessário no cold start
+    from .utils.diagnostics import memory_report
+
+    return memory_report(params["top"], params["tracemalloc"]), 200
+
+
+def _timed_search_branch(name, fn):
+    with span(f"search-{name}"):
+        try:
+            return fn()["data"], None
+        except SWAPIError as e:
+            logger.error(f"Erro SWAPI na busca global: {e.message}")
+            return [], e.message
+
+
+# tabela de rotas, compilada uma vez no import
+ROUTES = [
+    Route("POST", "/auth/login", handle_login, public=True, kind="plain", cost="cheap"),
+    Route("POST", "/auth/refresh", handle_refresh, public=True, kind="plain", cost="cheap"),
+    Route("POST", "/auth/logout", handle_logout, public=True, kind="plain", cost="cheap"),
+    Route("GET", "/", handle_health, public=True, kind="plain", cost="cheap"),
+    Route("GET", "/health", handle_health, public=True, kind="plain", cost="cheap"),
+    Route("POST", "/batch", handle_batch, kind="plain", cost="expensive"),
+    Route("GET", "/search", handle_global_search, cost="expensive", schema=SEARCH_SCHEMA),
+    Route("GET", "/admin/memory", handle_memory_report, kind="plain", cost="expensive", admin=True),
+
+    Route("GET", "/characters", handle_get_characters, schema=LIST_SCHEMAS["characters"]),
+    Route("GET", "/characters/export", partial(handle_export, "characters"), kind="stream", cost="expensive"),
+    Route("GET", "/characters/<int:char_id>", handle_character_detail, schema=DETAIL_SCHEMAS["characters"]),
+    Route("GET", "/characters/<int:char_id>/<sub_resource>", handle_character_detail),
+
+    Route("GET", "/planets", handle_get_planets, schema=LIST_SCHEMAS["planets"]),
+    Route("GET", "/planets/export", partial(handle_export, "planets"), kind="stream", cost="expensive"),
+    Route("GET", "/planets/<int:planet_id>", handle_planet_detail, schema=DETAIL_SCHEMAS["planets"]),
+    Route("GET", "/planets/<int:planet_id>/<sub_resource>", handle_planet_detail),
+
+    Route("GET", "/starships", handle_get_starships, schema=LIST_SCHEMAS["starships"]),
+    Route("GET", "/starships/export", partial(handle_export, "starships"), kind="stream", cost="expensive"),
+    Route("GET", "/starships/<int:starship_id>", handle_starship_detail, schema=DETAIL_SCHEMAS["starships"]),
+    Route("GET", "/starships/<int:starship_id>/<sub_resource>", handle_starship_detail),
+
+    Route("GET", "/films", handle_get_films, schema=LIST_SCHEMAS["films"]),
+    Route("GET", "/films/export", partial(handle_export, "films"), kind="stream", cost="expensive"),
+    Route("GET", "/films/<int:film_id>", handle_film_detail, schema=DETAIL_SCHEMAS["films"]),
+    Route("GET", "/films/<int:film_id>/<sub_resource>", handle_film_detail),
+]
+
+router = Router(ROUTES)
+PUBLIC_PATHS = frozenset(route.template for route in ROUTES if route.public)
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Dict, FrozenSet, Optional
+
+class SwapiModel(BaseModel):
+    # JSON já codificado desta entidade, por projeção de campos (ver utils.fragments)
+    _json_fragments: Dict[Optional[FrozenSet[str]], bytes] = PrivateAttr(default_factory=dict)
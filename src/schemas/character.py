@@ -1,8 +1,7 @@
-from pydantic import BaseModel
+from .base import SwapiModel
 from typing import List, Optional
-from datetime import datetime
 
-class Character(BaseModel):
+class Character(SwapiModel):
     name: str = "Unknown"
     height: Optional[str] = None
     mass: Optional[str] = None
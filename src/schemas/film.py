@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from .base import SwapiModel
 from typing import List, Optional
 
-class Film(BaseModel):
+class Film(SwapiModel):
     title: str
     episode_id: int
     opening_crawl: Optional[str] = "Unknown"
@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from .base import SwapiModel
 from typing import Optional, List
 
-class Planet(BaseModel):
+class Planet(SwapiModel):
     name: str = "Unknown"
     rotation_period: Optional[int] = None
     orbital_period: Optional[int] = None
@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from .base import SwapiModel
 from typing import List, Optional
 
-class Starship(BaseModel):
+class Starship(SwapiModel):
     name: str = "Unknown"
     model: Optional[str] = "Unknown"
     manufacturer: Optional[str] = "Unknown"
@@ -1,17 +1,26 @@
-from typing import Any, Dict, List, Optional
-import sys
-import os
+from typing import Any, Dict, List, Optional, Iterator, Union
 import logging
 from config import Config
 from .swapi.swapi_manager import SwapiManager
 from .swapi.utils import extract_id_from_url
+from .search.search_index import SearchIndex
+from .graph.relationship_graph import RelationshipGraph
 from ..schemas.character import Character
+from ..utils.fragments import JSONFragment, encode_fragment, get_models
+from ..utils.timing import timed
 
 logger = logging.getLogger(__name__)
 
 class CharacterService:
-    def __init__(self, swapi_service: Optional[SwapiManager] = None):
+    def __init__(
+            self,
+            swapi_service: Optional[SwapiManager] = None,
+            search_index: Optional[SearchIndex] = None,
+            relationship_graph: Optional[RelationshipGraph] = None,
+    ):
         self.swapi_service = swapi_service or SwapiManager()
+        self.search_index = search_index or SearchIndex(self.swapi_service)
+        self.graph = relationship_graph or RelationshipGraph(self.swapi_service)
 
     def get_characters(
             self,
@@ -23,15 +32,26 @@ class CharacterService:
             order: str = "asc",
             page: int = 1,
             limit: int = Config.DEFAULT_LIMIT,
+            expand: Optional[List[str]] = None,
+            ids: Optional[List[int]] = None,
+            fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        if search:
-            raw = self.swapi_service.fetch("people", {"search": search})
-            items = raw.get("results", [])
+        missing_ids: List[int] = []
+        if ids:
+            # busca por lista de ids: mantém a ordem pedida e reporta os ids inexistentes
+            requested = list(dict.fromkeys(ids))
+            found = self.swapi_service.fetch_many_by_id("people", requested)
+            items = [found[i] for i in requested if i in found]
+            missing_ids = [i for i in requested if i not in found]
+            # os ids já delimitam a resposta: tudo numa página só, sem page/limit
+            page, limit = 1, len(requested)
+        elif search:
+            items = self.search_index.search("people", search)
         else:
             items = self.swapi_service.fetch_all("people")
 
         #conversao para models
-        characters = [Character(**item) for item in items]
+        characters = get_models("people", Character, items)
         #filtragem
         characters = self._filter(characters, name=name, gender=gender, birth_year=birth_year)
 
@@ -45,8 +65,8 @@ class CharacterService:
         end = start + limit
         page_data = characters[start:end]
 
-        return {
-            "data": [c.model_dump() for c in page_data],
+        result = {
+            "data": self._render(page_data, expand, fields),
             "pagination": {
                 "page": page,
                 "limit": limit,
@@ -57,20 +77,32 @@ class CharacterService:
             },
         }
 
-    def get_character_by_id(self, character_id: int) -> Dict[str, Any]:
+        if ids:
+            result["missing_ids"] = missing_ids
+
+        return result
+
+    def get_character_by_id(
+            self,
+            character_id: int,
+            expand: Optional[List[str]] = None,
+            fields: Optional[List[str]] = None,
+    ) -> Union[JSONFragment, Dict[str, Any]]:
         data = self.swapi_service.fetch_by_id("people", character_id)
-        return Character(**data).model_dump()
+        model = get_models("people", Character, [data])[0]
+        # a entidade sozinha é o corpo inteiro: o JSON já codificado sai como está (utils.fragments)
+        if not expand:
+            return encode_fragment(model, fields)
+        return self._render([model], expand, fields)[0]
 
     def get_character_films(self, character_id: int) -> Dict[str, Any]:
-        character_data = self.swapi_service.fetch_by_id("people", character_id)
-        character = Character(**character_data)
+        character = Character(**self.graph.get("people", character_id))
 
         films = []
-        for film_url in character.films:
-            film_data = self.swapi_service.fetch_by_url(film_url)
+        for film_data in self.graph.related("people", character_id, "films"):
             films.append(
                 {
-                    "id": extract_id_from_url(film_url),
+                    "id": extract_id_from_url(film_data.get("url")),
                     "title": film_data.get("title"),
                     "episode_id": film_data.get("episode_id"),
                     "release_date": film_data.get("release_date"),
@@ -86,15 +118,13 @@ class CharacterService:
 
 
     def get_character_starships(self, character_id: int) -> Dict[str, Any]:
-        character_data = self.swapi_service.fetch_by_id("people", character_id)
-        character = Character(**character_data)
+        character = Character(**self.graph.get("people", character_id))
 
         starships = []
-        for ship_url in character.starships:
-            ship_data = self.swapi_service.fetch_by_url(ship_url)
+        for ship_data in self.graph.related("people", character_id, "starships"):
             starships.append(
                 {
-                    "id": extract_id_from_url(ship_url),
+                    "id": extract_id_from_url(ship_data.get("url")),
                     "name": ship_data.get("name"),
                     "model": ship_data.get("model"),
                     "manufacturer": ship_data.get("manufacturer"),
@@ -110,10 +140,10 @@ class CharacterService:
 
 
     def get_character_homeworld(self, character_id: int) -> Dict[str, Any]:
-        character_data = self.swapi_service.fetch_by_id("people", character_id)
-        character = Character(**character_data)
+        character = Character(**self.graph.get("people", character_id))
 
-        planet_data = self.swapi_service.fetch_by_url(character.homeworld)
+        homeworld = self.graph.related("people", character_id, "homeworld")
+        planet_data = homeworld[0] if homeworld else {}
 
         return {
             "character": {"id": character_id, "name": character.name},
@@ -127,7 +157,50 @@ class CharacterService:
             },
         }
 
+    def export_characters(
+            self,
+            search: Optional[str] = None,
+            name: Optional[str] = None,
+            gender: Optional[str] = None,
+            birth_year: Optional[str] = None,
+            sort_by: Optional[str] = None,
+            order: str = "asc",
+    ) -> Iterator[JSONFragment]:
+        # a coleção é carregada aqui (erros da SWAPI saem antes do streaming começar)
+        if search:
+            items = self.search_index.search("people", search)
+        else:
+            items = self.swapi_service.fetch_all("people")
+
+        return self._export(items, sort_by=sort_by, order=order, name=name, gender=gender, birth_year=birth_year)
+
+    @timed("render")
+    def _render(
+            self,
+            characters: List[Character],
+            expand: Optional[List[str]] = None,
+            fields: Optional[List[str]] = None,
+    ) -> List[Union[Character, Dict[str, Any]]]:
+        # sem expand nem fields os models seguem direto para a serialização (utils.response), sem model_dump
+        if not expand and not fields:
+            return characters
+
+        include = set(fields) if fields else None
+        dumped = [c.model_dump(include=include) for c in characters]
+        return self.graph.expand("people", dumped, expand) if expand else dumped
+
+    def _export(self, items, sort_by, order, **filters) -> Iterator[JSONFragment]:
+        if sort_by:
+            # ordenar exige a coleção inteira; sem ordenação os modelos são gerados um a um
+            characters = self._sort(self._filter(get_models("people", Character, items), **filters), sort_by=sort_by, order=order)
+        else:
+            characters = (character for item in items for character in self._filter(get_models("people", Character, [item]), **filters))
+
+        for character in characters:
+            yield encode_fragment(character)
+
     @staticmethod
+    @timed("filter")
     def _filter(
             characters: List[Character],
             name: Optional[str] = None,
@@ -150,6 +223,7 @@ class CharacterService:
         return result
 
     @staticmethod
+    @timed("sort")
     def _sort(
             characters: List[Character],
             sort_by: Optional[str] = None,
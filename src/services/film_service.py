@@ -1,16 +1,24 @@
-import sys
-import os
-import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Iterator, Union
 
 from config import Config
 from .swapi.swapi_manager import SwapiManager
 from .swapi.utils import extract_id_from_url
+from .search.search_index import SearchIndex
+from .graph.relationship_graph import RelationshipGraph
 from ..schemas.film import Film
+from ..utils.fragments import JSONFragment, encode_fragment, get_models
+from ..utils.timing import timed
 
 class FilmService:
-    def __init__(self, swapi_service: Optional[SwapiManager] = None):
+    def __init__(
+        self,
+        swapi_service: Optional[SwapiManager] = None,
+        search_index: Optional[SearchIndex] = None,
+        relationship_graph: Optional[RelationshipGraph] = None,
+    ):
         self.swapi = swapi_service or SwapiManager()
+        self.search_index = search_index or SearchIndex(self.swapi)
+        self.graph = relationship_graph or RelationshipGraph(self.swapi)
 
     def get_films(
         self,
@@ -22,14 +30,25 @@ class FilmService:
         order: str = "asc",
         page: int = 1,
         limit: int = Config.DEFAULT_LIMIT,
+        expand: Optional[List[str]] = None,
+        ids: Optional[List[int]] = None,
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        if search:
-            raw = self.swapi.fetch("films", {"search": search})
-            items = raw.get("results", [])
+        missing_ids: List[int] = []
+        if ids:
+            # busca por lista de ids: mantém a ordem pedida e reporta os ids inexistentes
+            requested = list(dict.fromkeys(ids))
+            found = self.swapi.fetch_many_by_id("films", requested)
+            items = [found[i] for i in requested if i in found]
+            missing_ids = [i for i in requested if i not in found]
+            # os ids já delimitam a resposta: tudo numa página só, sem page/limit
+            page, limit = 1, len(requested)
+        elif search:
+            items = self.search_index.search("films", search)
         else:
             items = self.swapi.fetch_all("films")
 
-        films = [Film(**item) for item in items]
+        films = get_models("films", Film, items)
         films = self._filter(films, title=title, director=director, episode_id=episode_id)
         films = self._sort(films, sort_by=sort_by, order=order)
 
@@ -38,8 +57,8 @@ class FilmService:
         start = (page - 1) * limit
         page_data = films[start : start + limit]
 
-        return {
-            "data": [f.model_dump() for f in page_data],
+        result = {
+            "data": self._render(page_data, expand, fields),
             "pagination": {
                 "page": page,
                 "limit": limit,
@@ -50,20 +69,32 @@ class FilmService:
             },
         }
 
-    def get_film_by_id(self, film_id: int) -> Dict[str, Any]:
+        if ids:
+            result["missing_ids"] = missing_ids
+
+        return result
+
+    def get_film_by_id(
+        self,
+        film_id: int,
+        expand: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Union[JSONFragment, Dict[str, Any]]:
         data = self.swapi.fetch_by_id("films", film_id)
-        return Film(**data).model_dump()
+        model = get_models("films", Film, [data])[0]
+        # a entidade sozinha é o corpo inteiro: o JSON já codificado sai como está (utils.fragments)
+        if not expand:
+            return encode_fragment(model, fields)
+        return self._render([model], expand, fields)[0]
 
     def get_film_characters(self, film_id: int) -> Dict[str, Any]:
-        film_data = self.swapi.fetch_by_id("films", film_id)
-        film = Film(**film_data)
+        film = Film(**self.graph.get("films", film_id))
 
         characters = []
-        for char_url in film.characters:
-            char_data = self.swapi.fetch_by_url(char_url)
+        for char_data in self.graph.related("films", film_id, "characters"):
             characters.append(
                 {
-                    "id": extract_id_from_url(char_url),
+                    "id": extract_id_from_url(char_data.get("url")),
                     "name": char_data.get("name"),
                     "gender": char_data.get("gender"),
                     "birth_year": char_data.get("birth_year"),
@@ -77,15 +108,13 @@ class FilmService:
         }
 
     def get_film_planets(self, film_id: int) -> Dict[str, Any]:
-        film_data = self.swapi.fetch_by_id("films", film_id)
-        film = Film(**film_data)
+        film = Film(**self.graph.get("films", film_id))
 
         planets = []
-        for planet_url in film.planets:
-            planet_data = self.swapi.fetch_by_url(planet_url)
+        for planet_data in self.graph.related("films", film_id, "planets"):
             planets.append(
                 {
-                    "id": extract_id_from_url(planet_url),
+                    "id": extract_id_from_url(planet_data.get("url")),
                     "name": planet_data.get("name"),
                     "climate": planet_data.get("climate"),
                     "terrain": planet_data.get("terrain"),
@@ -99,15 +128,13 @@ class FilmService:
         }
 
     def get_film_starships(self, film_id: int) -> Dict[str, Any]:
-        film_data = self.swapi.fetch_by_id("films", film_id)
-        film = Film(**film_data)
+        film = Film(**self.graph.get("films", film_id))
 
         starships = []
-        for ship_url in film.starships:
-            ship_data = self.swapi.fetch_by_url(ship_url)
+        for ship_data in self.graph.related("films", film_id, "starships"):
             starships.append(
                 {
-                    "id": extract_id_from_url(ship_url),
+                    "id": extract_id_from_url(ship_data.get("url")),
                     "name": ship_data.get("name"),
                     "model": ship_data.get("model"),
                     "starship_class": ship_data.get("starship_class"),
@@ -120,7 +147,50 @@ class FilmService:
             "total_starships": len(starships),
         }
 
+    def export_films(
+        self,
+        search: Optional[str] = None,
+        title: Optional[str] = None,
+        director: Optional[str] = None,
+        episode_id: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        order: str = "asc",
+    ) -> Iterator[JSONFragment]:
+        # a coleção é carregada aqui (erros da SWAPI saem antes do streaming começar)
+        if search:
+            items = self.search_index.search("films", search)
+        else:
+            items = self.swapi.fetch_all("films")
+
+        return self._export(items, sort_by=sort_by, order=order, title=title, director=director, episode_id=episode_id)
+
+    @timed("render")
+    def _render(
+        self,
+        films: List[Film],
+        expand: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Union[Film, Dict[str, Any]]]:
+        # sem expand nem fields os models seguem direto para a serialização (utils.response), sem model_dump
+        if not expand and not fields:
+            return films
+
+        include = set(fields) if fields else None
+        dumped = [f.model_dump(include=include) for f in films]
+        return self.graph.expand("films", dumped, expand) if expand else dumped
+
+    def _export(self, items, sort_by, order, **filters) -> Iterator[JSONFragment]:
+        if sort_by:
+            # ordenar exige a coleção inteira; sem ordenação os modelos são gerados um a um
+            films = self._sort(self._filter(get_models("films", Film, items), **filters), sort_by=sort_by, order=order)
+        else:
+            films = (film for item in items for film in self._filter(get_models("films", Film, [item]), **filters))
+
+        for film in films:
+            yield encode_fragment(film)
+
     @staticmethod
+    @timed("filter")
     def _filter(
         films: List[Film],
         title: Optional[str] = None,
@@ -143,6 +213,7 @@ class FilmService:
         return result
 
     @staticmethod
+    @timed("sort")
     def _sort(
         films: List[Film],
         sort_by: Optional[str] = None,
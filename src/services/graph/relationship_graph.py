@@ -0,0 +1,165 @@
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..swapi.swapi_manager import SwapiManager
+from ..swapi.utils import extract_id_from_url, extract_endpoint_from_url
+from ...utils.timing import timed
+
+logger = logging.getLogger(__name__)
+
+NodeKey = Tuple[str, int]
+
+
+class _GraphSnapshot:
+    def __init__(self, collections: Dict[str, List[Dict[str, Any]]], relations: Dict[str, Dict[str, str]]):
+        self.collections = collections
+        self.nodes: Dict[NodeKey, Dict[str, Any]] = {}
+        # (endpoint, id) -> relação -> [destinos], na ordem original da SWAPI
+        self.forward: Dict[NodeKey, Dict[str, List[NodeKey]]] = defaultdict(dict)
+
+        for endpoint, items in collections.items():
+            for item in items:
+                resource_id = extract_id_from_url(item.get("url"))
+                if resource_id is not None:
+                    self.nodes[(endpoint, resource_id)] = item
+
+        for (endpoint, resource_id), item in self.nodes.items():
+            source = (endpoint, resource_id)
+            for relation, target_endpoint in relations.get(endpoint, {}).items():
+                urls = item.get(relation) or []
+                if isinstance(urls, str):
+                    urls = [urls]
+
+                targets = []
+                for url in urls:
+                    target_id = extract_id_from_url(url)
+                    if target_id is None:
+                        continue
+                    targets.append((target_endpoint, target_id))
+                self.forward[source][relation] = targets
+
+
+class RelationshipGraph:
+    # relação -> endpoint de destino
+    RELATIONS = {
+        "people": {"homeworld": "planets", "films": "films", "starships": "starships"},
+        "planets": {"residents": "people", "films": "films"},
+        "starships": {"pilots": "people", "films": "films"},
+        "films": {"characters": "people", "planets": "planets", "starships": "starships"},
+    }
+
+    def __init__(self, swapi_service: Optional[SwapiManager] = None):
+        self.swapi = swapi_service or SwapiManager()
+        self._snapshot: Optional[_GraphSnapshot] = None
+
+    def get(self, endpoint: str, resource_id: int) -> Dict[str, Any]:
+        node = self._get_snapshot().nodes.get((endpoint, resource_id))
+        if node is None:
+            # fora do índice: a SWAPI decide (e levanta 404 se não existir)
+            return self.swapi.fetch_by_id(endpoint, resource_id)
+        return node
+
+    def related(self, endpoint: str, resource_id: int, relation: str) -> List[Dict[str, Any]]:
+        snapshot = self._get_snapshot()
+        source = (endpoint, resource_id)
+        if source not in snapshot.nodes:
+            return self._related_from_upstream(endpoint, resource_id, relation)
+
+        return [self._resolve(snapshot, target) for target in snapshot.forward[source].get(relation, [])]
+
+    def traverse(self, endpoint: str, resource_id: int, *relations: str) -> List[Dict[str, Any]]:
+        # segue várias relações em sequência, ex.: ("planets", 1, "residents", "films")
+        snapshot = self._get_snapshot()
+        frontier: List[NodeKey] = [(endpoint, resource_id)]
+
+        for relation in relations:
+            seen = set()
+            next_frontier = []
+            for node in frontier:
+                for target in snapshot.forward.get(node, {}).get(relation, []):
+                    if target not in seen:
+                        seen.add(target)
+                        next_frontier.append(target)
+            frontier = next_frontier
+
+        return [snapshot.nodes[node] for node in frontier if node in snapshot.nodes]
+
+    @timed("expand")
+    def expand(self, endpoint: str, items: List[Dict[str, Any]], relations: List[str]) -> List[Dict[str, Any]]:
+        # substitui os urls das relações pedidas pelos objetos relacionados, resolvendo a página inteira em lote
+        relations = [relation for relation in relations or [] if relation in self.RELATIONS[endpoint]]
+        if not relations or not items:
+            return items
+
+        urls = []
+        for item in items:
+            for relation in relations:
+                urls.extend(self._as_url_list(item.get(relation)))
+
+        resolved = self.resolve_urls(urls)
+
+        for item in items:
+            for relation in relations:
+                value = item.get(relation)
+                if isinstance(value, list):
+                    item[relation] = [resolved[url] for url in value if url in resolved]
+                elif value:
+                    item[relation] = resolved.get(value)
+
+        return items
+
+    def resolve_urls(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        snapshot = self._get_snapshot()
+        resolved: Dict[str, Dict[str, Any]] = {}
+        misses = []
+
+        for url in dict.fromkeys(urls):
+            key = (extract_endpoint_from_url(url), extract_id_from_url(url))
+            node = snapshot.nodes.get(key)
+            if node is None:
+                misses.append(url)
+            else:
+                resolved[url] = self._embed(key[1], node)
+
+        for url, data in self.swapi.fetch_many_by_url(misses).items():
+            resolved[url] = self._embed(extract_id_from_url(url), data)
+
+        return resolved
+
+    @staticmethod
+    def _embed(resource_id: Optional[int], data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": resource_id, **data}
+
+    @staticmethod
+    def _as_url_list(value: Any) -> List[str]:
+        if not value:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    def _resolve(self, snapshot: _GraphSnapshot, target: NodeKey) -> Dict[str, Any]:
+        node = snapshot.nodes.get(target)
+        if node is None:
+            return self.swapi.fetch_by_id(*target)
+        return node
+
+    def _related_from_upstream(self, endpoint: str, resource_id: int, relation: str) -> List[Dict[str, Any]]:
+        data = self.swapi.fetch_by_id(endpoint, resource_id)
+        urls = data.get(relation) or []
+        if isinstance(urls, str):
+            urls = [urls]
+        return [self.swapi.fetch_by_url(url) for url in urls]
+
+    def _get_snapshot(self) -> _GraphSnapshot:
+        collections = self.swapi.fetch_collections(list(self.RELATIONS))
+
+        # reconstrói quando qualquer coleção do fetch_all for recarregada
+        snapshot = self._snapshot
+        if snapshot is None or any(
+            snapshot.collections[endpoint] is not items for endpoint, items in collections.items()
+        ):
+            snapshot = _GraphSnapshot(collections, self.RELATIONS)
+            self._snapshot = snapshot
+            logger.info(f"Grafo de relacionamentos construído com {len(snapshot.nodes)} nós")
+
+        return snapshot
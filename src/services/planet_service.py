@@ -1,15 +1,26 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Iterator, Union
 
 from config import Config
 from .swapi.swapi_manager import SwapiManager
 from .swapi.utils import extract_id_from_url
+from .search.search_index import SearchIndex
+from .graph.relationship_graph import RelationshipGraph
 from ..schemas.planet import Planet
+from ..utils.fragments import JSONFragment, encode_fragment, get_models
+from ..utils.timing import timed
 
 logger = logging.getLogger(__name__)
 class PlanetService:
-    def __init__(self, swapi_service: Optional[SwapiManager] = None):
+    def __init__(
+        self,
+        swapi_service: Optional[SwapiManager] = None,
+        search_index: Optional[SearchIndex] = None,
+        relationship_graph: Optional[RelationshipGraph] = None,
+    ):
         self.swapi = swapi_service or SwapiManager()
+        self.search_index = search_index or SearchIndex(self.swapi)
+        self.graph = relationship_graph or RelationshipGraph(self.swapi)
 
     def get_planets(
         self,
@@ -21,14 +32,25 @@ class PlanetService:
         order: str = "asc",
         page: int = 1,
         limit: int = Config.DEFAULT_LIMIT,
+        expand: Optional[List[str]] = None,
+        ids: Optional[List[int]] = None,
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        if search:
-            raw = self.swapi.fetch("planets", {"search": search})
-            items = raw.get("results", [])
+        missing_ids: List[int] = []
+        if ids:
+            # busca por lista de ids: mantém a ordem pedida e reporta os ids inexistentes
+            requested = list(dict.fromkeys(ids))
+            found = self.swapi.fetch_many_by_id("planets", requested)
+            items = [found[i] for i in requested if i in found]
+            missing_ids = [i for i in requested if i not in found]
+            # os ids já delimitam a resposta: tudo numa página só, sem page/limit
+            page, limit = 1, len(requested)
+        elif search:
+            items = self.search_index.search("planets", search)
         else:
             items = self.swapi.fetch_all("planets")
 
-        planets = [Planet(**item) for item in items]
+        planets = get_models("planets", Planet, items)
         planets = self._filter(planets, name=name, climate=climate, terrain=terrain)
         planets = self._sort(planets, sort_by=sort_by, order=order)
 
@@ -37,8 +59,8 @@ class PlanetService:
         start = (page - 1) * limit
         page_data = planets[start : start + limit]
 
-        return {
-            "data": [p.model_dump() for p in page_data],
+        result = {
+            "data": self._render(page_data, expand, fields),
             "pagination": {
                 "page": page,
                 "limit": limit,
@@ -49,20 +71,32 @@ class PlanetService:
             },
         }
 
-    def get_planet_by_id(self, planet_id: int) -> Dict[str, Any]:
+        if ids:
+            result["missing_ids"] = missing_ids
+
+        return result
+
+    def get_planet_by_id(
+        self,
+        planet_id: int,
+        expand: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Union[JSONFragment, Dict[str, Any]]:
         data = self.swapi.fetch_by_id("planets", planet_id)
-        return Planet(**data).model_dump()
+        model = get_models("planets", Planet, [data])[0]
+        # a entidade sozinha é o corpo inteiro: o JSON já codificado sai como está (utils.fragments)
+        if not expand:
+            return encode_fragment(model, fields)
+        return self._render([model], expand, fields)[0]
 
     def get_planet_residents(self, planet_id: int) -> Dict[str, Any]:
-        planet_data = self.swapi.fetch_by_id("planets", planet_id)
-        planet = Planet(**planet_data)
+        planet = Planet(**self.graph.get("planets", planet_id))
 
         residents = []
-        for resident_url in planet.residents:
-            resident_data = self.swapi.fetch_by_url(resident_url)
+        for resident_data in self.graph.related("planets", planet_id, "residents"):
             residents.append(
                 {
-                    "id": extract_id_from_url(resident_url),
+                    "id": extract_id_from_url(resident_data.get("url")),
                     "name": resident_data.get("name"),
                     "gender": resident_data.get("gender"),
                     "birth_year": resident_data.get("birth_year"),
@@ -76,15 +110,13 @@ class PlanetService:
         }
 
     def get_planet_films(self, planet_id: int) -> Dict[str, Any]:
-        planet_data = self.swapi.fetch_by_id("planets", planet_id)
-        planet = Planet(**planet_data)
+        planet = Planet(**self.graph.get("planets", planet_id))
 
         films = []
-        for film_url in planet.films:
-            film_data = self.swapi.fetch_by_url(film_url)
+        for film_data in self.graph.related("planets", planet_id, "films"):
             films.append(
                 {
-                    "id": extract_id_from_url(film_url),
+                    "id": extract_id_from_url(film_data.get("url")),
                     "title": film_data.get("title"),
                     "episode_id": film_data.get("episode_id"),
                     "release_date": film_data.get("release_date"),
@@ -97,7 +129,70 @@ class PlanetService:
             "total_films": len(films),
         }
 
+    def get_planet_resident_films(self, planet_id: int) -> Dict[str, Any]:
+        # relação que a SWAPI não expõe: filmes em que aparece algum habitante do planeta (planeta -> residents -> films)
+        planet = Planet(**self.graph.get("planets", planet_id))
+
+        films = [
+            {
+                "id": extract_id_from_url(film_data.get("url")),
+                "title": film_data.get("title"),
+                "episode_id": film_data.get("episode_id"),
+                "release_date": film_data.get("release_date"),
+            }
+            for film_data in self.graph.traverse("planets", planet_id, "residents", "films")
+        ]
+
+        return {
+            "planet": {"id": planet_id, "name": planet.name},
+            "films": films,
+            "total_films": len(films),
+        }
+
+    def export_planets(
+        self,
+        search: Optional[str] = None,
+        name: Optional[str] = None,
+        climate: Optional[str] = None,
+        terrain: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        order: str = "asc",
+    ) -> Iterator[JSONFragment]:
+        # a coleção é carregada aqui (erros da SWAPI saem antes do streaming começar)
+        if search:
+            items = self.search_index.search("planets", search)
+        else:
+            items = self.swapi.fetch_all("planets")
+
+        return self._export(items, sort_by=sort_by, order=order, name=name, climate=climate, terrain=terrain)
+
+    @timed("render")
+    def _render(
+        self,
+        planets: List[Planet],
+        expand: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Union[Planet, Dict[str, Any]]]:
+        # sem expand nem fields os models seguem direto para a serialização (utils.response), sem model_dump
+        if not expand and not fields:
+            return planets
+
+        include = set(fields) if fields else None
+        dumped = [p.model_dump(include=include) for p in planets]
+        return self.graph.expand("planets", dumped, expand) if expand else dumped
+
+    def _export(self, items, sort_by, order, **filters) -> Iterator[JSONFragment]:
+        if sort_by:
+            # ordenar exige a coleção inteira; sem ordenação os modelos são gerados um a um
+            planets = self._sort(self._filter(get_models("planets", Planet, items), **filters), sort_by=sort_by, order=order)
+        else:
+            planets = (planet for item in items for planet in self._filter(get_models("planets", Planet, [item]), **filters))
+
+        for planet in planets:
+            yield encode_fragment(planet)
+
     @staticmethod
+    @timed("filter")
     def _filter(
         planets: List[Planet],
         name: Optional[str] = None,
@@ -122,6 +217,7 @@ class PlanetService:
         return result
 
     @staticmethod
+    @timed("sort")
     def _sort(
         planets: List[Planet],
         sort_by: Optional[str] = None,
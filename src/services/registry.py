@@ -0,0 +1,71 @@
+import threading
+from typing import Any, Callable, Dict
+
+# singletons da app, construídos no primeiro uso (cold start mais curto para /health e /auth/*)
+_instances: Dict[str, Any] = {}
+# reentrante: a factory de um service chama get_swapi_manager() etc. com o lock já tomado
+_lock = threading.RLock()
+
+def _lazy(name: str, factory: Callable[[], Any]) -> Any:
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = factory()
+                _instances[name] = instance
+    return instance
+
+def get_swapi_manager():
+    def build():
+        from .swapi.swapi_manager import SwapiManager
+        return SwapiManager()
+    return _lazy("swapi_manager", build)
+
+def get_async_swapi_manager():
+    # usado só pelo entrypoint ASGI (asgi.py)
+    def build():
+        from .swapi.async_swapi_manager import AsyncSwapiManager
+        return AsyncSwapiManager()
+    return _lazy("async_swapi_manager", build)
+
+def get_search_index():
+    def build():
+        from .search.search_index import SearchIndex
+        return SearchIndex(get_swapi_manager())
+    return _lazy("search_index", build)
+
+def get_relationship_graph():
+    def build():
+        from .graph.relationship_graph import RelationshipGraph
+        return RelationshipGraph(get_swapi_manager())
+    return _lazy("relationship_graph", build)
+
+def get_character_service():
+    def build():
+        from .character_service import CharacterService
+        return CharacterService(get_swapi_manager(), get_search_index(), get_relationship_graph())
+    return _lazy("character_service", build)
+
+def get_planet_service():
+    def build():
+        from .planet_service import PlanetService
+        return PlanetService(get_swapi_manager(), get_search_index(), get_relationship_graph())
+    return _lazy("planet_service", build)
+
+def get_starship_service():
+    def build():
+        from .starship_service import StarshipService
+        return StarshipService(get_swapi_manager(), get_search_index(), get_relationship_graph())
+    return _lazy("starship_service", build)
+
+def get_film_service():
+    def build():
+        from .film_service import FilmService
+        return FilmService(get_swapi_manager(), get_search_index(), get_relationship_graph())
+    return _lazy("film_service", build)
+
+def built_instances() -> Dict[str, Any]:
+    # só o que já foi construído (diagnóstico não deve forçar a criação)
+    with _lock:
+        return dict(_instances)
@@ -0,0 +1,147 @@
+import bisect
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from ..swapi.swapi_manager import SwapiManager
+from .utils import normalize, tokenize, trigrams
+from ...utils.timing import timed
+
+logger = logging.getLogger(__name__)
+
+# pesos do ranking por tipo de match de cada token da busca
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+SUBSTRING_SCORE = 1.5
+TRIGRAM_SCORE = 1.0
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+# bonus aplicados sobre o nome completo
+EXACT_NAME_BONUS = 2.0
+PREFIX_NAME_BONUS = 1.0
+
+
+class _CollectionIndex:
+    def __init__(self, items: List[Dict[str, Any]], field: str):
+        self.items = items
+        self.names = [normalize(item.get(field) or "") for item in items]
+
+        # token -> posições na coleção
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        for position, name in enumerate(self.names):
+            for token in tokenize(name):
+                self.postings[token].add(position)
+
+        # trigrama -> tokens (para busca aproximada)
+        self.token_grams: Dict[str, Set[str]] = {}
+        self.trigram_tokens: Dict[str, Set[str]] = defaultdict(set)
+        for token in self.postings:
+            grams = trigrams(token)
+            self.token_grams[token] = grams
+            for gram in grams:
+                self.trigram_tokens[gram].add(token)
+
+        self.sorted_tokens = sorted(self.postings)
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        # todos os tokens da busca precisam casar (mesma semântica do ?search= da SWAPI)
+        scores: Optional[Dict[int, float]] = None
+        for query_token in query_tokens:
+            token_scores = self._match_token(query_token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {pos: scores[pos] + s for pos, s in token_scores.items() if pos in scores}
+            if not scores:
+                return []
+
+        normalized_query = " ".join(query_tokens)
+        ranked = []
+        for position, score in scores.items():
+            name = " ".join(tokenize(self.names[position]))
+            if name == normalized_query:
+                score += EXACT_NAME_BONUS
+            elif name.startswith(normalized_query):
+                score += PREFIX_NAME_BONUS
+            ranked.append((-score, self.names[position], position))
+
+        ranked.sort()
+        return [self.items[position] for _, _, position in ranked]
+
+    def _match_token(self, query_token: str) -> Dict[int, float]:
+        token_scores: Dict[str, float] = {}
+
+        if query_token in self.postings:
+            token_scores[query_token] = EXACT_SCORE
+
+        # prefixo: busca binária na lista ordenada de tokens
+        start = bisect.bisect_left(self.sorted_tokens, query_token)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(query_token):
+                break
+            token_scores.setdefault(token, PREFIX_SCORE)
+
+        if len(query_token) < 3:
+            # tokens curtos não geram trigramas internos, então o substring é verificado direto
+            for token in self.sorted_tokens:
+                if token not in token_scores and query_token in token:
+                    token_scores[token] = SUBSTRING_SCORE
+        else:
+            query_grams = trigrams(query_token)
+            shared: Dict[str, int] = defaultdict(int)
+            for gram in query_grams:
+                for token in self.trigram_tokens.get(gram, ()):
+                    shared[token] += 1
+
+            for token, count in shared.items():
+                if token in token_scores:
+                    continue
+                if query_token in token:
+                    token_scores[token] = SUBSTRING_SCORE
+                    continue
+                similarity = count / (len(query_grams) + len(self.token_grams[token]) - count)
+                if similarity >= MIN_TRIGRAM_SIMILARITY:
+                    token_scores[token] = TRIGRAM_SCORE * similarity
+
+        position_scores: Dict[int, float] = {}
+        for token, score in token_scores.items():
+            for position in self.postings[token]:
+                if score > position_scores.get(position, 0.0):
+                    position_scores[position] = score
+
+        return position_scores
+
+
+class SearchIndex:
+    # campo indexado de cada recurso
+    SEARCH_FIELDS = {
+        "people": "name",
+        "planets": "name",
+        "starships": "name",
+        "films": "title",
+    }
+
+    def __init__(self, swapi_service: Optional[SwapiManager] = None):
+        self.swapi = swapi_service or SwapiManager()
+        self._indexes: Dict[str, _CollectionIndex] = {}
+
+    @timed("search")
+    def search(self, endpoint: str, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        results = self._get_index(endpoint).search(query)
+        return results[:limit] if limit else results
+
+    def _get_index(self, endpoint: str) -> _CollectionIndex:
+        items = self.swapi.fetch_all(endpoint)
+        index = self._indexes.get(endpoint)
+
+        # quando o cache do fetch_all expira uma nova lista é carregada e o índice é reconstruído
+        if index is None or index.items is not items:
+            index = _CollectionIndex(items, self.SEARCH_FIELDS[endpoint])
+            self._indexes[endpoint] = index
+            logger.info(f"Índice de busca de '{endpoint}' construído com {len(items)} itens")
+
+        return index
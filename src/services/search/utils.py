@@ -0,0 +1,23 @@
+import re
+import unicodedata
+from typing import List, Set
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    # case-fold + remoção de acentos ("Padmé" -> "padme")
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(normalize(text))
+
+
+def trigrams(token: str) -> Set[str]:
+    # padding para que o inicio/fim da palavra tambem gerem trigramas
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
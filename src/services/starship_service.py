@@ -1,15 +1,26 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Iterator, Union
 from config import Config
 from .swapi.swapi_manager import SwapiManager
 from .swapi.utils import extract_id_from_url
+from .search.search_index import SearchIndex
+from .graph.relationship_graph import RelationshipGraph
 from ..schemas.starship import Starship
+from ..utils.fragments import JSONFragment, encode_fragment, get_models
+from ..utils.timing import timed
 
 logger = logging.getLogger(__name__)
 
 class StarshipService:
-    def __init__(self, swapi_service: Optional[SwapiManager] = None):
+    def __init__(
+        self,
+        swapi_service: Optional[SwapiManager] = None,
+        search_index: Optional[SearchIndex] = None,
+        relationship_graph: Optional[RelationshipGraph] = None,
+    ):
         self.swapi = swapi_service or SwapiManager()
+        self.search_index = search_index or SearchIndex(self.swapi)
+        self.graph = relationship_graph or RelationshipGraph(self.swapi)
 
     def get_starships(
         self,
@@ -22,14 +33,25 @@ class StarshipService:
         order: str = "asc",
         page: int = 1,
         limit: int = Config.DEFAULT_LIMIT,
+        expand: Optional[List[str]] = None,
+        ids: Optional[List[int]] = None,
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        if search:
-            raw = self.swapi.fetch("starships", {"search": search})
-            items = raw.get("results", [])
+        missing_ids: List[int] = []
+        if ids:
+            # busca por lista de ids: mantém a ordem pedida e reporta os ids inexistentes
+            requested = list(dict.fromkeys(ids))
+            found = self.swapi.fetch_many_by_id("starships", requested)
+            items = [found[i] for i in requested if i in found]
+            missing_ids = [i for i in requested if i not in found]
+            # os ids já delimitam a resposta: tudo numa página só, sem page/limit
+            page, limit = 1, len(requested)
+        elif search:
+            items = self.search_index.search("starships", search)
         else:
             items = self.swapi.fetch_all("starships")
 
-        starships = [Starship(**item) for item in items]
+        starships = get_models("starships", Starship, items)
         starships = self._filter(
             starships,
             name=name,
@@ -44,8 +66,8 @@ class StarshipService:
         start = (page - 1) * limit
         page_data = starships[start : start + limit]
 
-        return {
-            "data": [s.model_dump() for s in page_data],
+        result = {
+            "data": self._render(page_data, expand, fields),
             "pagination": {
                 "page": page,
                 "limit": limit,
@@ -56,20 +78,32 @@ class StarshipService:
             },
         }
 
-    def get_starship_by_id(self, starship_id: int) -> Dict[str, Any]:
+        if ids:
+            result["missing_ids"] = missing_ids
+
+        return result
+
+    def get_starship_by_id(
+        self,
+        starship_id: int,
+        expand: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Union[JSONFragment, Dict[str, Any]]:
         data = self.swapi.fetch_by_id("starships", starship_id)
-        return Starship(**data).model_dump()
+        model = get_models("starships", Starship, [data])[0]
+        # a entidade sozinha é o corpo inteiro: o JSON já codificado sai como está (utils.fragments)
+        if not expand:
+            return encode_fragment(model, fields)
+        return self._render([model], expand, fields)[0]
 
     def get_starship_pilots(self, starship_id: int) -> Dict[str, Any]:
-        starship_data = self.swapi.fetch_by_id("starships", starship_id)
-        starship = Starship(**starship_data)
+        starship = Starship(**self.graph.get("starships", starship_id))
 
         pilots = []
-        for pilot_url in starship.pilots:
-            pilot_data = self.swapi.fetch_by_url(pilot_url)
+        for pilot_data in self.graph.related("starships", starship_id, "pilots"):
             pilots.append(
                 {
-                    "id": extract_id_from_url(pilot_url),
+                    "id": extract_id_from_url(pilot_data.get("url")),
                     "name": pilot_data.get("name"),
                     "gender": pilot_data.get("gender"),
                     "birth_year": pilot_data.get("birth_year"),
@@ -88,15 +122,13 @@ class StarshipService:
         }
 
     def get_starship_films(self, starship_id: int) -> Dict[str, Any]:
-        starship_data = self.swapi.fetch_by_id("starships", starship_id)
-        starship = Starship(**starship_data)
+        starship = Starship(**self.graph.get("starships", starship_id))
 
         films = []
-        for film_url in starship.films:
-            film_data = self.swapi.fetch_by_url(film_url)
+        for film_data in self.graph.related("starships", starship_id, "films"):
             films.append(
                 {
-                    "id": extract_id_from_url(film_url),
+                    "id": extract_id_from_url(film_data.get("url")),
                     "title": film_data.get("title"),
                     "episode_id": film_data.get("episode_id"),
                     "release_date": film_data.get("release_date"),
@@ -109,7 +141,51 @@ class StarshipService:
             "total_films": len(films),
         }
 
+    def export_starships(
+        self,
+        search: Optional[str] = None,
+        name: Optional[str] = None,
+        model: Optional[str] = None,
+        manufacturer: Optional[str] = None,
+        starship_class: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        order: str = "asc",
+    ) -> Iterator[JSONFragment]:
+        # a coleção é carregada aqui (erros da SWAPI saem antes do streaming começar)
+        if search:
+            items = self.search_index.search("starships", search)
+        else:
+            items = self.swapi.fetch_all("starships")
+
+        return self._export(items, sort_by=sort_by, order=order, name=name, model=model, manufacturer=manufacturer, starship_class=starship_class)
+
+    @timed("render")
+    def _render(
+        self,
+        starships: List[Starship],
+        expand: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Union[Starship, Dict[str, Any]]]:
+        # sem expand nem fields os models seguem direto para a serialização (utils.response), sem model_dump
+        if not expand and not fields:
+            return starships
+
+        include = set(fields) if fields else None
+        dumped = [s.model_dump(include=include) for s in starships]
+        return self.graph.expand("starships", dumped, expand) if expand else dumped
+
+    def _export(self, items, sort_by, order, **filters) -> Iterator[JSONFragment]:
+        if sort_by:
+            # ordenar exige a coleção inteira; sem ordenação os modelos são gerados um a um
+            starships = self._sort(self._filter(get_models("starships", Starship, items), **filters), sort_by=sort_by, order=order)
+        else:
+            starships = (starship for item in items for starship in self._filter(get_models("starships", Starship, [item]), **filters))
+
+        for starship in starships:
+            yield encode_fragment(starship)
+
     @staticmethod
+    @timed("filter")
     def _filter(
         starships: List[Starship],
         name: Optional[str] = None,
@@ -138,6 +214,7 @@ class StarshipService:
         return result
 
     @staticmethod
+    @timed("sort")
     def _sort(
         starships: List[Starship],
         sort_by: Optional[str] = None,
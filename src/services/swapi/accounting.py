@@ -0,0 +1,94 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from .exceptions import SWAPIBudgetExceededError
+
+class UpstreamStats:
+    # contadores de uma requisição: chamadas HTTP à SWAPI, retries, bytes e cache por tipo de chave
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget
+        self.calls = 0
+        self.retries = 0
+        self.bytes = 0
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._parent: Optional["UpstreamStats"] = None
+        self._lock = threading.Lock()
+
+    def child(self, budget: Optional[int] = None) -> "UpstreamStats":
+        # orçamento próprio (sub-requisição do /batch); as contagens também somam no pai, sem o orçamento dele
+        stats = UpstreamStats(budget)
+        stats._parent = self
+        return stats
+
+    def start_call(self) -> None:
+        # chamado antes de cada GET; passa do orçamento -> a requisição inteira falha
+        with self._lock:
+            if self.budget and self.calls >= self.budget:
+                raise SWAPIBudgetExceededError(self.budget)
+            self.calls += 1
+        if self._parent is not None:
+            self._parent._count_call()
+
+    def _count_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+        if self._parent is not None:
+            self._parent._count_call()
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+        if self._parent is not None:
+            self._parent.record_retry()
+
+    def record_bytes(self, size: int) -> None:
+        with self._lock:
+            self.bytes += size
+        if self._parent is not None:
+            self._parent.record_bytes(size)
+
+    def record_cache(self, kind: str, hit: bool) -> None:
+        with self._lock:
+            counters = self.hits if hit else self.misses
+            counters[kind] = counters.get(kind, 0) + 1
+        if self._parent is not None:
+            self._parent.record_cache(kind, hit)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "bytes": self.bytes,
+                "cache_hits": dict(self.hits),
+                "cache_misses": dict(self.misses),
+            }
+
+    def header(self) -> str:
+        # X-Upstream: calls=3; retries=0; bytes=18234; hits=entity:2,collection:1; misses=entity:3
+        with self._lock:
+            parts = [f"calls={self.calls}", f"retries={self.retries}", f"bytes={self.bytes}"]
+            for label, counters in (("hits", self.hits), ("misses", self.misses)):
+                if counters:
+                    parts.append(f"{label}=" + ",".join(f"{kind}:{count}" for kind, count in counters.items()))
+        return "; ".join(parts)
+
+_stats: ContextVar[Optional[UpstreamStats]] = ContextVar("upstream_stats", default=None)
+
+def get_upstream_stats() -> Optional[UpstreamStats]:
+    return _stats.get()
+
+@contextmanager
+def upstream_stats_scope(stats: Optional[UpstreamStats]) -> Iterator[Optional[UpstreamStats]]:
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+
+def record_cache(kind: str, hit: bool) -> None:
+    stats = _stats.get()
+    if stats is not None:
+        stats.record_cache(kind, hit)
@@ -0,0 +1,208 @@
+from config import Config
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+import asyncio
+import logging
+from ...utils.cache import get_from_cache, set_in_cache, get_request_cache, bump_collection_version
+from .exceptions import SWAPIError, SWAPIConnectionError, SWAPINotFoundError
+from .utils import extract_id_from_url
+from .accounting import get_upstream_stats, record_cache
+from .swapi_manager import SwapiManager
+from ...utils.logging_setup import log_sampled
+
+logger = logging.getLogger(__name__)
+
+class AsyncSwapiManager:
+    # mesma semântica do SwapiManager (chaves de cache, contabilidade, erros), com I/O no event loop:
+    # o fan-out vira asyncio.gather e nenhuma thread fica presa esperando a SWAPI
+    def __init__(self):
+        self.base_url = Config.SWAPI_BASE_URL
+        self.timeout = Config.SWAPI_TIMEOUT
+        self.max_retries = Config.SWAPI_MAX_RETRIES
+        self._client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # chave -> task em andamento: requisições concorrentes pelo mesmo dado fazem uma única chamada
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            # httpx só é necessário no entrypoint ASGI
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=Config.SWAPI_MAX_CONCURRENCY * 4),
+            )
+            self._semaphore = asyncio.Semaphore(Config.SWAPI_MAX_CONCURRENCY * 4)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        cache_key = SwapiManager._build_cache_key(endpoint, params)
+
+        cached = get_from_cache(cache_key)
+        record_cache("entity" if "/" in endpoint else "page", cached is not None)
+        if cached is not None:
+            log_sampled(logger, "cache_hit", "Cache HIT: %s", endpoint, endpoint=endpoint)
+            return cached
+
+        data = await self._coalesced(cache_key, lambda: self._get(f"{self.base_url}/{endpoint}/", params))
+        set_in_cache(cache_key, data)
+        return data
+
+    async def fetch_by_id(self, endpoint: str, resource_id: int) -> Dict[str, Any]:
+        return await self.fetch(f"{endpoint}/{resource_id}")
+
+    async def fetch_all(self, endpoint: str) -> List[Dict[str, Any]]:
+        cache_key = f"all_{endpoint}"
+        cached = get_from_cache(cache_key)
+        record_cache("collection", cached is not None)
+        if cached is not None:
+            log_sampled(logger, "cache_hit", "Todos os dados de '%s' retornados do cache", endpoint, endpoint=cache_key)
+            return cached
+
+        return await self._coalesced(cache_key, lambda: self._load_collection(endpoint))
+
+    async def _load_collection(self, endpoint: str) -> List[Dict[str, Any]]:
+        first = await self._get(f"{self.base_url}/{endpoint}/")
+        all_results: List[Dict[str, Any]] = list(first.get("results", []))
+
+        page_size = len(all_results)
+        count = first.get("count")
+        if first.get("next") and isinstance(count, int) and page_size:
+            # o count da primeira página diz quantas faltam: as demais são buscadas em paralelo
+            last_page = -(-count // page_size)
+            pages = await asyncio.gather(*(
+                self._get(f"{self.base_url}/{endpoint}/", {"page": page}) for page in range(2, last_page + 1)
+            ))
+            for data in pages:
+                all_results.extend(data.get("results", []))
+        else:
+            next_url = first.get("next")
+            while next_url:
+                data = await self._get(next_url)
+                all_results.extend(data.get("results", []))
+                next_url = data.get("next")
+
+        set_in_cache(f"all_{endpoint}", all_results)
+        bump_collection_version(endpoint)
+        logger.info(f"Total de {len(all_results)} itens coletados de '{endpoint}'")
+        return all_results
+
+    async def fetch_by_url(self, url: str) -> Dict[str, Any]:
+        cache_key = f"url_{url}"
+        cached = get_from_cache(cache_key)
+        record_cache("url", cached is not None)
+        if cached is not None:
+            return cached
+
+        data = await self._coalesced(cache_key, lambda: self._get(url))
+        set_in_cache(cache_key, data)
+        return data
+
+    async def fetch_many_by_url(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        return await self._gather(self.fetch_by_url, unique_urls)
+
+    async def fetch_many_by_id(self, endpoint: str, resource_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        found: Dict[int, Dict[str, Any]] = {}
+
+        collection = get_from_cache(f"all_{endpoint}")
+        by_id = {}
+        if collection is not None:
+            by_id = {extract_id_from_url(item.get("url")): item for item in collection}
+
+        misses = []
+        for resource_id in dict.fromkeys(resource_ids):
+            data = by_id.get(resource_id)
+            if data is None:
+                data = get_from_cache(SwapiManager._build_cache_key(f"{endpoint}/{resource_id}"))
+            if data is None:
+                misses.append(resource_id)
+            else:
+                record_cache("entity", True)
+                found[resource_id] = data
+
+        async def fetch_or_none(resource_id: int) -> Optional[Dict[str, Any]]:
+            try:
+                return await self.fetch_by_id(endpoint, resource_id)
+            except SWAPINotFoundError:
+                return None
+
+        for resource_id, data in (await self._gather(fetch_or_none, misses)).items():
+            if data is not None:
+                found[resource_id] = data
+
+        return found
+
+    @staticmethod
+    async def _gather(fn: Callable[[Any], Awaitable[Any]], keys: List[Any]) -> Dict[Any, Any]:
+        results = await asyncio.gather(*(fn(key) for key in keys))
+        return dict(zip(keys, results))
+
+    async def _coalesced(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        try:
+            # shield: quem desistir (cancelamento) não cancela a chamada dos outros
+            return await asyncio.shield(task)
+        except SWAPIError as e:
+            # cada requisição que esperava por esta chamada guarda a falha no seu cache de requisição:
+            # o pipeline síncrono responde com o mesmo erro em vez de repetir a chamada (com retry e backoff)
+            request_cache = get_request_cache()
+            request_key = getattr(e, "request_key", None)
+            if request_cache is not None and request_key is not None:
+                request_cache.set_exception(request_key, e)
+            raise
+
+    async def _get(self, url: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        try:
+            return await self._http_get_with_retry(url, params)
+        except SWAPIError as e:
+            # mesma chave que o SwapiManager._get usa no cache de requisição
+            e.request_key = SwapiManager._build_cache_key(url, params)
+            raise
+
+    async def _http_get_with_retry(self, url: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        import httpx
+
+        client = self._get_client()
+        stats = get_upstream_stats()
+        if stats is not None:
+            stats.start_call()
+
+        for attempt in range(1, self.max_retries + 1):
+            if attempt > 1 and stats is not None:
+                stats.record_retry()
+            try:
+                logger.log(
+                    logging.INFO if attempt > 1 else logging.DEBUG,
+                    "[Tentativa %d/%d] GET %s", attempt, self.max_retries, url,
+                    extra={"event": "upstream_request", "url": url, "attempt": attempt},
+                )
+                async with self._semaphore:
+                    response = await client.get(url, params=params)
+                if response.status_code == 404:
+                    raise SWAPINotFoundError(url, "desconhecido")
+
+                response.raise_for_status()
+                if stats is not None:
+                    stats.record_bytes(len(response.content))
+                return response.json()
+            except httpx.TransportError as e:
+                logger.warning(f"{type(e).__name__} na tentativa {attempt}")
+                if attempt == self.max_retries:
+                    break
+                # backoff exponencial, sem bloquear o event loop
+                await asyncio.sleep(2 ** (attempt - 1))
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Erro HTTP: {e}")
+                raise SWAPIError(f"Erro na SWAPI: {str(e)}", e.response.status_code)
+
+        raise SWAPIConnectionError()
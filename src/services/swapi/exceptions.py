@@ -1,13 +1,4 @@
-import sys
-import os
-import time
-import logging
-import requests
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from typing import List, Any, Dict, Optional
-from config import Config
-from ...utils.cache import get_from_cache, set_in_cache
+from typing import Any
 
 
 class SWAPIError(Exception):
@@ -28,3 +19,10 @@ class SWAPIConnectionError(SWAPIError):
             "Não foi possível conectar ao SWAPI. tente novamente mais tarde", 503
         )
 
+
+# Requisição precisaria de mais chamadas à SWAPI do que o orçamento permite
+class SWAPIBudgetExceededError(SWAPIError):
+    def __init__(self, budget: int):
+        super().__init__(
+            f"A requisição excede o limite de {budget} chamadas à SWAPI. Reduza o limit, o expand ou o número de ids", 400
+        )
@@ -1,12 +1,18 @@
 from config import Config
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 import time
 import logging
 import requests
-from ...utils.cache import get_from_cache, set_in_cache
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from ...utils.cache import get_from_cache, set_in_cache, get_request_cache, bump_collection_version
 from .exceptions import SWAPIError, SWAPIConnectionError, SWAPINotFoundError
+from .utils import extract_id_from_url
+from .accounting import get_upstream_stats, record_cache
+from ...utils.logging_setup import log_sampled
+from ...utils.timing import timed
+from ...utils.profiling import track_thread
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SwapiManager:
@@ -20,16 +26,18 @@ class SwapiManager:
         cache_key = self._build_cache_key(endpoint, params)
 
         cached = get_from_cache(cache_key)
+        # "entity" para people/1, "page" para listagens e buscas
+        record_cache("entity" if "/" in endpoint else "page", cached is not None)
         if cached is not None:
-            logger.info(f"Cache HIT: {endpoint}")
+            log_sampled(logger, "cache_hit", "Cache HIT: %s", endpoint, endpoint=endpoint)
             return cached
 
         # cache -> miss entao faz a chamada http
         url = f"{self.base_url}/{endpoint}/"
-        data = self._http_get_with_retry(url, params)
+        data = self._get(url, params)
 
         set_in_cache(cache_key, data)
-        logger.info(f"Dados salvos no cache: {endpoint}")
+        logger.debug("Dados salvos no cache: %s", endpoint)
 
         return data
 
@@ -39,8 +47,9 @@ class SwapiManager:
     def fetch_all(self, endpoint: str) -> List[Dict[str, Any]]:
         cache_key = f"all_{endpoint}"
         cached = get_from_cache(cache_key)
+        record_cache("collection", cached is not None)
         if cached is not None:
-            logger.info(f"Todos os dados de '{endpoint}' retornados do cache")
+            log_sampled(logger, "cache_hit", "Todos os dados de '%s' retornados do cache", endpoint, endpoint=f"all_{endpoint}")
             return cached
 
         all_results: List[Dict[str, Any]] = []
@@ -48,36 +57,126 @@ class SwapiManager:
         next_url: Optional[str] = f"{self.base_url}/{endpoint}/"
 
         while next_url:
-            data = self._http_get_with_retry(next_url)
-            all_results.extend(data.get("results"), [])
+            data = self._get(next_url)
+            all_results.extend(data.get("results", []))
 
             next_url = data.get("next")
-            logger.debug(f"Página coletada. Total até agora: {len(all_results)}")
+            logger.debug("Página coletada. Total até agora: %d", len(all_results))
         #salvamento no cache
         set_in_cache(cache_key, all_results)
+        bump_collection_version(endpoint)
         logger.info(f"Total de {len(all_results)} itens coletados de '{endpoint}'")
         return all_results
 
+    def fetch_collections(self, endpoints: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        # várias coleções inteiras: as que faltam no cache são carregadas em paralelo
+        collections = {endpoint: get_from_cache(f"all_{endpoint}") for endpoint in endpoints}
+        missing = [endpoint for endpoint, items in collections.items() if items is None]
+        for endpoint in endpoints:
+            if endpoint not in missing:
+                record_cache("collection", True)
+        collections.update(self._run_concurrently(self.fetch_all, missing))
+        return collections
+
     def fetch_by_url(self, url: str) -> Dict[str, Any]:
         cache_key = f"url_{url}"
         cached = get_from_cache(cache_key)
+        record_cache("url", cached is not None)
         if cached is not None:
             return cached
 
-        data = self._http_get_with_retry(url)
+        data = self._get(url)
         set_in_cache(cache_key, data)
         return data
 
+    def fetch_many_by_url(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        # resolve vários urls (sem repetição) em paralelo, reaproveitando o cache do fetch_by_url
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        return self._run_concurrently(self.fetch_by_url, unique_urls)
+
+    def fetch_many_by_id(self, endpoint: str, resource_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        # ids não encontrados na SWAPI ficam de fora do resultado
+        found: Dict[int, Dict[str, Any]] = {}
+
+        collection = get_from_cache(f"all_{endpoint}")
+        by_id = {}
+        if collection is not None:
+            by_id = {extract_id_from_url(item.get("url")): item for item in collection}
+
+        misses = []
+        for resource_id in dict.fromkeys(resource_ids):
+            data = by_id.get(resource_id)
+            if data is None:
+                data = get_from_cache(self._build_cache_key(f"{endpoint}/{resource_id}"))
+            if data is None:
+                # o miss é contabilizado pelo fetch_by_id logo abaixo
+                misses.append(resource_id)
+            else:
+                record_cache("entity", True)
+                found[resource_id] = data
+
+        def fetch_or_none(resource_id: int) -> Optional[Dict[str, Any]]:
+            try:
+                return self.fetch_by_id(endpoint, resource_id)
+            except SWAPINotFoundError:
+                return None
+
+        for resource_id, data in self._run_concurrently(fetch_or_none, misses).items():
+            if data is not None:
+                found[resource_id] = data
+
+        return found
+
+    @staticmethod
+    def _run_concurrently(fn: Callable[[Any], Any], keys: List[Any]) -> Dict[Any, Any]:
+        if not keys:
+            return {}
+
+        if len(keys) == 1:
+            return {keys[0]: fn(keys[0])}
+
+        workers = min(len(keys), Config.SWAPI_MAX_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="swapi") as executor:
+            # copy_context propaga o cache de requisição (/batch) para as threads
+            task = track_thread(fn)
+            futures = [executor.submit(copy_context().run, task, key) for key in keys]
+            return {key: future.result() for key, future in zip(keys, futures)}
+
+    def _get(self, url: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        # dentro de um /batch, sub-requisições paralelas compartilham a mesma chamada à SWAPI
+        request_cache = get_request_cache()
+        if request_cache is None:
+            return self._http_get_with_retry(url, params)
+
+        return request_cache.get_or_compute(
+            self._build_cache_key(url, params),
+            lambda: self._http_get_with_retry(url, params),
+        )
+
+    @timed("upstream")
     def _http_get_with_retry(self, url: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         # faz o GET com retry automático e backoff exponencial
+        stats = get_upstream_stats()
+        if stats is not None:
+            stats.start_call()
+
         for attempt in range(1, self.max_retries + 1):
+            if attempt > 1 and stats is not None:
+                stats.record_retry()
             try:
-                logger.info(f"[Tentativa {attempt}/{self.max_retries}] GET {url}")
+                # a primeira tentativa é o caminho normal; só as repetições vão para INFO
+                logger.log(
+                    logging.INFO if attempt > 1 else logging.DEBUG,
+                    "[Tentativa %d/%d] GET %s", attempt, self.max_retries, url,
+                    extra={"event": "upstream_request", "url": url, "attempt": attempt},
+                )
                 response = requests.get(url, params=params, timeout=self.timeout)
                 if response.status_code == 404:
                     raise SWAPINotFoundError(url, "desconhecido")
 
                 response.raise_for_status()
+                if stats is not None:
+                    stats.record_bytes(len(response.content))
                 return response.json()
             except requests.exceptions.Timeout:
                 logger.warning(f"Timeout na tentativa: {attempt}")
@@ -100,7 +199,7 @@ class SwapiManager:
                 logger.error(f"Erro HTTP: {e}")
                 raise SWAPIError(f"Erro na SWAPI: {str(e)}", getattr(e.response, "status_code", 500))
 
-            raise SWAPIConnectionError()
+        raise SWAPIConnectionError()
 
 
     @staticmethod
@@ -7,4 +7,11 @@ def extract_id_from_url(url: str) -> Optional[int]:
     try:
         return int(url.rstrip("/").split("/")[-1])
     except (ValueError, IndexError):
-        return None
\ No newline at end of file
+        return None
+
+def extract_endpoint_from_url(url: str) -> Optional[str]:
+    if not url:
+        return None
+
+    parts = url.rstrip("/").split("/")
+    return parts[-2] if len(parts) >= 2 else None
\ No newline at end of file
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+from config import Config
+from .timing import span
+
+class ServiceOverloadedError(Exception):
+    def __init__(self, message: str = "Serviço sobrecarregado, tente novamente em instantes", retry_after: int = 1):
+        self.message = message
+        self.status_code = 503
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+class AdmissionController:
+    # limita quantas requisições rodam ao mesmo tempo (no total e por classe de custo).
+    # "cheap" pode usar os slots reservados, então /health e afins passam mesmo com a SWAPI lenta
+    # segurando todas as requisições caras; quem não cabe espera numa fila limitada ou recebe 503.
+    def __init__(
+        self,
+        max_concurrent: int,
+        class_limits: Dict[str, int],
+        reserved_cheap: int,
+        queue_size: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        self.max_concurrent = max_concurrent
+        self.class_limits = class_limits
+        self.reserved_cheap = reserved_cheap
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._cond = threading.Condition()
+        self._active = 0
+        self._active_by_class: Dict[str, int] = {}
+        self._waiting = 0
+
+    def _has_room(self, cost: str) -> bool:
+        limit = self.max_concurrent if cost == "cheap" else self.max_concurrent - self.reserved_cheap
+        if self._active >= limit:
+            return False
+        class_limit = self.class_limits.get(cost)
+        return class_limit is None or self._active_by_class.get(cost, 0) < class_limit
+
+    @contextmanager
+    def admit(self, cost: str = "standard", timeout: Optional[float] = None) -> Iterator[None]:
+        with self._cond:
+            if not self._has_room(cost):
+                if self._waiting >= self.queue_size:
+                    raise ServiceOverloadedError(retry_after=self.retry_after)
+
+                self._waiting += 1
+                try:
+                    with span("queue"):
+                        admitted = self._cond.wait_for(
+                            lambda: self._has_room(cost),
+                            self.queue_timeout if timeout is None else timeout,
+                        )
+                finally:
+                    self._waiting -= 1
+                if not admitted:
+                    raise ServiceOverloadedError(retry_after=self.retry_after)
+
+            self._enter(cost)
+
+        try:
+            yield
+        finally:
+            self._leave(cost)
+
+    @asynccontextmanager
+    async def admit_async(self, cost: str = "standard", poll: float = 0.005) -> AsyncIterator[None]:
+        # para o event loop (src.asgi): mesma fila e mesmos limites, mas quem espera faz asyncio.sleep e não prende thread
+        with self._cond:
+            admitted = self._has_room(cost)
+            if admitted:
+                self._enter(cost)
+            elif self._waiting >= self.queue_size:
+                raise ServiceOverloadedError(retry_after=self.retry_after)
+            else:
+                self._waiting += 1
+
+        if not admitted:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.queue_timeout
+            try:
+                while not admitted:
+                    if loop.time() >= deadline:
+                        raise ServiceOverloadedError(retry_after=self.retry_after)
+                    await asyncio.sleep(poll)
+                    with self._cond:
+                        admitted = self._has_room(cost)
+                        if admitted:
+                            self._enter(cost)
+            finally:
+                with self._cond:
+                    self._waiting -= 1
+
+        try:
+            yield
+        finally:
+            self._leave(cost)
+
+    def _enter(self, cost: str) -> None:
+        # com self._cond tomado
+        self._active += 1
+        self._active_by_class[cost] = self._active_by_class.get(cost, 0) + 1
+
+    def _leave(self, cost: str) -> None:
+        with self._cond:
+            self._active -= 1
+            self._active_by_class[cost] -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "by_class": dict(self._active_by_class),
+            }
+
+admission = AdmissionController(
+    max_concurrent=Config.ADMISSION_MAX_CONCURRENT,
+    class_limits={
+        "standard": Config.ADMISSION_STANDARD_LIMIT,
+        "expensive": Config.ADMISSION_EXPENSIVE_LIMIT,
+    },
+    reserved_cheap=Config.ADMISSION_RESERVED_CHEAP,
+    queue_size=Config.ADMISSION_QUEUE_SIZE,
+    queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=Config.ADMISSION_RETRY_AFTER,
+)
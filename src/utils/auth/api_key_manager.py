@@ -1,21 +1,125 @@
 from config import Config
+import hashlib
+import json
 import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+class TokenBucket:
+    # rate tokens/s até no máximo `capacity`; cada requisição consome 1
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, tokens: float = 1.0) -> float:
+        # 0 quando liberado; senão, segundos até haver tokens suficientes
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+class APIKey:
+    def __init__(self, name: str, key_hash: str, rate: float, burst: float, unlimited: bool = False):
+        self.name = name
+        self.key_hash = key_hash
+        # None: chave sem limite de requisições
+        self.bucket = None if unlimited else TokenBucket(rate, burst)
+
+class APIKeyStore:
+    # chaves guardadas só como sha256; busca O(1) pelo hash da chave recebida
+    def __init__(self, keys: Iterable[APIKey] = ()):
+        self._by_hash: Dict[str, APIKey] = {}
+        for key in keys:
+            self._by_hash[key.key_hash] = key
+
+    def __len__(self) -> int:
+        return len(self._by_hash)
+
+    def add(self, name: str, api_key: Optional[str] = None, key_hash: Optional[str] = None,
+            rate: Optional[float] = None, burst: Optional[float] = None, unlimited: bool = False) -> APIKey:
+        if not api_key and not key_hash:
+            raise ValueError(f"A API key '{name}' precisa de 'key' ou 'key_hash'")
+
+        rate = Config.API_KEY_RATE if rate is None else rate
+        burst = Config.API_KEY_BURST if burst is None else burst
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Limite inválido para a API key '{name}': rate={rate}, burst={burst}")
+
+        key = APIKey(name, key_hash or hash_api_key(api_key), rate, burst, unlimited)
+        self._by_hash[key.key_hash] = key
+        return key
+
+    def lookup(self, api_key: str) -> Optional[APIKey]:
+        # o dict é indexado pelo sha256: o tempo da busca não depende de quanto da chave confere
+        return self._by_hash.get(hash_api_key(api_key))
+
+    @classmethod
+    def from_config(cls) -> "APIKeyStore":
+        store = cls()
+        if Config.API_KEY:
+            store.add("default", Config.API_KEY, unlimited=not Config.API_KEY_LEGACY_LIMITED)
+
+        for name, api_key in _parse_key_list(Config.API_KEYS):
+            store.add(name, api_key)
+
+        if Config.API_KEYS_FILE:
+            with open(Config.API_KEYS_FILE) as f:
+                entries = json.load(f)
+            for position, entry in enumerate(entries, 1):
+                if not isinstance(entry, dict) or not entry.get("name"):
+                    raise ValueError(f"{Config.API_KEYS_FILE}: entrada {position} sem 'name'")
+                store.add(
+                    entry["name"],
+                    entry.get("key"),
+                    entry.get("key_hash"),
+                    entry.get("rate"),
+                    entry.get("burst"),
+                )
+
+        logger.info(f"{len(store)} API keys carregadas")
+        return store
+
+def _parse_key_list(raw: Optional[str]) -> List[Tuple[str, str]]:
+    # "nome:chave,outro:chave2"; sem nome, a chave vira "key-<n>"
+    keys = []
+    for position, item in enumerate(filter(None, (part.strip() for part in (raw or "").split(","))), 1):
+        name, sep, api_key = item.partition(":")
+        keys.append((name, api_key) if sep else (f"key-{position}", item))
+    return keys
+
+_store: Optional[APIKeyStore] = None
+_store_lock = threading.Lock()
+
+def get_api_key_store() -> APIKeyStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = APIKeyStore.from_config()
+    return _store
+
 class APIKeyManager:
     @staticmethod
     def validate_api_key(api_key: str) -> bool:
-        valid_keys = [
-            Config.API_KEY
-        ]
-
-        is_valid = api_key in valid_keys
+        is_valid = get_api_key_store().lookup(api_key) is not None
 
         if is_valid:
-            logger.info("API KEY validada com sucesso")
+            logger.debug("API KEY validada com sucesso")
         else:
-            logger.warning(f"Tentativa de uso de API Key inválida: {api_key[:10]}...")
+            logger.warning(f"Tentativa de uso de API Key inválida: {hash_api_key(api_key)[:10]}...")
 
-        return is_valid
\ No newline at end of file
+        return is_valid
@@ -1,4 +1,3 @@
-import jwt
 import logging
 from flask import jsonify, request
 from functools import wraps
@@ -6,7 +5,6 @@ from api_key_manager import APIKeyManager
 from jwt_manager import TokenManager
 from exceptions import AuthenticationError
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def require_api_key(f):
@@ -22,7 +20,7 @@ def require_api_key(f):
             }), 401
 
         if not APIKeyManager.validate_api_key(api_key):
-            logger.warning(f"API Key inválida recebida")
+            logger.warning("API Key inválida recebida")
             return jsonify({
                 "error": "API Key Inválida",
                 "message": "A chave fornecida não é válida"
@@ -3,9 +3,10 @@ from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from config import Config
 import jwt
-from exceptions import AuthenticationError
+from .exceptions import AuthenticationError
+from .token_cache import get_verified, remember_verified, is_revoked, revoke
+from ..logging_setup import log_sampled
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TokenManager:
@@ -37,16 +38,17 @@ class TokenManager:
 
     @staticmethod
     def validate_token(token: str) -> Dict[str, Any]:
+        # o mesmo token chega em toda requisição; a assinatura só é verificada uma vez
+        cached = get_verified(token)
+        if cached is not None:
+            return cached
+
         try:
             payload = jwt.decode(
                 token,
                 Config.JWT_SECRET,
                 algorithms=["HS256"]
             )
-
-            logger.info(f"Token validado com sucesso para usuário: {payload.get('sub')}")
-
-            return payload
         except jwt.ExpiredSignatureError:
             # token expirado
             logger.warning("Tentativa de uso de token expirado")
@@ -61,6 +63,21 @@ class TokenManager:
             logger.error(f"Erro ao gerar token: {str(e)}")
             raise AuthenticationError("Erro ao validar o token", 500)
 
+        if is_revoked(token, payload):
+            logger.warning(f"Tentativa de uso de token revogado: {payload.get('sub')}")
+            raise AuthenticationError("Token revogado", 401)
+
+        remember_verified(token, payload)
+        log_sampled(logger, "token_validated", "Token validado com sucesso para usuário: %s", payload.get("sub"))
+
+        return payload
+
+    @staticmethod
+    def revoke_token(token: str) -> None:
+        payload = TokenManager.validate_token(token)
+        revoke(token, payload)
+        logger.info(f"Token revogado para usuário: {payload.get('sub')}")
+
     def refresh_token(old_token: str) -> str:
         try:
             payload = TokenManager.validate_token(old_token)
@@ -0,0 +1,57 @@
+import hashlib
+import threading
+import time
+from cachetools import LRUCache
+from typing import Any, Dict, Optional
+from config import Config
+
+# tokens já verificados (assinatura + exp), indexados pelo digest do token
+_verified = LRUCache(maxsize=Config.JWT_CACHE_SIZE)
+# jti (ou digest, se o token não tiver jti) -> exp; mantidos só até o token expirar.
+# fica na memória do processo: com várias instâncias, cada uma tem a sua lista
+_revoked: Dict[str, float] = {}
+_lock = threading.Lock()
+
+def token_digest(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+def _revocation_key(digest: str, claims: Dict[str, Any]) -> str:
+    return claims.get("jti") or digest
+
+def get_verified(token: str) -> Optional[Dict[str, Any]]:
+    digest = token_digest(token)
+    with _lock:
+        entry = _verified.get(digest)
+        if entry is None:
+            return None
+
+        claims, exp = entry
+        if exp <= time.time() or _revocation_key(digest, claims) in _revoked:
+            _verified.pop(digest, None)
+            return None
+    return dict(claims)
+
+def remember_verified(token: str, claims: Dict[str, Any]) -> None:
+    # sem exp não há como saber até quando a verificação vale
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)):
+        return
+    with _lock:
+        _verified[token_digest(token)] = (dict(claims), float(exp))
+
+def is_revoked(token: str, claims: Dict[str, Any]) -> bool:
+    return _revocation_key(token_digest(token), claims) in _revoked
+
+def revoke(token: str, claims: Dict[str, Any]) -> None:
+    digest = token_digest(token)
+    now = time.time()
+    with _lock:
+        for key in [key for key, exp in _revoked.items() if exp <= now]:
+            del _revoked[key]
+        _revoked[_revocation_key(digest, claims)] = float(claims.get("exp") or now + Config.JWT_EXPIRATION)
+        _verified.pop(digest, None)
+
+def clear_token_cache() -> None:
+    with _lock:
+        _verified.clear()
+        _revoked.clear()
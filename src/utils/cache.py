@@ -1,17 +1,40 @@
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
 from cachetools import TTLCache
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Iterator, Optional
 from config import Config
 
 _cache = TTLCache(maxsize=100, ttl=Config.CACHE_TTL)
+# TTLCache não é thread-safe: leitura também reordena e expira entradas
+_lock = threading.Lock()
 
 def get_from_cache(key: str) -> Optional[Any]:
-    return _cache.get(key)
+    with _lock:
+        return _cache.get(key)
 
 def set_in_cache(key: str, value: Any) -> None:
-    _cache[key] = value
+    with _lock:
+        _cache[key] = value
 
 def clear_cache() -> None:
-    _cache.clear()
+    with _lock:
+        _cache.clear()
+
+# incrementado a cada carga de uma coleção completa (fetch_all) vinda da SWAPI
+_collection_versions: Dict[str, int] = {}
+
+def bump_collection_version(endpoint: str) -> int:
+    _collection_versions[endpoint] = _collection_versions.get(endpoint, 0) + 1
+    return _collection_versions[endpoint]
+
+def get_collection_version(endpoint: str) -> Optional[int]:
+    # None quando a coleção não está (mais) no cache
+    with _lock:
+        if f"all_{endpoint}" not in _cache:
+            return None
+    return _collection_versions.get(endpoint)
 
 def cache_key(*args , **kwargs) -> str:
     key_parts = [str(arg) for arg in args]
@@ -20,4 +43,47 @@ def cache_key(*args , **kwargs) -> str:
         if v is not None:
             key_parts.append(f"{k}={v}")
 
-    return "_".join(key_parts)
\ No newline at end of file
+    return "_".join(key_parts)
+
+class RequestCache:
+    # cache com escopo de requisição: chamadas concorrentes com a mesma chave executam uma única vez
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Future] = {}
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                future.set_exception(e)
+
+        return future.result()
+
+    def set_exception(self, key: str, error: BaseException) -> None:
+        # falha já conhecida (prefetch do ASGI): quem pedir a mesma chave recebe o erro sem nova chamada
+        future = Future()
+        future.set_exception(error)
+        with self._lock:
+            self._entries.setdefault(key, future)
+
+
+_request_cache: ContextVar[Optional[RequestCache]] = ContextVar("request_cache", default=None)
+
+def get_request_cache() -> Optional[RequestCache]:
+    return _request_cache.get()
+
+@contextmanager
+def request_cache_scope(cache: Optional[RequestCache] = None) -> Iterator[RequestCache]:
+    token = _request_cache.set(cache or RequestCache())
+    try:
+        yield _request_cache.get()
+    finally:
+        _request_cache.reset(token)
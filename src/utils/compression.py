@@ -0,0 +1,56 @@
+import gzip
+from typing import Dict, Optional
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # está no requirements.txt; numa instalação sem ele, só gzip é negociado
+    brotli = None
+
+# níveis para corpos comprimidos a cada requisição vs. corpos comprimidos uma vez e guardados no cache
+_LEVELS = {
+    "br": {"dynamic": 5, "cached": 11},
+    "gzip": {"dynamic": 6, "cached": 9},
+}
+
+
+def supported_encodings() -> Dict[str, bool]:
+    return {"br": brotli is not None, "gzip": True}
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    # escolhe br ou gzip conforme os q-values do Accept-Encoding; br tem preferência no empate
+    if not accept_encoding:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        pieces = part.strip().split(";")
+        coding = pieces[0].strip().lower()
+        quality = 1.0
+        for param in pieces[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding, available in supported_encodings().items():
+        quality = qualities.get(coding, wildcard)
+        if available and quality > best_quality:
+            best, best_quality = coding, quality
+
+    return best
+
+def should_compress(body: bytes) -> bool:
+    return len(body) >= Config.COMPRESSION_MIN_SIZE
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    level = _LEVELS[encoding]["cached" if cached else "dynamic"]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
@@ -0,0 +1,175 @@
+import gc
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+import types
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from config import Config
+
+# estado interno dos caches lido direto dos módulos: o relatório só observa, não altera nada
+from .cache import _cache, _lock as _cache_lock
+from .fragments import _entities, _lock as _entities_lock
+from .response_cache import _responses, _lock as _responses_lock
+from .auth.token_cache import _verified, _lock as _verified_lock
+from ..services.registry import built_instances
+
+# não pertencem ao dado medido: seguir por eles somaria o interpretador inteiro
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType, threading.Thread, logging.Logger)
+
+_baseline: Optional[tracemalloc.Snapshot] = None
+_lock = threading.Lock()
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    # soma sys.getsizeof de tudo que é alcançável; objetos em `seen` já foram contados
+    seen = set() if seen is None else seen
+    total = 0
+    pending = deque([obj])
+    while pending:
+        current = pending.pop()
+        if id(current) in seen or isinstance(current, _OPAQUE):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            pending.extend(current)
+        elif isinstance(current, (str, bytes, int, float, bool)) or current is None:
+            continue
+        else:
+            if hasattr(current, "__dict__"):
+                pending.append(current.__dict__)
+            for cls in type(current).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot != "__dict__" and hasattr(current, slot):
+                        pending.append(getattr(current, slot))
+    return total
+
+def _cache_namespace(key: str) -> str:
+    # mesmos tipos de chave da contabilidade de chamadas (services.swapi.accounting)
+    if key.startswith("all_"):
+        return "collection"
+    if key.startswith("url_"):
+        return "url"
+    if key.startswith("swapi:"):
+        return "entity" if "/" in key.split(":", 2)[1] else "page"
+    return "other"
+
+def _entries(cache, lock: threading.Lock) -> List[Tuple[Any, Any]]:
+    # cópia sob o lock do módulo, lida do dict interno do cachetools: items() passa por __getitem__,
+    # que no LRU/TTL conta como acesso e muda quem sai primeiro
+    with lock:
+        return list(cache._Cache__data.items())
+
+def _group_sizes(entries: Iterable, seen: Set[int]) -> Dict[str, Dict[str, int]]:
+    groups: Dict[str, Dict[str, int]] = {}
+    for namespace, key, value in entries:
+        group = groups.setdefault(namespace, {"entries": 0, "bytes": 0})
+        group["entries"] += 1
+        group["bytes"] += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    return groups
+
+def _collections(swapi_entries: List[Tuple[Any, Any]]) -> Dict[str, Dict[str, int]]:
+    return {
+        key[len("all_"):]: {"items": len(value)}
+        for key, value in swapi_entries
+        if key.startswith("all_")
+    }
+
+def _indexes(instances: Dict[str, Any], seen: Set[int]) -> Dict[str, Any]:
+    report: Dict[str, Any] = {}
+    search_index = instances.get("search_index")
+    if search_index is not None:
+        report["search"] = {
+            endpoint: {"items": len(index.items), "tokens": len(index.sorted_tokens), "bytes": deep_sizeof(index, seen)}
+            for endpoint, index in list(search_index._indexes.items())
+        }
+    graph = instances.get("relationship_graph")
+    snapshot = graph._snapshot if graph is not None else None
+    if snapshot is not None:
+        report["graph"] = {"nodes": len(snapshot.nodes), "bytes": deep_sizeof(snapshot, seen)}
+    return report
+
+def _process_memory() -> Dict[str, Any]:
+    info: Dict[str, Any] = {"gc_counts": gc.get_count()}
+    try:
+        with open("/proc/self/statm") as f:
+            info["rss_bytes"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # ru_maxrss em KB no Linux
+        info["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        pass
+    return info
+
+def _tracemalloc_report(action: Optional[str], top: int) -> Dict[str, Any]:
+    global _baseline
+    with _lock:
+        if action == "stop":
+            tracemalloc.stop()
+            _baseline = None
+            return {"tracing": False}
+
+        if action == "start" and not tracemalloc.is_tracing():
+            tracemalloc.start(Config.TRACEMALLOC_FRAMES)
+            _baseline = tracemalloc.take_snapshot()
+            return {"tracing": True, "message": "tracemalloc iniciado; a próxima chamada compara com este snapshot"}
+
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        previous, _baseline = _baseline, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        report: Dict[str, Any] = {"tracing": True, "traced_bytes": current, "peak_bytes": peak}
+        if previous is None:
+            return report
+
+        report["top_growth"] = [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+            }
+            for stat in snapshot.compare_to(previous, "lineno")[:top]
+        ]
+        return report
+
+def memory_report(top: int = 10, tracemalloc_action: Optional[str] = None) -> Dict[str, Any]:
+    # os bytes são exclusivos na ordem do relatório: o que já apareceu num item não é contado de novo
+    # (ex.: os índices de busca apontam para os mesmos dicts do cache da SWAPI)
+    seen: Set[int] = set()
+
+    swapi_entries = _entries(_cache, _cache_lock)
+    caches = {
+        "swapi": _group_sizes(((_cache_namespace(key), key, value) for key, value in swapi_entries), seen),
+        "entities": _group_sizes((("models", key, value) for key, value in _entries(_entities, _entities_lock)), seen),
+        "responses": _group_sizes((("responses", key, value) for key, value in _entries(_responses, _responses_lock)), seen),
+        "tokens": _group_sizes((("verified", key, value) for key, value in _entries(_verified, _verified_lock)), seen),
+    }
+
+    instances = built_instances()
+    indexes = _indexes(instances, seen)
+
+    return {
+        "process": _process_memory(),
+        "caches": caches,
+        "collections": _collections(swapi_entries),
+        "indexes": indexes,
+        # o restante de cada singleton (sessão HTTP, locks etc.), fora o que já foi contado acima
+        "instances": {name: deep_sizeof(instance, seen) for name, instance in instances.items()},
+        "tracemalloc": _tracemalloc_report(tracemalloc_action, top),
+    }
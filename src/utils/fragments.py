@@ -0,0 +1,65 @@
+import threading
+from cachetools import LRUCache
+from pydantic_core import to_json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Type, TypeVar
+from config import Config
+from .timing import timed
+
+if TYPE_CHECKING:
+    from ..schemas.base import SwapiModel
+
+ModelT = TypeVar("ModelT", bound="SwapiModel")
+
+
+class JSONFragment(bytes):
+    # JSON pronto de uma entidade, inserido como está na resposta (utils.response)
+    pass
+
+
+class FragmentList(list):
+    # lista que pode conter JSONFragment; o encoder percorre seus itens em vez de delegar ao to_json
+    pass
+
+
+# (endpoint, url, edited) -> model; a mesma versão da entidade reaproveita o model e seus fragmentos
+_entities = LRUCache(maxsize=Config.ENTITY_CACHE_SIZE)
+_lock = threading.Lock()
+
+@timed("models")
+def get_models(endpoint: str, model_cls: Type[ModelT], items: Iterable[Dict[str, Any]]) -> List[ModelT]:
+    models = []
+    for item in items:
+        key = _version_key(endpoint, item)
+        if key is None:
+            models.append(model_cls(**item))
+            continue
+
+        with _lock:
+            model = _entities.get(key)
+        if model is None:
+            model = model_cls(**item)
+            with _lock:
+                _entities[key] = model
+        models.append(model)
+
+    return models
+
+def encode_fragment(model: "SwapiModel", fields: Optional[Iterable[str]] = None) -> JSONFragment:
+    projection = frozenset(fields) if fields else None
+
+    fragment = model._json_fragments.get(projection)
+    if fragment is None:
+        fragment = JSONFragment(to_json(model, include=set(projection) if projection else None, fallback=str))
+        model._json_fragments[projection] = fragment
+
+    return fragment
+
+def clear_entities() -> None:
+    with _lock:
+        _entities.clear()
+
+def _version_key(endpoint: str, item: Dict[str, Any]) -> Optional[tuple]:
+    url = item.get("url")
+    if not url:
+        return None
+    return endpoint, url, item.get("edited")
@@ -0,0 +1,43 @@
+from typing import Dict, Optional
+from config import Config
+
+from .response_cache import CachedResponse
+
+NO_STORE = {"Cache-Control": "no-store"}
+
+# os dados não variam por usuário, mas caches compartilhados precisam separar por credencial
+# para não entregar a clientes sem autenticação o que foi obtido com ela
+DATA_VARY = "Accept-Encoding, Authorization, X-API-Key"
+
+
+def ttl_for_path(path: str) -> int:
+    # política de TTL por classe de rota: segue o TTL dos dados da SWAPI
+    if path in ("", "/", "/health"):
+        return 0
+    if path == "/search":
+        return min(Config.CACHE_TTL, Config.SEARCH_HTTP_MAX_AGE)
+    return Config.CACHE_TTL
+
+def build_cache_headers(path: str, entry: CachedResponse, encoding: Optional[str] = None) -> Dict[str, str]:
+    ttl = ttl_for_path(path)
+    if ttl <= 0:
+        return dict(NO_STORE)
+
+    # o cliente não deve guardar a resposta além do que resta do TTL no servidor
+    max_age = max(0, int(ttl - entry.age))
+    return {
+        "Cache-Control": f"public, max-age={max_age}",
+        "ETag": entry.etag_for(encoding),
+        "Vary": DATA_VARY,
+    }
+
+def etag_matches(if_none_match: Optional[str], entry: CachedResponse) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    # If-None-Match usa comparação fraca: W/"x" casa com "x", e qualquer variante comprimida do mesmo corpo vale
+    etags = {entry.etag, entry.etag_for("gzip"), entry.etag_for("br")}
+    return any(candidate.removeprefix("W/") in etags for candidate in candidates)
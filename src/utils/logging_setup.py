@@ -0,0 +1,107 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from config import Config
+
+# atributos padrão do LogRecord; o que sobrar veio de extra= e vai como campo do JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+logger = logging.getLogger(__name__)
+
+_configured = False
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+class JSONFormatter(logging.Formatter):
+    # uma linha JSON por registro; "severity" e "message" são os campos que o Cloud Logging reconhece
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class _DeferredQueueHandler(QueueHandler):
+    # o QueueHandler padrão formata a mensagem (e o traceback) na thread da requisição;
+    # aqui a formatação fica toda com o listener
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+def parse_sample_rates(raw: Optional[str]) -> Dict[str, float]:
+    # "cache_hit=0.01,token_validated=0.1"
+    # entrada malformada não derruba o import: o evento fica com taxa 1.0 (sem amostragem)
+    rates = {}
+    for item in filter(None, (part.strip() for part in (raw or "").split(","))):
+        event, _, rate = item.partition("=")
+        try:
+            rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            logger.warning("LOG_SAMPLE_RATES: taxa inválida em '%s'; usando 1.0", item)
+            rates[event.strip()] = 1.0
+    return rates
+
+_sample_rates = parse_sample_rates(Config.LOG_SAMPLE_RATES)
+
+def should_log(event: str) -> bool:
+    rate = _sample_rates.get(event, 1.0)
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+def log_sampled(logger: logging.Logger, event: str, message: str, *args: Any, level: int = logging.INFO, **fields: Any) -> None:
+    # eventos de alta frequência (cache hit, token validado): sorteio antes de montar o registro
+    if not logger.isEnabledFor(level) or not should_log(event):
+        return
+    logger.log(level, message, *args, extra={"event": event, "sample_rate": _sample_rates.get(event, 1.0), **fields})
+
+def configure_logging(stream=None, background: Optional[bool] = None) -> None:
+    # idempotente; substitui os handlers do root por um QueueHandler com escrita em background
+    # ou, com LOG_ASYNC desligado, pelo StreamHandler direto (escreve antes da resposta sair)
+    global _configured, _listener
+    with _lock:
+        if _configured:
+            return
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        if Config.LOG_FORMAT == "json":
+            output.setFormatter(JSONFormatter())
+        else:
+            output.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.setLevel(Config.LOG_LEVEL)
+        _configured = True
+
+        if not (Config.LOG_ASYNC if background is None else background):
+            root.addHandler(output)
+            return
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        root.addHandler(_DeferredQueueHandler(log_queue))
+
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    # esvazia a fila antes de sair
+    global _configured, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        _configured = False
@@ -0,0 +1,198 @@
+import hashlib
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Set
+from config import Config
+
+# perfil sob demanda: PROFILE_MODE=always|sampled liga por variável de ambiente; com PROFILE_SECRET,
+# o header X-Profile-Signature (assinado) força o perfil de uma requisição específica
+
+SIGNATURE_HEADER = "X-Profile-Signature"
+SIGNATURE_MAX_AGE = 300
+
+# folhas de pilha de thread parada esperando (lock, fila, future): não são trabalho da requisição
+IDLE_FRAMES = frozenset({("threading.py", "wait"), ("queue.py", "get"), ("threading.py", "_wait_for_tstate_lock")})
+
+def sign_profile_request(path: str, timestamp: Optional[int] = None, secret: Optional[str] = None) -> str:
+    # "<timestamp>:<hmac-sha256(secret, 'timestamp:path')>"
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new((secret or Config.PROFILE_SECRET).encode(), f"{timestamp}:{path}".encode(), hashlib.sha256)
+    return f"{timestamp}:{digest.hexdigest()}"
+
+def _valid_signature(value: Optional[str], path: str) -> bool:
+    if not value or not Config.PROFILE_SECRET:
+        return False
+    timestamp, _, _ = value.partition(":")
+    if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > SIGNATURE_MAX_AGE:
+        return False
+    return hmac.compare_digest(value, sign_profile_request(path, int(timestamp)))
+
+class SamplingProfiler:
+    # amostra a cada `interval` segundos a pilha da thread da requisição e das threads de fan-out (busca, batch,
+    # SWAPI) enquanto rodam trabalho dela (track_thread); outras requisições e threads ociosas ficam de fora
+    engine = "sampling"
+    extension = "collapsed"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self.elapsed = 0.0
+        self._stacks: Counter = Counter()
+        self._threads: Set[int] = set()
+        self._threads_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._request_thread = threading.get_ident()
+        self._token = _active.set(self)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        _active.reset(self._token)
+        self.elapsed = time.perf_counter() - self._started
+
+    def add_thread(self, thread_id: int) -> None:
+        with self._threads_lock:
+            self._threads.add(thread_id)
+
+    def remove_thread(self, thread_id: int) -> None:
+        with self._threads_lock:
+            self._threads.discard(thread_id)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._threads_lock:
+                threads = {self._request_thread, *self._threads}
+            frames = sys._current_frames()
+            for thread_id in threads:
+                frame = frames.get(thread_id)
+                if frame is None or (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def dump(self, path: str) -> None:
+        # formato "collapsed" (flamegraph.pl / speedscope): "a;b;c <amostras>"
+        with open(path, "w") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self._stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        # o intervalo real entre amostras é maior que o pedido; o tempo sai da duração medida
+        ms_per_sample = self.elapsed * 1000 / self.samples if self.samples else 0.0
+        return [
+            {
+                "function": function,
+                "samples": count,
+                "self_ms": round(count * ms_per_sample, 1),
+                "total_ms": round(total[function] * ms_per_sample, 1),
+            }
+            for function, count in own.most_common(limit)
+        ]
+
+_active: ContextVar[Optional[SamplingProfiler]] = ContextVar("active_profiler", default=None)
+
+def track_thread(fn: Callable[..., Any]) -> Callable[..., Any]:
+    # para funções submetidas a um executor com copy_context(): a thread entra na amostragem do profiler
+    # da requisição enquanto roda a função
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = _active.get()
+        if profiler is None:
+            return fn(*args, **kwargs)
+        thread_id = threading.get_ident()
+        profiler.add_thread(thread_id)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.remove_thread(thread_id)
+    return wrapper
+
+class CProfileProfiler:
+    # determinístico e só da thread da requisição; mais preciso para funções curtas
+    engine = "cprofile"
+    extension = "pstats"
+
+    def __init__(self):
+        import cProfile
+
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def dump(self, path: str) -> None:
+        self._profile.dump_stats(path)
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        import pstats
+
+        stats = pstats.Stats(self._profile)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [
+            {
+                "function": f"{os.path.basename(filename)}:{name}",
+                "calls": calls,
+                "self_ms": round(own_time * 1000, 3),
+                "total_ms": round(cumulative * 1000, 3),
+            }
+            for (filename, _, name), (_, calls, own_time, cumulative, _) in rows
+        ]
+
+def profiler_for(request) -> Optional[Any]:
+    # desligado: duas comparações e nenhum objeto criado
+    if Config.PROFILE_MODE == "off" and not Config.PROFILE_SECRET:
+        return None
+
+    wanted = (
+        Config.PROFILE_MODE == "always"
+        or (Config.PROFILE_MODE == "sampled" and random.random() < Config.PROFILE_SAMPLE_RATE)
+        or _valid_signature(request.headers.get(SIGNATURE_HEADER), request.path)
+    )
+    if not wanted:
+        return None
+
+    if Config.PROFILE_ENGINE == "cprofile":
+        return CProfileProfiler()
+    return SamplingProfiler(Config.PROFILE_INTERVAL_MS / 1000)
+
+def finish_profile(profiler, method: str, path: str, duration_ms: float) -> Dict[str, Any]:
+    os.makedirs(Config.PROFILE_OUTPUT_DIR, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    filename = f"{int(time.time() * 1000)}-{method.lower()}-{slug}.{profiler.extension}"
+    profiler.dump(os.path.join(Config.PROFILE_OUTPUT_DIR, filename))
+
+    # só o nome do arquivo: o diretório do servidor não sai na resposta
+    return {
+        "engine": profiler.engine,
+        "output": filename,
+        "duration_ms": round(duration_ms, 3),
+        "top": profiler.top(Config.PROFILE_TOP_N),
+    }
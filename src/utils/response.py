@@ -0,0 +1,59 @@
+from typing import Any, Dict, Optional
+
+from flask import Response
+from pydantic_core import to_json
+
+from .fragments import JSONFragment, FragmentList
+from .compression import compress, should_compress
+
+JSON_MIMETYPE = "application/json"
+
+
+def to_json_bytes(payload: Any) -> bytes:
+    # serializa dicts, listas e models do pydantic direto para bytes (pydantic-core, em Rust),
+    # sem passar por model_dump() + json.dumps. Fragmentos pré-codificados entram como estão.
+    if isinstance(payload, JSONFragment):
+        return payload
+
+    if isinstance(payload, FragmentList):
+        return b"[" + b",".join(to_json_bytes(item) for item in payload) + b"]"
+
+    if isinstance(payload, dict) and _has_fragments(payload):
+        # só o envelope é percorrido em Python; o resto continua no to_json
+        return b"{" + b",".join(
+            to_json(str(key)) + b":" + to_json_bytes(value) for key, value in payload.items()
+        ) + b"}"
+
+    return to_json(payload, fallback=str)
+
+
+def json_response(
+    payload: Any,
+    status: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    encoding: Optional[str] = None,
+) -> Response:
+    return body_response(to_json_bytes(payload), status, headers, encoding)
+
+
+def body_response(
+    body: bytes,
+    status: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    encoding: Optional[str] = None,
+) -> Response:
+    headers = dict(headers or {})
+    if encoding and should_compress(body):
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Vary"] = headers.get("Vary", "Accept-Encoding")
+    return Response(body, status=status, headers=headers, mimetype=JSON_MIMETYPE)
+
+
+def _has_fragments(payload: Dict[str, Any]) -> bool:
+    for value in payload.values():
+        if isinstance(value, (JSONFragment, FragmentList)):
+            return True
+        if isinstance(value, dict) and _has_fragments(value):
+            return True
+    return False
@@ -0,0 +1,76 @@
+import hashlib
+import threading
+import time
+from cachetools import TTLCache
+from typing import Dict, Optional, Tuple
+from config import Config
+
+from .cache import get_collection_version
+from .compression import compress, should_compress
+
+# coleções das quais as respostas derivam (direta ou indiretamente via índices/grafo)
+SOURCE_COLLECTIONS = ("people", "planets", "starships", "films")
+
+class CachedResponse:
+    def __init__(self, body: bytes, status: int, versions: Tuple[Optional[int], ...]):
+        self.body = body
+        self.status = status
+        self.versions = versions
+        self.created_at = time.monotonic()
+        # ETag forte derivado do conteúdo, calculado uma única vez por corpo
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        # variantes comprimidas, geradas na primeira requisição que as pede
+        self._encoded: Dict[str, bytes] = {}
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def accepts_encoding(self, encoding: Optional[str]) -> bool:
+        return encoding is not None and should_compress(self.body)
+
+    def encoded_body(self, encoding: Optional[str]) -> bytes:
+        if not self.accepts_encoding(encoding):
+            return self.body
+
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            encoded = compress(self.body, encoding, cached=True)
+            self._encoded[encoding] = encoded
+        return encoded
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # cada representação (identity/gzip/br) tem seu próprio ETag forte
+        if not self.accepts_encoding(encoding):
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+
+_responses = TTLCache(maxsize=Config.RESPONSE_CACHE_SIZE, ttl=Config.CACHE_TTL)
+_lock = threading.Lock()
+
+def build_response_key(path: str, query: str) -> str:
+    # query: QuerySchema.canonical() dos parâmetros já validados, nunca a query string crua
+    return f"{path}?{query}"
+
+def get_cached_response(key: str) -> Optional[CachedResponse]:
+    with _lock:
+        entry = _responses.get(key)
+
+    # a resposta só vale enquanto nenhuma coleção de origem foi recarregada
+    if entry is None or entry.versions != _current_versions():
+        return None
+    return entry
+
+def set_cached_response(key: str, body: bytes, status: int = 200) -> CachedResponse:
+    entry = CachedResponse(body, status, _current_versions())
+    with _lock:
+        _responses[key] = entry
+    return entry
+
+def clear_response_cache() -> None:
+    with _lock:
+        _responses.clear()
+
+def _current_versions() -> Tuple[Optional[int], ...]:
+    return tuple(get_collection_version(endpoint) for endpoint in SOURCE_COLLECTIONS)
@@ -0,0 +1,30 @@
+from typing import List
+
+
+class RoutingError(Exception):
+    def __init__(self, message: str, status_code: int):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(self.message)
+
+# Nenhuma rota para o caminho
+class RouteNotFoundError(RoutingError):
+    def __init__(self, path: str):
+        super().__init__(f"Endpoint '{path}' não encontrado", 404)
+
+# O caminho existe, mas não para este método
+class MethodNotAllowedError(RoutingError):
+    def __init__(self, method: str, allowed: List[str]):
+        self.allowed = allowed
+        super().__init__(f"Método {method} não permitido. Use: {', '.join(allowed)}", 405)
+
+# Parâmetro de caminho que não converte para o tipo declarado (ex.: <int:resource_id>)
+class RouteParamError(RoutingError):
+    def __init__(self, name: str, value: str, converter: str):
+        self.name = name
+        self.value = value
+        if converter == "int":
+            message = "ID deve ser um número inteiro"
+        else:
+            message = f"Parâmetro '{name}' inválido: '{value}'"
+        super().__init__(message, 400)
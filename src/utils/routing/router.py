@@ -0,0 +1,183 @@
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import MethodNotAllowedError, RouteNotFoundError, RouteParamError
+
+CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "str": str,
+}
+
+_PARAM_PATTERN = re.compile(r"^<(?:(\w+):)?(\w+)>$")
+
+
+def _split(path: str) -> List[str]:
+    stripped = path.strip("/")
+    return stripped.split("/") if stripped else []
+
+
+class Route:
+    def __init__(
+        self,
+        method: str,
+        template: str,
+        handler: Callable[..., Any],
+        public: bool = False,
+        kind: str = "cached",
+        cost: str = "standard",
+        admin: bool = False,
+        schema: Optional[Any] = None,
+    ):
+        # kind: "cached" (GET de dados, passa pelo cache de resposta), "stream" ou "plain"
+        # cost: classe de admissão ("cheap", "standard" ou "expensive"), ver utils.admission
+        # admin: exige JWT com role "admin" (chave de API não basta)
+        # schema: QuerySchema da query string; em rotas "cached", a chave do cache sai dos parâmetros validados
+        self.method = method.upper()
+        self.template = template
+        self.handler = handler
+        self.public = public
+        self.kind = kind
+        self.cost = cost
+        self.admin = admin
+        self.schema = schema
+        self.segments = _split(template)
+        self.is_static = not any(_PARAM_PATTERN.match(segment) for segment in self.segments)
+
+
+class _Node:
+    __slots__ = ("static", "param", "param_name", "converter_name", "routes")
+
+    def __init__(self):
+        self.static: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.param_name: Optional[str] = None
+        self.converter_name: Optional[str] = None
+        self.routes: Dict[str, Route] = {}
+
+
+class Router:
+    def __init__(self, routes: Iterable[Route] = ()):
+        # rotas sem parâmetros: lookup O(1) pelo caminho; as demais numa trie por segmento
+        self._static: Dict[str, Dict[str, Route]] = {}
+        self._root = _Node()
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: Route) -> None:
+        if route.is_static:
+            methods = self._static.setdefault("/" + "/".join(route.segments), {})
+        else:
+            node = self._root
+            for segment in route.segments:
+                param = _PARAM_PATTERN.match(segment)
+                if param is None:
+                    node = node.static.setdefault(segment, _Node())
+                    continue
+
+                converter_name, name = param.group(1) or "str", param.group(2)
+                if converter_name not in CONVERTERS:
+                    raise ValueError(f"Conversor desconhecido em '{route.template}': {converter_name}")
+                if node.param is None:
+                    node.param = _Node()
+                    node.param_name = name
+                    node.converter_name = converter_name
+                elif (node.param_name, node.converter_name) != (name, converter_name):
+                    raise ValueError(f"Parâmetro conflitante em '{route.template}'")
+                node = node.param
+            methods = node.routes
+
+        if route.method in methods:
+            raise ValueError(f"Rota duplicada: {route.method} {route.template}")
+        methods[route.method] = route
+
+    def match(self, method: str, path: str) -> Tuple[Route, Dict[str, Any]]:
+        params: Dict[str, Any] = {}
+
+        # caminho já normalizado (o caso comum) acerta o dict direto, sem split/join
+        methods = self._static.get(path)
+        if methods is None:
+            stripped = path.strip("/")
+            if "/" + stripped != path:
+                methods = self._static.get("/" + stripped)
+            segments = stripped.split("/") if stripped else []
+
+        if methods is None:
+            # descida sem backtracking: quando encontra algo, é a mesma rota que _walk escolheria
+            node = self._root
+            for segment in segments:
+                child = node.static.get(segment)
+                if child is None:
+                    if node.param is None:
+                        break
+                    try:
+                        params[node.param_name] = CONVERTERS[node.converter_name](segment)
+                    except ValueError:
+                        break
+                    child = node.param
+                node = child
+            else:
+                methods = node.routes or None
+
+        if methods is None:
+            # busca completa, com backtracking e erros de conversão
+            params.clear()
+            errors: List[RouteParamError] = []
+            methods = self._walk(self._root, segments, 0, params, errors)
+            if methods is None:
+                if errors:
+                    raise errors[0]
+                raise RouteNotFoundError(path)
+
+        route = methods.get(method)
+        if route is None:
+            method = method.upper()
+            route = methods.get(method)
+            if route is None:
+                raise MethodNotAllowedError(method, sorted(methods))
+        return route, params
+
+    def _walk(
+        self,
+        node: _Node,
+        segments: List[str],
+        index: int,
+        params: Dict[str, Any],
+        errors: List[RouteParamError],
+    ) -> Optional[Dict[str, Route]]:
+        if index == len(segments):
+            return node.routes or None
+
+        segment = segments[index]
+
+        # segmento fixo tem prioridade sobre parâmetro
+        child = node.static.get(segment)
+        if child is not None:
+            found = self._walk(child, segments, index + 1, params, errors)
+            if found is not None:
+                return found
+
+        if node.param is not None:
+            try:
+                value = CONVERTERS[node.converter_name](segment)
+            except ValueError:
+                errors.append(RouteParamError(node.param_name, segment, node.converter_name))
+                return None
+
+            params[node.param_name] = value
+            found = self._walk(node.param, segments, index + 1, params, errors)
+            if found is not None:
+                return found
+            del params[node.param_name]
+
+        return None
+
+    def routes(self) -> List[Route]:
+        collected = [route for methods in self._static.values() for route in methods.values()]
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            collected.extend(node.routes.values())
+            stack.extend(node.static.values())
+            if node.param is not None:
+                stack.append(node.param)
+        return collected
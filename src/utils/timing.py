@@ -0,0 +1,98 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+class RequestTimings:
+    # spans somados por nome; threads do mesmo request (copy_context) escrevem no mesmo objeto
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, List[float]] = {}
+
+    def add(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            span = self._spans.get(name)
+            if span is None:
+                self._spans[name] = [duration_ms, 1]
+            else:
+                span[0] += duration_ms
+                span[1] += 1
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: {"ms": round(total, 3), "count": count} for name, (total, count) in self._spans.items()}
+
+    def header(self) -> str:
+        # Server-Timing: upstream;dur=120.4;desc="3x", render;dur=0.8
+        parts = []
+        with self._lock:
+            for name, (total, count) in self._spans.items():
+                part = f"{name};dur={total:.3f}"
+                if count > 1:
+                    part += f';desc="{count}x"'
+                parts.append(part)
+        return ", ".join(parts)
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def get_timings() -> Optional[RequestTimings]:
+    return _timings.get()
+
+@contextmanager
+def timing_scope(timings: Optional[RequestTimings]) -> Iterator[Optional[RequestTimings]]:
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+_NOOP = _NoopSpan()
+
+class _Span:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc) -> bool:
+        self.timings.add(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+def span(name: str):
+    # desligado (sem timing_scope ativo) custa um ContextVar.get e devolve um objeto compartilhado
+    timings = _timings.get()
+    if timings is None:
+        return _NOOP
+    return _Span(timings, name)
+
+def timed(name: str) -> Callable[[F], F]:
+    def decorator(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            timings = _timings.get()
+            if timings is None:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timings.add(name, (time.perf_counter() - started) * 1000)
+        return wrapper  # type: ignore[return-value]
+    return decorator
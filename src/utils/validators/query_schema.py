@@ -0,0 +1,178 @@
+import re
+import logging
+from urllib.parse import quote
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from ..timing import timed
+
+logger = logging.getLogger(__name__)
+
+# todos os padrões de injection numa única regex (uma passada por busca)
+INJECTION_PATTERN = re.compile(
+    r"<script|javascript:|onerror=|onclick=|;\s*drop\s+table|;\s*delete\s+from|union\s+select",
+    re.IGNORECASE,
+)
+
+POSITIVE_INT = re.compile(r"0*[1-9][0-9]*")
+
+# parser compilado: valor bruto da query string -> (valor tipado, erro)
+Parser = Callable[[str], Tuple[Any, Optional[str]]]
+
+def split_list(value: Optional[str]) -> List[str]:
+    # "a, b,,c" -> ["a", "b", "c"]
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+class Param:
+    def __init__(self, build: Callable[[str], Parser], default: Any = None, unordered: bool = False):
+        # unordered: lista em que a ordem não muda o resultado (expand, fields)
+        self._build = build
+        self.default = default
+        self.unordered = unordered
+
+    def compile(self, name: str) -> Parser:
+        return self._build(name)
+
+def text(max_length: int = 200) -> Param:
+    def build(name: str) -> Parser:
+        message = f"O campo {name} não deve exceder {max_length} caracteres."
+        return lambda raw: (raw, None) if len(raw) <= max_length else (None, message)
+    return Param(build)
+
+def search() -> Param:
+    def parse(raw: str) -> Tuple[Any, Optional[str]]:
+        if not raw:
+            return None, None
+        if len(raw) < 2:
+            return None, "A busca deve ter pelo menos 2 caracteres"
+        if len(raw) > 150:
+            return None, "A busca não deve exceder 150 caracteres"
+        if INJECTION_PATTERN.search(raw):
+            logger.warning(f"Tentativa de injection detectada: {raw}")
+            return None, "Query cotém caracteres ou padrões não permitidos"
+        return raw, None
+    return Param(lambda name: parse)
+
+def integer(
+        default: Optional[int] = None,
+        minimum: Optional[int] = None,
+        maximum: Optional[int] = None,
+        type_message: Optional[str] = None,
+        min_message: Optional[str] = None,
+        max_message: Optional[str] = None,
+) -> Param:
+    def build(name: str) -> Parser:
+        not_int = type_message or f"{name} deve ser um número inteiro"
+        too_small = min_message or f"{name} deve ser maior ou igual a {minimum}"
+        too_big = max_message or f"{name} deve ser menor ou igual a {maximum}"
+
+        def parse(raw: str) -> Tuple[Any, Optional[str]]:
+            try:
+                value = int(raw)
+            except ValueError:
+                return None, not_int
+            if minimum is not None and value < minimum:
+                return None, too_small
+            if maximum is not None and value > maximum:
+                return None, too_big
+            return value, None
+        return parse
+    return Param(build, default)
+
+def choice(
+        options: Iterable[str],
+        default: Optional[str] = None,
+        message: Optional[str] = None,
+        lower: bool = False,
+) -> Param:
+    allowed = frozenset(options)
+    listed = ", ".join(options)
+
+    def build(name: str) -> Parser:
+        def parse(raw: str) -> Tuple[Any, Optional[str]]:
+            if lower:
+                raw = raw.lower()
+            if not raw:
+                return default, None
+            if raw in allowed:
+                return raw, None
+            return None, (message or "Valor '{value}' não é permitido para {name}. Opções: {options}.").format(
+                value=raw, name=name, options=listed
+            )
+        return parse
+    return Param(build, default)
+
+def str_list(options: Optional[Iterable[str]] = None, message: Optional[str] = None) -> Param:
+    allowed = frozenset(options) if options is not None else None
+    listed = ", ".join(options) if options is not None else ""
+
+    def build(name: str) -> Parser:
+        def parse(raw: str) -> Tuple[Any, Optional[str]]:
+            items = split_list(raw)
+            if allowed is not None:
+                invalid = [item for item in items if item not in allowed]
+                if invalid:
+                    return None, (message or "Valor(es) '{invalid}' não permitido(s) para {name}. Opções: {options}.").format(
+                        invalid=", ".join(invalid), name=name, options=listed
+                    )
+            return items, None
+        return parse
+    return Param(build, [], unordered=True)
+
+def int_list(max_items: int = 100) -> Param:
+    def parse(raw: str) -> Tuple[Any, Optional[str]]:
+        items = split_list(raw)
+        # só dígitos ASCII: str.isdigit aceita "²", que int() recusa
+        if not all(POSITIVE_INT.fullmatch(item) for item in items):
+            return None, "Os ids devem ser números inteiros positivos separados por vírgula."
+        if len(items) > max_items:
+            return None, f"Não é permitido buscar mais de {max_items} ids por requisição."
+        return [int(item) for item in items], None
+    return Param(lambda name: parse, [])
+
+class QuerySchema:
+    # declarado uma vez por recurso e compilado no import: parse() percorre a query string uma única vez
+    # e devolve os parâmetros já tipados, com os nomes dos kwargs dos services
+    def __init__(self, params: Dict[str, Param], strict: bool = True):
+        self.names = tuple(params)
+        self.strict = strict
+        self._parsers: Dict[str, Parser] = {name: param.compile(name) for name, param in params.items()}
+        self._defaults: Dict[str, Any] = {name: param.default for name, param in params.items()}
+        self._list_defaults = tuple(name for name, default in self._defaults.items() if isinstance(default, list))
+        self._unordered = frozenset(name for name, param in params.items() if param.unordered)
+
+    @timed("validate")
+    def parse(self, args: Mapping[str, str]) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+        values = dict(self._defaults)
+        for name in self._list_defaults:
+            values[name] = []
+        errors: Dict[str, List[str]] = {}
+
+        for key, raw in args.items():
+            parser = self._parsers.get(key)
+            if parser is None:
+                if self.strict:
+                    errors.setdefault("unknown_fields", []).append(f"O campo {key} não é permitido.")
+                continue
+
+            value, error = parser(raw)
+            if error:
+                errors[key] = [error]
+            elif value is not None:
+                values[key] = value
+
+        return values, errors
+
+    def canonical(self, values: Dict[str, Any]) -> str:
+        # query normalizada a partir do resultado de parse() (chave do cache de resposta): valores padrão e
+        # parâmetros ignorados ficam de fora, "page=01" vira "page=1" e a ordem de expand/fields não importa
+        parts = []
+        for name in self.names:
+            value = values.get(name)
+            if value is None or value == [] or value == self._defaults[name]:
+                continue
+            if isinstance(value, list):
+                items = sorted(set(map(str, value))) if name in self._unordered else map(str, value)
+                value = ",".join(items)
+            parts.append(f"{name}={quote(str(value), safe=',')}")
+        return "&".join(parts)
@@ -0,0 +1,73 @@
+from typing import Dict, List
+from config import Config
+from .query_schema import QuerySchema, Param, text, search, integer, choice, str_list, int_list
+
+ALLOWED_SORTS: Dict[str, List[str]] = {
+    "characters": ["name", "height", "mass", "birth_year", "gender"],
+    "planets": ["name", "diameter", "population", "rotation_period", "orbital_period"],
+    "starships": ["name", "model", "cost_in_credits", "length", "crew", "passengers"],
+    "films": ["title", "episode_id", "release_date", "director"],
+}
+
+ALLOWED_EXPANDS: Dict[str, List[str]] = {
+    "characters": ["homeworld", "films", "starships"],
+    "planets": ["residents", "films"],
+    "starships": ["pilots", "films"],
+    "films": ["characters", "planets", "starships"],
+}
+
+FILTERS: Dict[str, Dict[str, Param]] = {
+    "characters": {"name": text(), "gender": text(), "birth_year": text()},
+    "planets": {"name": text(), "climate": text(), "terrain": text()},
+    "starships": {"name": text(), "model": text(), "manufacturer": text(), "starship_class": text()},
+    "films": {"title": text(), "director": text(), "episode_id": integer(type_message="episode_id deve ser um número inteiro")},
+}
+
+# parâmetros da listagem que não existem no export
+LIST_ONLY = ("page", "limit", "expand", "ids", "fields")
+
+def _expand(resource: str) -> Param:
+    return str_list(ALLOWED_EXPANDS[resource], "Expansão de '{invalid}' não é permitida. Opções: {options}.")
+
+def _list_schema(resource: str) -> QuerySchema:
+    return QuerySchema({
+        "search": search(),
+        **FILTERS[resource],
+        "sort_by": choice(ALLOWED_SORTS[resource], message="Ordenação por '{value}' não é permitida. Opções: {options}."),
+        "order": choice(["asc", "desc"], default="asc", message="A ordem deve ser 'asc' ou 'desc'"),
+        "page": integer(
+            Config.DEFAULT_PAGE, 1, 1000,
+            "O número da página deve ser um numero inteiro.",
+            "A página deve ser maior que zero.",
+            "A página não deve exceder o limite de 1000",
+        ),
+        "limit": integer(
+            Config.DEFAULT_LIMIT, 1, 100,
+            "O valor do limite deve ser um numero inteiro.",
+            "O limite deve ser maior que zero.",
+            "O limite não deve exceder o limite de 100 por página.",
+        ),
+        "expand": _expand(resource),
+        "ids": int_list(),
+        "fields": str_list(),
+    })
+
+def _detail_schema(resource: str) -> QuerySchema:
+    # detalhe aceita outros parâmetros sem erro (como antes); só expand e fields são lidos
+    return QuerySchema({"expand": _expand(resource), "fields": str_list()}, strict=False)
+
+LIST_SCHEMAS: Dict[str, QuerySchema] = {resource: _list_schema(resource) for resource in ALLOWED_SORTS}
+DETAIL_SCHEMAS: Dict[str, QuerySchema] = {resource: _detail_schema(resource) for resource in ALLOWED_SORTS}
+
+# GET /search: parâmetros desconhecidos são ignorados, como antes
+SEARCH_TYPES = ["all", "characters", "planets", "starships", "films"]
+SEARCH_SCHEMA = QuerySchema({
+    "q": text(),
+    "type": choice(SEARCH_TYPES, default="all", message="'type' deve ser um de: {options}", lower=True),
+}, strict=False)
+
+# GET /admin/memory: tracemalloc=start|snapshot|stop controla o rastreio entre duas chamadas
+MEMORY_REPORT_SCHEMA = QuerySchema({
+    "tracemalloc": choice(["start", "snapshot", "stop"], message="tracemalloc deve ser 'start', 'snapshot' ou 'stop'"),
+    "top": integer(10, 1, 100),
+})
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from benchmarks.fake_swapi import FakeSwapi  # noqa: E402  (depois de ajustar o sys.path)
+
+API_KEY = "test-key"
+
+
+@pytest.fixture(scope="session")
+def fake_swapi():
+    with FakeSwapi() as fake:
+        yield fake
+
+
+@pytest.fixture(scope="session")
+def client(fake_swapi):
+    # o Config é lido no import de src.main: o ambiente precisa estar pronto antes
+    os.environ["SWAPI_BASE_URL"] = fake_swapi.base_url
+    os.environ["API_KEY"] = API_KEY
+    os.environ["API_KEY_RATE"] = "1000000"
+    os.environ["API_KEY_BURST"] = "1000000"
+
+    import flask
+    from src.main import starwars_api
+
+    app = flask.Flask("tests")
+    view = lambda path="": starwars_api(flask.request)  # noqa: E731
+    methods = ["GET", "POST", "OPTIONS"]
+    app.add_url_rule("/", "root", view, methods=methods)
+    app.add_url_rule("/<path:path>", "api", view, methods=methods)
+    return app.test_client()
+
+
+@pytest.fixture
+def auth():
+    return {"X-API-Key": API_KEY}
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+
+def controller(**overrides):
+    from src.utils.admission import AdmissionController
+
+    options = dict(max_concurrent=2, class_limits={}, reserved_cheap=1, queue_size=0, queue_timeout=0.05, retry_after=7)
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_full_queue_returns_503_with_retry_after(client, auth, monkeypatch):
+    import src.main
+    from src.utils.response_cache import clear_response_cache
+
+    clear_response_cache()
+    admission = controller()
+    monkeypatch.setattr(src.main, "admission", admission)
+
+    # o único slot comum está ocupado e não há fila: a próxima requisição comum é recusada
+    with admission.admit("standard"):
+        response = client.get("/planets/3", headers=auth)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        assert response.get_json() == {"error": True, "message": "Serviço sobrecarregado, tente novamente em instantes", "code": 503}
+
+        # slot reservado: /health continua respondendo
+        assert client.get("/health").status_code == 200
+
+    assert client.get("/planets/3", headers=auth).status_code == 200
+
+
+def test_cached_response_skips_the_queue(client, auth, monkeypatch):
+    import src.main
+
+    assert client.get("/planets/4", headers=auth).status_code == 200
+    admission = controller()
+    monkeypatch.setattr(src.main, "admission", admission)
+    with admission.admit("standard"):
+        response = client.get("/planets/4", headers=auth)
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "HIT"
+
+
+def test_waiting_request_is_admitted_when_a_slot_frees(client):
+    from src.utils.admission import ServiceOverloadedError
+
+    admission = controller(queue_size=1, queue_timeout=2)
+    release = threading.Event()
+    entered = threading.Event()
+
+    def hold():
+        with admission.admit("standard"):
+            entered.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait()
+    threading.Timer(0.05, release.set).start()
+    with admission.admit("standard"):
+        pass
+    holder.join()
+
+    with admission.admit("standard"):
+        with pytest.raises(ServiceOverloadedError):
+            with admission.admit("standard", timeout=0.01):
+                pass
+
+
+def test_class_limit_applies_to_expensive_routes(client):
+    from src.utils.admission import ServiceOverloadedError
+
+    admission = controller(max_concurrent=4, class_limits={"expensive": 1})
+    with admission.admit("expensive"):
+        with pytest.raises(ServiceOverloadedError):
+            with admission.admit("expensive"):
+                pass
+        with admission.admit("standard"):
+            pass
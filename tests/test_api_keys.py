@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def config(client, monkeypatch):
+    from config import Config
+
+    for name in ("API_KEY", "API_KEYS", "API_KEYS_FILE"):
+        monkeypatch.setattr(Config, name, None)
+    return Config
+
+
+def test_legacy_key_is_unlimited_without_rate(config, monkeypatch):
+    from src.utils.auth.api_key_manager import APIKeyStore
+
+    monkeypatch.setattr(config, "API_KEY", "legacy")
+    monkeypatch.setattr(config, "API_KEY_LEGACY_LIMITED", False)
+    key = APIKeyStore.from_config().lookup("legacy")
+    assert key is not None and key.bucket is None
+
+    monkeypatch.setattr(config, "API_KEY_LEGACY_LIMITED", True)
+    assert APIKeyStore.from_config().lookup("legacy").bucket is not None
+
+
+def test_lookup_matches_only_the_exact_key(config, monkeypatch):
+    from src.utils.auth.api_key_manager import APIKeyStore
+
+    monkeypatch.setattr(config, "API_KEYS", "a:first,b:second")
+    store = APIKeyStore.from_config()
+    assert store.lookup("first").name == "a"
+    assert store.lookup("firs") is None
+    assert store.lookup("second").bucket is not None
+
+
+def test_key_file_entry_without_key_is_a_config_error(config, monkeypatch, tmp_path):
+    from src.utils.auth.api_key_manager import APIKeyStore, hash_api_key
+
+    path = tmp_path / "keys.json"
+    monkeypatch.setattr(config, "API_KEYS_FILE", str(path))
+
+    path.write_text(json.dumps([{"name": "ok", "key_hash": hash_api_key("x")}, {"name": "broken", "rate": 5}]))
+    with pytest.raises(ValueError, match="'broken' precisa de 'key' ou 'key_hash'"):
+        APIKeyStore.from_config()
+
+    path.write_text(json.dumps([{"key": "x"}]))
+    with pytest.raises(ValueError, match="entrada 1 sem 'name'"):
+        APIKeyStore.from_config()
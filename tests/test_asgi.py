@@ -0,0 +1,92 @@
+import asyncio
+
+
+def call(path, headers=()):
+    from src.asgi import app
+    from src.services.registry import get_async_swapi_manager
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        "http_version": "1.1",
+        "scheme": "http",
+        "server": ("tests", 80),
+        "client": ("127.0.0.1", 0),
+        "root_path": "",
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        try:
+            await app(scope, receive, send)
+        finally:
+            # o cliente httpx fica preso ao event loop de cada asyncio.run
+            await get_async_swapi_manager().aclose()
+
+    asyncio.run(run())
+    return sent[0]["status"], dict(sent[0]["headers"])
+
+
+def clear_caches():
+    from src.utils.cache import clear_cache
+    from src.utils.response_cache import clear_response_cache
+
+    clear_cache()
+    clear_response_cache()
+
+
+def test_prefetch_waits_for_auth(client, fake_swapi):
+    clear_caches()
+    before = fake_swapi.requests
+    status, _ = call("/characters/3")
+    assert status == 401
+    assert fake_swapi.requests == before
+
+
+def test_prefetch_counts_in_x_upstream(client, auth):
+    clear_caches()
+    status, headers = call("/characters/3", auth.items())
+    assert status == 200
+    assert headers[b"x-upstream"].startswith(b"calls=1;")
+
+
+def test_api_key_bucket_consumed_once(client):
+    from src.utils.auth.api_key_manager import get_api_key_store
+
+    get_api_key_store().add("asgi-once", "asgi-once-key", rate=0.001, burst=2)
+    statuses = [call("/characters/1", [("X-API-Key", "asgi-once-key")])[0] for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+
+def test_prefetch_failure_is_not_fetched_again(client, auth, fake_swapi):
+    clear_caches()
+    before = fake_swapi.requests
+    status, headers = call("/characters/9999", auth.items())
+    assert status == 404
+    assert fake_swapi.requests == before + 1
+    assert headers[b"x-upstream"].startswith(b"calls=1;")
+
+
+def test_response_cache_hit_skips_admission(client, auth, monkeypatch):
+    import src.asgi
+
+    clear_caches()
+    assert call("/planets/2", auth.items())[0] == 200
+
+    def no_admission(cost):
+        raise AssertionError("HIT não deve passar pela admissão")
+
+    monkeypatch.setattr(src.asgi.admission, "admit_async", no_admission)
+    status, headers = call("/planets/2", auth.items())
+    assert status == 200
+    assert headers[b"x-cache"] == b"HIT"
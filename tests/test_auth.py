@@ -0,0 +1,14 @@
+def login(client, username="user", password="user123"):
+    response = client.post("/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+
+def test_logout_revokes_token_on_this_instance(client):
+    headers = login(client)
+    assert client.get("/films", headers=headers).status_code == 200
+
+    response = client.post("/auth/logout", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["scope"] == "instance"
+    assert client.get("/films", headers=headers).status_code == 401
@@ -0,0 +1,23 @@
+def test_batch_sub_request_with_query_string(client, auth):
+    response = client.post("/batch", json={"requests": ["/films?sort_by=episode_id", "/characters/1"]}, headers=auth)
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()["results"]] == [200, 200]
+
+
+def test_batch_params_must_be_an_object(client, auth):
+    response = client.post("/batch", json={"requests": [{"path": "/films", "params": [1]}]}, headers=auth)
+    assert response.get_json()["results"][0]["status"] == 400
+
+
+def test_batch_budget_is_per_sub_request(client, auth, monkeypatch):
+    from config import Config
+    from src.utils.cache import clear_cache
+    from src.utils.response_cache import clear_response_cache
+
+    clear_cache()
+    clear_response_cache()
+    monkeypatch.setattr(Config, "UPSTREAM_CALL_BUDGET", 2)
+    paths = [f"/characters/{i}" for i in range(2, 7)]
+    response = client.post("/batch", json={"requests": paths}, headers=auth)
+    assert [result["status"] for result in response.get_json()["results"]] == [200] * 5
+    assert "calls=5" in response.headers["X-Upstream"]
@@ -0,0 +1,24 @@
+import gzip
+import json
+
+import brotli
+import pytest
+
+
+@pytest.mark.parametrize("accept, encoding, decode", [
+    ("br", "br", brotli.decompress),
+    ("gzip", "gzip", gzip.decompress),
+    ("gzip;q=0.5, br", "br", brotli.decompress),
+    ("br;q=0, gzip", "gzip", gzip.decompress),
+])
+def test_content_encoding_is_negotiated(client, auth, accept, encoding, decode):
+    response = client.get("/characters?limit=50", headers={**auth, "Accept-Encoding": accept})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == encoding
+    assert len(json.loads(decode(response.get_data()))["data"]) == 50
+
+
+def test_identity_without_accept_encoding(client, auth):
+    response = client.get("/characters?limit=50", headers=auth)
+    assert "Content-Encoding" not in response.headers
+    assert len(response.get_json()["data"]) == 50
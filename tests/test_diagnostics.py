@@ -0,0 +1,33 @@
+import threading
+
+from cachetools import LRUCache
+
+
+def admin_headers(role="admin"):
+    from src.utils.auth.jwt_manager import TokenManager
+
+    return {"Authorization": f"Bearer {TokenManager.generate_token(role, {'role': role})}"}
+
+
+def test_memory_report_is_admin_only(client, auth):
+    assert client.get("/admin/memory", headers=auth).status_code == 401
+    assert client.get("/admin/memory", headers=admin_headers("user")).status_code == 403
+
+    client.get("/characters?limit=2", headers=auth)
+    response = client.get("/admin/memory", headers=admin_headers())
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["collections"]["people"]["items"] > 0
+    assert body["caches"]["responses"]["responses"]["entries"] >= 1
+
+
+def test_report_does_not_touch_lru_order():
+    from src.utils.diagnostics import _entries
+
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"]  # "b" é o próximo a sair
+    assert _entries(cache, threading.Lock()) == [("a", 1), ("b", 2)]
+    cache["c"] = 3
+    assert set(cache) == {"a", "c"}
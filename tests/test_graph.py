@@ -0,0 +1,52 @@
+import threading
+
+
+def item_id(item):
+    return int(item["url"].rstrip("/").rsplit("/", 1)[-1])
+
+
+def test_resident_films_follows_residents_then_films(client, auth, fake_swapi):
+    collections = fake_swapi.collections
+    planet = next(p for p in collections["planets"] if len(p["residents"]) > 1)
+    people = {item_id(person): person for person in collections["people"]}
+
+    expected = []
+    for url in planet["residents"]:
+        for film_url in people[item_id({"url": url})]["films"]:
+            film_id = item_id({"url": film_url})
+            if film_id not in expected:
+                expected.append(film_id)
+
+    response = client.get(f"/planets/{item_id(planet)}/resident-films", headers=auth)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["planet"] == {"id": item_id(planet), "name": planet["name"]}
+    assert [film["id"] for film in body["films"]] == expected
+    assert body["total_films"] == len(expected)
+
+
+def test_resident_films_unknown_planet(client, auth):
+    response = client.get("/planets/9999/resident-films", headers=auth)
+    assert response.status_code == 404
+
+
+def test_cold_graph_loads_collections_concurrently(client, auth, monkeypatch):
+    from src.services.swapi.swapi_manager import SwapiManager
+    from src.utils.cache import clear_cache
+    from src.utils.response_cache import clear_response_cache
+
+    clear_cache()
+    clear_response_cache()
+
+    fetch_all = SwapiManager.fetch_all
+    threads = set()
+
+    def recording_fetch_all(self, endpoint):
+        threads.add(threading.current_thread().name)
+        return fetch_all(self, endpoint)
+
+    monkeypatch.setattr(SwapiManager, "fetch_all", recording_fetch_all)
+    response = client.get("/planets/1/resident-films", headers=auth)
+    assert response.status_code == 200
+    # as quatro coleções do grafo saem do pool, não em série na thread da requisição
+    assert len({name for name in threads if name.startswith("swapi")}) > 1
@@ -0,0 +1,62 @@
+import pytest
+
+
+@pytest.fixture
+def fresh(client):
+    from src.utils.response_cache import clear_response_cache
+
+    clear_response_cache()
+    return client
+
+
+def test_if_none_match_returns_empty_304(fresh, auth):
+    first = fresh.get("/films/1", headers=auth)
+    etag = first.headers["ETag"]
+
+    for candidate in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = fresh.get("/films/1", headers={**auth, "If-None-Match": candidate})
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+    assert fresh.get("/films/1", headers={**auth, "If-None-Match": '"other"'}).status_code == 200
+
+
+def test_etag_is_stable_across_recompute(fresh, auth):
+    from src.utils.cache import clear_cache
+    from src.utils.response_cache import clear_response_cache
+
+    etag = fresh.get("/characters?limit=5", headers=auth).headers["ETag"]
+
+    # corpo recalculado (e coleções recarregadas da SWAPI): mesmo conteúdo, mesmo ETag
+    clear_response_cache()
+    clear_cache()
+    response = fresh.get("/characters?limit=5", headers=auth)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.headers["ETag"] == etag
+
+    response = fresh.get("/characters?limit=5", headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_compressed_variant_has_its_own_etag(fresh, auth):
+    plain = fresh.get("/characters?limit=50", headers=auth).headers["ETag"]
+    gzipped = fresh.get("/characters?limit=50", headers={**auth, "Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] != plain
+
+    response = fresh.get("/characters?limit=50", headers={**auth, "If-None-Match": plain, "Accept-Encoding": "gzip"})
+    assert response.status_code == 304
+
+
+def test_vary_and_cache_control(fresh, auth):
+    from config import Config
+
+    for path, ttl in (("/films/1", Config.CACHE_TTL), ("/search?q=sky", min(Config.CACHE_TTL, Config.SEARCH_HTTP_MAX_AGE))):
+        response = fresh.get(path, headers=auth)
+        assert {part.strip() for part in response.headers["Vary"].split(",")} == {"Accept-Encoding", "Authorization", "X-API-Key"}
+        directives = [part.strip() for part in response.headers["Cache-Control"].split(",")]
+        assert directives[0] == "public"
+        assert 0 <= int(directives[1].removeprefix("max-age=")) <= ttl
+
+    assert fresh.get("/health").headers["Cache-Control"] == "no-store"
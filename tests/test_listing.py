@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+
+def item_id(url):
+    return int(url.rstrip("/").rsplit("/", 1)[-1])
+
+
+def test_expand_embeds_related_objects(client, auth, fake_swapi):
+    people = {person["name"]: person for person in fake_swapi.collections["people"]}
+    planets = {item_id(planet["url"]): planet for planet in fake_swapi.collections["planets"]}
+
+    response = client.get("/characters?limit=3&expand=homeworld,films", headers=auth)
+    assert response.status_code == 200
+    for character in response.get_json()["data"]:
+        source = people[character["name"]]
+        assert character["homeworld"]["name"] == planets[item_id(source["homeworld"])]["name"]
+        assert [film["id"] for film in character["films"]] == [item_id(url) for url in source["films"]]
+
+
+def test_detail_expand_and_fields(client, auth):
+    body = client.get("/characters/1?expand=homeworld", headers=auth).get_json()
+    assert isinstance(body["homeworld"], dict) and body["homeworld"]["name"]
+
+    body = client.get("/characters/1?fields=name,height", headers=auth).get_json()
+    assert body == {"name": "Character 1", "height": "151"}
+
+
+def test_export_streams_ndjson(client, auth, fake_swapi):
+    response = client.get("/films/export?sort_by=episode_id&order=desc", headers=auth)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+
+    lines = response.get_data(as_text=True).splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert len(rows) == len(fake_swapi.collections["films"])
+    episodes = [row["episode_id"] for row in rows]
+    assert episodes == sorted(episodes, reverse=True)
+
+
+def test_export_applies_filters_and_rejects_list_params(client, auth):
+    response = client.get("/characters/export?gender=female", headers=auth)
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows and all(row["gender"] == "female" for row in rows)
+    assert client.get("/characters/export?sort_by=nope", headers=auth).status_code == 400
+
+
+def test_fragment_serialization_matches_plain_json(client):
+    from src.utils.fragments import FragmentList, JSONFragment
+    from src.utils.response import to_json_bytes
+
+    payload = {
+        "data": FragmentList([JSONFragment(b'{"name":"Luke"}'), {"name": "Leia"}]),
+        "meta": {"one": JSONFragment(b"1"), "total": 2},
+    }
+    assert json.loads(to_json_bytes(payload)) == {"data": [{"name": "Luke"}, {"name": "Leia"}], "meta": {"one": 1, "total": 2}}
+    assert to_json_bytes(JSONFragment(b"[1]")) == b"[1]"
+
+
+def test_list_body_equals_per_entity_json(client, auth, fake_swapi):
+    ids = {person["name"]: item_id(person["url"]) for person in fake_swapi.collections["people"]}
+    listing = client.get("/characters?limit=2", headers=auth).get_json()["data"]
+    for character in listing:
+        assert client.get(f"/characters/{ids[character['name']]}", headers=auth).get_json() == character
+
+
+@pytest.mark.parametrize("query, field", [
+    ("sort_by=mass_index", "sort_by"),
+    ("order=up", "order"),
+    ("page=0", "page"),
+    ("page=abc", "page"),
+    ("limit=101", "limit"),
+    ("expand=species", "expand"),
+    ("ids=1,x", "ids"),
+    ("unknown=1", "unknown_fields"),
+])
+def test_list_schema_rejections(client, auth, query, field):
+    response = client.get(f"/characters?{query}", headers=auth)
+    body = response.get_json()
+    assert response.status_code == 400
+    assert body["error"] is True and body["code"] == 400
+    assert field in body["errors"]
+
+
+def test_typed_filter_and_search_type_rejections(client, auth):
+    assert "episode_id" in client.get("/films?episode_id=abc", headers=auth).get_json()["errors"]
+    response = client.get("/search?q=sky&type=vehicles", headers=auth)
+    assert response.status_code == 400
+    # parâmetros desconhecidos são aceitos no detalhe e na busca
+    assert client.get("/characters/1?unknown=1", headers=auth).status_code == 200
@@ -0,0 +1,25 @@
+import io
+import logging
+
+
+def test_malformed_sample_rate_falls_back_to_one(client, caplog):
+    from src.utils.logging_setup import parse_sample_rates
+
+    with caplog.at_level(logging.WARNING):
+        rates = parse_sample_rates("cache_hit=0.01,token_validated=abc")
+    assert rates == {"cache_hit": 0.01, "token_validated": 1.0}
+    assert "token_validated=abc" in caplog.text
+
+
+def test_synchronous_logging_writes_before_returning(client):
+    from src.utils.logging_setup import configure_logging, shutdown_logging
+
+    shutdown_logging()
+    stream = io.StringIO()
+    try:
+        configure_logging(stream, background=False)
+        logging.getLogger("tests").warning("escrito na hora")
+        assert "escrito na hora" in stream.getvalue()
+    finally:
+        shutdown_logging()
+        configure_logging()
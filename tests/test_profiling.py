@@ -0,0 +1,56 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+
+def busy(seconds):
+    ends = time.perf_counter() + seconds
+    while time.perf_counter() < ends:
+        pass
+
+
+def other_request_work(stop):
+    while not stop.is_set():
+        busy(0.001)
+
+
+def fan_out_work():
+    busy(0.05)
+
+
+def test_sampling_profiler_only_sees_its_request():
+    from src.utils.profiling import SamplingProfiler, track_thread
+
+    stop = threading.Event()
+    other = threading.Thread(target=other_request_work, args=(stop,))
+    other.start()
+    try:
+        profiler = SamplingProfiler(0.001)
+        profiler.start()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(copy_context().run, track_thread(fan_out_work)).result()
+        busy(0.05)
+        profiler.stop()
+    finally:
+        stop.set()
+        other.join()
+
+    functions = {row["function"] for row in profiler.top(50)}
+    assert "test_profiling.py:busy" in functions
+    stacks = "\n".join(profiler._stacks)
+    assert "fan_out_work" in stacks
+    assert "other_request_work" not in stacks
+    assert "threading.py:wait" not in functions
+
+
+def test_profile_output_is_a_file_name(client, auth, monkeypatch, tmp_path):
+    from config import Config
+
+    monkeypatch.setattr(Config, "PROFILE_MODE", "always")
+    monkeypatch.setattr(Config, "PROFILE_OUTPUT_DIR", str(tmp_path))
+    response = client.get("/characters?limit=2", headers=auth)
+    name = response.headers["X-Profile"]
+    assert "/" not in name
+    assert (tmp_path / name).exists()
+    assert response.get_json()["_profile"]["output"] == name
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture
+def fresh(client):
+    from src.utils.response_cache import clear_response_cache
+
+    clear_response_cache()
+    return client
+
+
+@pytest.mark.parametrize("first, second", [
+    ("/characters?page=1&limit=5", "/characters?limit=05&page=01&order=asc"),
+    ("/characters?expand=films,homeworld&limit=3", "/characters?limit=3&expand=homeworld,films,films"),
+    ("/characters/1", "/characters/1?x=1&cache_buster=123"),
+    ("/search?q=sky&type=planets", "/search?type=PLANETS&q=sky"),
+    ("/planets/1/residents", "/planets/1/residents?x=1"),
+])
+def test_equivalent_queries_share_an_entry(fresh, auth, first, second):
+    assert fresh.get(first, headers=auth).headers["X-Cache"] == "MISS"
+    assert fresh.get(second, headers=auth).headers["X-Cache"] == "HIT"
+
+
+def test_invalid_query_is_not_cached(fresh, auth):
+    from src.utils.response_cache import _responses
+
+    assert fresh.get("/characters?x=1", headers=auth).status_code == 400
+    assert fresh.get("/characters?order=ASC", headers=auth).status_code == 400
+    assert len(_responses) == 0
+
+
+def test_ids_order_is_part_of_the_key(fresh, auth):
+    fresh.get("/characters?ids=1,2", headers=auth)
+    assert fresh.get("/characters?ids=2,1", headers=auth).headers["X-Cache"] == "MISS"
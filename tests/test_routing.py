@@ -0,0 +1,53 @@
+import pytest
+
+from src.utils.routing.exceptions import MethodNotAllowedError, RouteNotFoundError, RouteParamError
+from src.utils.routing.router import Route, Router
+
+
+def handler(**params):
+    return params
+
+
+@pytest.fixture
+def router():
+    return Router([
+        Route("GET", "/health", handler),
+        Route("GET", "/items/export", handler),
+        Route("GET", "/items/<int:item_id>", handler),
+        Route("GET", "/items/<int:item_id>/<sub>", handler),
+        Route("GET", "/items/export/<fmt>/<name>", handler),
+        Route("POST", "/batch", handler),
+    ])
+
+
+def test_static_path_with_or_without_slashes(router):
+    for path in ("/health", "health", "/health/"):
+        route, params = router.match("GET", path)
+        assert route.template == "/health"
+        assert params == {}
+
+
+def test_unknown_path(router):
+    with pytest.raises(RouteNotFoundError):
+        router.match("GET", "/nothing/here")
+
+
+def test_dynamic_path_converts_params(router):
+    route, params = router.match("GET", "/items/7/films")
+    assert route.template == "/items/<int:item_id>/<sub>"
+    assert params == {"item_id": 7, "sub": "films"}
+
+
+def test_static_segment_wins_and_backtracks(router):
+    assert router.match("GET", "/items/export")[0].template == "/items/export"
+    # "export" leva a um ramo sem rota de 2 segmentos extras: volta e tenta o parâmetro
+    with pytest.raises(RouteParamError):
+        router.match("GET", "/items/export/csv")
+    route, params = router.match("GET", "/items/export/csv/all")
+    assert params == {"fmt": "csv", "name": "all"}
+
+
+def test_method_is_case_insensitive_and_checked(router):
+    assert router.match("post", "/batch")[0].method == "POST"
+    with pytest.raises(MethodNotAllowedError):
+        router.match("GET", "/batch")
@@ -0,0 +1,40 @@
+def test_search_body_has_no_timings(client, auth):
+    response = client.get("/search?q=Character 1", headers=auth)
+    assert response.status_code == 200
+    meta = response.get_json()["meta"]
+    assert meta == {"partial": False, "branches": {name: {"status": "ok"} for name in ("characters", "planets", "starships", "films")}}
+    assert "search-characters;dur=" in response.headers["Server-Timing"]
+
+
+def test_search_etag_stable_across_recompute(client, auth):
+    from src.utils.response_cache import clear_response_cache
+
+    first = client.get("/search?q=sky", headers=auth)
+    clear_response_cache()
+    second = client.get("/search?q=sky", headers=auth)
+    assert second.headers["X-Cache"] == "MISS"
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+
+def test_partial_search_is_not_cached(client, auth, monkeypatch):
+    from src.main import get_planet_service
+    from src.services.swapi.exceptions import SWAPIConnectionError
+    from src.utils.response_cache import clear_response_cache
+
+    def fail(**kwargs):
+        raise SWAPIConnectionError()
+
+    clear_response_cache()
+    monkeypatch.setattr(get_planet_service(), "get_planets", fail)
+    response = client.get("/search?q=partial", headers=auth)
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["meta"]["partial"] is True
+    assert body["meta"]["branches"]["planets"]["status"] == "error"
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in response.headers
+
+    monkeypatch.undo()
+    response = client.get("/search?q=partial", headers=auth)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["meta"]["partial"] is False
@@ -0,0 +1,25 @@
+def index_of(*names):
+    from src.services.search.search_index import _CollectionIndex
+
+    return _CollectionIndex([{"name": name} for name in names], "name")
+
+
+def names(results):
+    return [item["name"] for item in results]
+
+
+def test_ranking_exact_prefix_substring_trigram(client):
+    index = index_of("Lukas", "Han Solo", "Aluke", "Lukeson", "Luke")
+    assert names(index.search("luke")) == ["Luke", "Lukeson", "Aluke", "Lukas"]
+
+
+def test_every_query_token_must_match(client):
+    index = index_of("Luke Skywalker", "Anakin Skywalker", "Luke")
+    assert names(index.search("luke sky")) == ["Luke Skywalker"]
+    assert names(index.search("skywalker")) == ["Anakin Skywalker", "Luke Skywalker"]
+
+
+def test_accents_and_case_are_ignored(client):
+    index = index_of("Padmé Amidala")
+    assert names(index.search("PADME")) == ["Padmé Amidala"]
+    assert index.search("") == []
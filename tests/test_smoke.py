@@ -0,0 +1,51 @@
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "ok"
+
+
+def test_character_detail(client, auth):
+    response = client.get("/characters/1", headers=auth)
+    assert response.status_code == 200
+    assert response.get_json()["name"] == "Character 1"
+
+
+def test_character_list(client, auth):
+    response = client.get("/characters?limit=5", headers=auth)
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == 5
+
+
+def test_sub_resource(client, auth):
+    response = client.get("/planets/1/residents", headers=auth)
+    assert response.status_code == 200
+
+
+def test_requires_auth(client):
+    assert client.get("/characters/1").status_code == 401
+
+
+def test_ids_rejects_non_ascii_digits(client, auth):
+    response = client.get("/characters?ids=%C2%B2", headers=auth)
+    assert response.status_code == 400
+    assert "ids" in response.get_json()["errors"]
+
+
+def test_route_errors_require_auth(client, auth):
+    # sem credencial não dá para descobrir quais rotas existem
+    assert client.get("/characters/abc").status_code == 401
+    assert client.get("/nope").status_code == 401
+    assert client.get("/characters/abc", headers=auth).status_code == 400
+    assert client.get("/nope", headers=auth).status_code == 404
+    # rotas públicas continuam com o erro de método
+    assert client.get("/auth/login").status_code == 405
+
+
+def test_ids_returns_every_requested_id(client, auth):
+    ids = list(range(1, 21)) + [9999]
+    response = client.get(f"/characters?ids={','.join(map(str, ids))}", headers=auth)
+    body = response.get_json()
+    assert response.status_code == 200
+    assert len(body["data"]) == 20
+    assert body["missing_ids"] == [9999]
+    assert body["pagination"]["has_next"] is False
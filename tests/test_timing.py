@@ -0,0 +1,38 @@
+import re
+
+_METRIC = re.compile(r'^(?P<name>[\w-]+);dur=(?P<dur>\d+\.\d{3})(?:;desc="(?P<count>\d+)x")?$')
+
+
+def metrics(response):
+    parsed = {}
+    for part in response.headers["Server-Timing"].split(", "):
+        match = _METRIC.match(part)
+        assert match, part
+        parsed[match["name"]] = (float(match["dur"]), int(match["count"] or 1))
+    return parsed
+
+
+def test_server_timing_on_cache_miss_and_hit(client, auth):
+    from src.utils.cache import clear_cache
+    from src.utils.response_cache import clear_response_cache
+
+    clear_cache()
+    clear_response_cache()
+    miss = metrics(client.get("/characters?limit=3", headers=auth))
+    assert {"auth", "validate", "cache", "handler", "upstream", "serialize", "total"} <= set(miss)
+    # várias páginas da SWAPI: a etapa aparece uma vez com a contagem em desc
+    assert miss["upstream"][1] > 1
+    assert miss["total"][0] >= miss["handler"][0]
+
+    hit = metrics(client.get("/characters?limit=3", headers=auth))
+    assert "handler" not in hit and "upstream" not in hit
+    assert {"cache", "total"} <= set(hit)
+
+
+def test_server_timing_disabled(client, auth, monkeypatch):
+    from config import Config
+
+    monkeypatch.setattr(Config, "SERVER_TIMING", False)
+    response = client.get("/characters?limit=3", headers=auth)
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers